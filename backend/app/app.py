@@ -1,12 +1,25 @@
-from flask import Flask
-from flask_marshmallow import Marshmallow
+from flask import Flask, g, jsonify
 from flask_restful import Api, Resource
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 
 from app.routes.volunteer import VolunteerCheckIn, VolunteerCheckOut, VolunteerEvents
-from .config.database import db, bcrypt
+from .config.database import db, bcrypt, ma
+from .utils.json_output import output_json
+from .utils.query_profiler import init_query_profiler
+from .utils.identity_cache import identity_cache
+from .utils.auth_helper import detect_refresh_reuse, token_identity
+from .utils.badge_helper import badge_catalog
+from .utils.password_hasher import password_hasher
+from .utils.response_cache import response_cache
+from .utils.single_flight import single_flight
+from .utils.stats_logger import stats_logger
+from .utils.group_commit import time_log_writer
+from .utils.time_log_sweeper import time_log_sweeper
+from .utils.leaderboard import leaderboard
+from .utils.token_blocklist import token_blocklist
+from .cli import badges_cli, cache_cli, hours_cli, keys_cli, rollups_cli, search_cli, timelogs_cli
 
 # Models
 from .models.users import User
@@ -16,11 +29,14 @@ from .models.participations import Participation
 from .models.badges import Badge
 from .models.user_badges import UserBadge
 from .models.time_logs import TimeLog
+from .models.hour_rollups import EventHours, OrganizationMonthlyHours, UserDailyHours
+from .models.revoked_tokens import RevokedToken
 
 # Routes
-from .routes.auth import RegisterUser, LoginUser, LogoutUser, OnboardOrganisation
-from .routes.organization import EventManagement, MyOrganization, OrganizationProfile, OrganizationSpecificEvents
-from .routes.participation import ApplyToEvent, ApproveParticipation, CompleteParticipation, EventApplications
+from .routes.auth import RegisterUser, LoginUser, LogoutUser, OnboardOrganisation, RefreshToken
+from .routes.organization import EventBulkImport, EventManagement, EventSearch, MyOrganization, OrganizationAnalytics, OrganizationProfile, OrganizationSpecificEvents
+from .routes.leaderboard import Leaderboard, LeaderboardMe
+from .routes.participation import ApplyToEvent, ApproveApplications, ApproveParticipation, CompleteParticipation, EventApplications
 
 
 def create_app(config_class="app.config.settings.DevelopmentConfig"):
@@ -43,30 +59,70 @@ def create_app(config_class="app.config.settings.DevelopmentConfig"):
     jwt = JWTManager(app)
     migrate = Migrate(app, db)
     api = Api(app)
-    ma = Marshmallow(app)
+    api.representation("application/json")(output_json)
+    ma.init_app(app)
+    init_query_profiler(app)
+    identity_cache.init_app(app)
+    badge_catalog.init_app(app)
+    leaderboard.init_app(app)
+    password_hasher.init_app(app)
+    token_blocklist.init_app(app)
+    response_cache.init_app(app)
+    single_flight.init_app(app)
+    time_log_writer.init_app(app)
+    time_log_sweeper.init_app(app)
+    stats_logger.init_app(app)
+    app.cli.add_command(keys_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(cache_cli)
+    app.cli.add_command(timelogs_cli)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(hours_cli)
+    app.cli.add_command(badges_cli)
   
 
     # JWT user loader
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
+        # @claims_required views authorize from the token claims alone
+        if g.get("_claims_only"):
+            return token_identity(jwt_data)
         identity = jwt_data["sub"]
-        return User.query.get(identity)
+        return identity_cache.load_user(identity)
+
+    # Revoked tokens (logout, rotation, stolen sessions), checked in memory
+    @jwt.token_in_blocklist_loader
+    def token_revoked_callback(_jwt_header, jwt_data):
+        return token_blocklist.is_token_revoked(jwt_data)
+
+    @jwt.revoked_token_loader
+    def revoked_token_response(_jwt_header, jwt_data):
+        # A rotated refresh token used again ends the whole session
+        detect_refresh_reuse(jwt_data, grace=app.config["REFRESH_REUSE_GRACE"])
+        return jsonify({"msg": "Token has been revoked"}), 401
 
     # Register routes
     api.add_resource(RegisterUser, '/api/auth/register')
     api.add_resource(LoginUser, '/api/auth/login')
     api.add_resource(LogoutUser, '/api/auth/logout')
+    api.add_resource(RefreshToken, '/api/auth/refresh')
     api.add_resource(OnboardOrganisation, '/api/auth/onboard-organization')
     api.add_resource(MyOrganization, '/api/auth/my-organization-profile')
-    api.add_resource(OrganizationProfile, '/api/auth/organization-profile')
+    api.add_resource(OrganizationProfile, '/api/auth/organization-profile/<string:organization_id>')
     api.add_resource(EventManagement, '/api/event')
+    api.add_resource(EventSearch, '/api/event/search')
+    api.add_resource(EventBulkImport, '/api/event/bulk')
     api.add_resource(ApplyToEvent, '/api/event/<string:event_id>/apply')
     api.add_resource(EventApplications, '/api/event/<string:event_id>/applications')
+    api.add_resource(ApproveApplications, '/api/event/<string:event_id>/applications/approve')
     api.add_resource(ApproveParticipation, '/api/participation/<string:participation_id>/approve')
     api.add_resource(CompleteParticipation, '/api/participation/<string:participation_id>/complete')
     api.add_resource(OrganizationSpecificEvents, '/api/organization/<string:organization_id>/events')
+    api.add_resource(OrganizationAnalytics, '/api/organization/<string:organization_id>/analytics')
     api.add_resource(VolunteerEvents, '/api/volunteer/events')
     api.add_resource(VolunteerCheckIn, '/api/participation/<string:participation_id>/check-in')
     api.add_resource(VolunteerCheckOut, '/api/participation/<string:participation_id>/check-out')
+    api.add_resource(Leaderboard, '/api/leaderboard')
+    api.add_resource(LeaderboardMe, '/api/leaderboard/me')
 
     return app
\ No newline at end of file
@@ -0,0 +1,115 @@
+import json
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.utils.badge_helper import award_missing_badges
+from app.utils.event_search import rebuild_search_index
+from app.utils.hour_rollups import rebuild_hour_rollups
+from app.utils.hours_reconciliation import reconcile_hours
+from app.utils.key_migration import KeyMigrationError, backfill_shadow_keys, swap_to_compact_keys
+from app.utils.response_cache import response_cache
+from app.utils.time_log_sweeper import sweep_stale_time_logs
+
+keys_cli = AppGroup("keys", help="Convert primary/foreign keys to the compact uuid7 layout.")
+search_cli = AppGroup("search", help="Maintain the event full-text search index.")
+cache_cli = AppGroup("cache", help="Inspect and purge the public response cache.")
+timelogs_cli = AppGroup("timelogs", help="Maintain volunteer time log sessions.")
+rollups_cli = AppGroup("rollups", help="Maintain the pre-aggregated volunteer-hours tables.")
+hours_cli = AppGroup("hours", help="Check stored volunteer hours against the time logs.")
+badges_cli = AppGroup("badges", help="Maintain the badges awarded to volunteers.")
+
+
+@keys_cli.command("backfill")
+@click.option("--chunk-size", default=1000, show_default=True, help="Rows converted per transaction.")
+def keys_backfill(chunk_size):
+    """Online step: fill CompactUUID shadow columns next to the text keys (safe to re-run)."""
+    try:
+        total = backfill_shadow_keys(chunk_size=chunk_size, log=click.echo)
+    except KeyMigrationError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Backfilled {total} rows.")
+
+
+@keys_cli.command("swap")
+@click.option("--chunk-size", default=1000, show_default=True, help="Rows converted per transaction.")
+def keys_swap(chunk_size):
+    """Offline step: rebuild the tables with compact keys. Requires KEY_STRATEGY=uuid7."""
+    try:
+        swap_to_compact_keys(chunk_size=chunk_size, log=click.echo)
+    except KeyMigrationError as e:
+        raise click.ClickException(str(e))
+    # Rows were copied under new rowids
+    rebuild_search_index()
+    click.echo("Keys converted. Start the application with KEY_STRATEGY=uuid7.")
+
+
+@search_cli.command("rebuild")
+def search_rebuild():
+    """Re-index every event (SQLite: run after VACUUM or a bulk copy of the events table)."""
+    rebuild_search_index()
+    click.echo("Search index rebuilt.")
+
+
+@cache_cli.command("stats")
+def cache_stats():
+    """Print the response cache configuration and counters (shared with the redis backend only)."""
+    stats = response_cache.stats()
+    click.echo(json.dumps(stats, indent=2))
+    if stats["counters"] != "all processes":
+        click.echo(
+            f"The {stats['backend']} cache counts in each app process, not here: "
+            "set STATS_LOG_INTERVAL to have the app processes log their counters.",
+            err=True
+        )
+
+
+@cache_cli.command("purge")
+@click.option("--tag", "tags", multiple=True, help="Only drop entries with this tag, e.g. org:<id> (repeatable).")
+def cache_purge(tags):
+    """Drop cached responses. With the lru backend, restart the app processes instead."""
+    response_cache.purge(*tags)
+    click.echo(f"Purged {', '.join(tags) if tags else 'all entries'} from the {response_cache.stats()['backend']} cache.")
+
+
+@timelogs_cli.command("sweep")
+@click.option("--max-hours", type=float, default=None, help="Close sessions open longer than this (default: TIME_LOG_MAX_OPEN_HOURS).")
+@click.option("--chunk-size", type=int, default=None, help="Sessions closed per transaction (default: TIME_LOG_SWEEP_CHUNK_SIZE).")
+@click.option("--dry-run", is_flag=True, help="Only count the sessions that would be closed.")
+def timelogs_sweep(max_hours, chunk_size, dry_run):
+    """Close sessions left open too long or past their event's end, crediting the capped hours."""
+    config = current_app.config
+    closed, hours = sweep_stale_time_logs(
+        max_open_hours=max_hours if max_hours is not None else config["TIME_LOG_MAX_OPEN_HOURS"],
+        chunk_size=chunk_size or config["TIME_LOG_SWEEP_CHUNK_SIZE"],
+        dry_run=dry_run,
+        log=click.echo
+    )
+    click.echo(f"{'Would close' if dry_run else 'Closed'} {closed} sessions worth {hours} hours.")
+
+
+@rollups_cli.command("rebuild")
+@click.option("--chunk-size", default=1000, show_default=True, help="Rows streamed and inserted per batch.")
+def rollups_rebuild(chunk_size):
+    """Regenerate the user/day, event and organization/month hour rollups from time_logs."""
+    sessions = rebuild_hour_rollups(chunk_size=chunk_size, log=click.echo)
+    click.echo(f"Rollups rebuilt from {sessions} sessions.")
+
+
+@hours_cli.command("reconcile")
+@click.option("--chunk-size", default=50000, show_default=True, help="Time logs streamed per batch, and rows per UPDATE batch.")
+@click.option("--dry-run", is_flag=True, help="Only report the drift.")
+def hours_reconcile(chunk_size, dry_run):
+    """Recompute participation and volunteer hours from time_logs and fix the stored totals (nightly)."""
+    try:
+        report = reconcile_hours(chunk_size=chunk_size, dry_run=dry_run, log=click.echo)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(json.dumps(report, indent=2))
+
+
+@badges_cli.command("backfill")
+@click.option("--chunk-size", default=1000, show_default=True, help="Awards inserted per statement.")
+def badges_backfill(chunk_size):
+    """Award the badges users' totals qualify for but they lack (run after seeding or adding a threshold)."""
+    awarded = award_missing_badges(chunk_size=chunk_size, log=click.echo)
+    click.echo(f"Awarded {awarded} badges.")
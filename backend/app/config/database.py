@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
+from flask_marshmallow import Marshmallow
 
 db = SQLAlchemy()
 bcrypt = Bcrypt()
+ma = Marshmallow()
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 
 class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -10,16 +11,68 @@ class Config:
     JWT_COOKIE_SAMESITE = "Lax"
     JWT_COOKIE_HTTPONLY = True
     JWT_COOKIE_CSRF_PROTECT = False
+    SQL_PROFILING = os.getenv("SQL_PROFILING", "0") == "1"  # per-request query count / DB time headers and log line
+    SQL_STRICT_LAZY_LOADS = False  # raise when a relationship lazy-loads repeatedly in a request
+    IDENTITY_CACHE_MAX_SIZE = 1024  # users kept by the JWT user loader cache (0 disables it)
+    IDENTITY_CACHE_TTL = 60  # seconds
+    BADGE_CATALOG_TTL = 300  # seconds before the badge thresholds are re-read
+    LEADERBOARD_TTL = 300  # seconds before a leaderboard is rebuilt from the users table
+    LEADERBOARD_MAX_ORGANIZATIONS = 256  # organization boards kept in memory (least recently used dropped)
+    # bcrypt cost, and the pool that runs it off the request threads (0 workers = inline)
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_PENDING = 32  # queued hashes beyond the workers before answering 503
+    PASSWORD_HASH_TIMEOUT = 10  # seconds
+    # In-memory mirror of the revoked token table (see app/utils/token_blocklist.py)
+    REVOCATION_BLOOM_CAPACITY = 100000
+    REVOCATION_BLOOM_ERROR_RATE = 0.001
+    REVOCATION_SYNC_INTERVAL = 5  # seconds between background pulls of other processes' revocations (0: none)
+    REVOCATION_REBUILD_INTERVAL = 600  # seconds between full rebuilds (drops expired tokens)
+    # A rotated refresh token replayed later than this revokes its whole session
+    REFRESH_REUSE_GRACE = timedelta(seconds=10)
+    # Cache of rendered public GET responses (see app/utils/response_cache.py): "lru", "redis" or "none"
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "lru")
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_MAX_ENTRIES = 2048  # lru backend only
+    RESPONSE_CACHE_TTL = 300  # seconds; also bounds how stale time-based filters (upcoming) get
+    # Log each app process's cache and single-flight counters (both per process); 0 disables it
+    STATS_LOG_INTERVAL = int(os.getenv("STATS_LOG_INTERVAL", 0))  # seconds
+    # Identical concurrent GETs of hot listings run once (see app/utils/single_flight.py)
+    SINGLE_FLIGHT_ENABLED = True
+    SINGLE_FLIGHT_TIMEOUT = 10  # seconds a waiting request gives the running one before computing itself
+    # POST /api/event/bulk: events per executemany batch, and per request
+    BULK_EVENT_CHUNK_SIZE = 500
+    BULK_EVENT_MAX_ROWS = 1000
+    # PUT /api/event/<id>/applications/approve: applications decided per request
+    BATCH_APPROVAL_MAX_IDS = 1000
+    # Batch check-in/check-out writes into shared transactions (see app/utils/group_commit.py)
+    TIME_LOG_GROUP_COMMIT = os.getenv("TIME_LOG_GROUP_COMMIT", "0") == "1"
+    TIME_LOG_GROUP_COMMIT_WINDOW_MS = 5  # how long the writer waits for more writes to join a group
+    TIME_LOG_GROUP_COMMIT_MAX_BATCH = 64
+    TIME_LOG_GROUP_COMMIT_MAX_PENDING = 1024  # queued writes before answering 503
+    # Close sessions left open too long or past their event's end (see app/utils/time_log_sweeper.py)
+    TIME_LOG_MAX_OPEN_HOURS = 12
+    TIME_LOG_SWEEP_CHUNK_SIZE = 500
+    TIME_LOG_SWEEP_INTERVAL = int(os.getenv("TIME_LOG_SWEEP_INTERVAL", 0))  # seconds; 0 leaves it to `flask timelogs sweep`
+    # Key layout for all tables, read once at import time (see app/models/base.py)
+    KEY_STRATEGY = os.getenv("KEY_STRATEGY", "uuid4")
 
    
 class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = "sqlite:///volunteer.db"
     DEBUG = True
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 10))
+    SQL_PROFILING = True
 
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"  # in-memory DB for tests
+    BCRYPT_LOG_ROUNDS = 4  # keep password hashing cheap in tests
+    PASSWORD_HASH_WORKERS = 0
+    SQL_PROFILING = True
+    SQL_STRICT_LAZY_LOADS = True
+    REVOCATION_SYNC_INTERVAL = 0  # no refresher thread; tests call token_blocklist.refresh()
 
 
 class ProductionConfig(Config):
@@ -1,12 +1,33 @@
 import uuid
 from app.config.database import db
+from app.config.settings import Config
+from .types import CompactUUID, uuid7
+
+
+# Primary/foreign key layout, chosen once per process from KEY_STRATEGY:
+#   "uuid4" - random uuid4 text in String(100) columns (original layout)
+#   "uuid7" - time-ordered uuid7 in CompactUUID columns (16 bytes / native UUID)
+# Existing databases are converted with `flask keys backfill` + `flask keys swap`.
+if Config.KEY_STRATEGY == "uuid7":
+    def key_type():
+        return CompactUUID()
+
+    def new_key():
+        return str(uuid7())
+else:
+    def key_type():
+        return db.String(100)
+
+    def new_key():
+        return str(uuid.uuid4())
+
 
 class BaseModel(db.Model):
     __abstract__ = True  
 
     id = db.Column(
-        db.String(100),
+        key_type(),
         primary_key=True,
-        default=lambda: str(uuid.uuid4())
+        default=new_key
     )
 
@@ -1,17 +1,25 @@
 from datetime import datetime, timezone
 from app.config.database import db
-from .base import BaseModel
+from .base import BaseModel, key_type
 
 class Event(BaseModel):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination of the public event feed seeks on (start_time, id)
+        db.Index("ix_events_start_time_id", "start_time", "id"),
+        db.Index("ix_events_organization_id_created_at", "organization_id", "created_at"),
+    )
 
-    organization_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
+    organization_id = db.Column(key_type(), db.ForeignKey('organizations.id'), nullable=False)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
     location = db.Column(db.String(255), nullable=False)
     start_time = db.Column(db.DateTime, nullable=False)
     end_time = db.Column(db.DateTime, nullable=False)
     max_participants = db.Column(db.Integer, nullable=False)
+    # Denormalized participation counters, kept in step by app.utils.capacity_helper
+    approved_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    pending_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(
         db.DateTime,
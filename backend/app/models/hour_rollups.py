@@ -0,0 +1,44 @@
+from app.config.database import db
+from .base import key_type
+
+# Pre-aggregated volunteer hours, kept in step with check-outs by
+# app/utils/hour_rollups.py. Keyed by what they aggregate over, so they can
+# be upserted; `flask rollups rebuild` regenerates them from time_logs.
+# Having no `id`, they are derived tables for the key conversion: `flask
+# keys swap` recreates them with compact keys and regenerates their rows
+# rather than copying them (see app/utils/key_migration.py).
+
+
+class UserDailyHours(db.Model):
+    __tablename__ = "user_daily_hours"
+
+    user_id = db.Column(key_type(), db.ForeignKey('users.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    hours = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<UserDailyHours user={self.user_id} day={self.day} hours={self.hours}>"
+
+
+class EventHours(db.Model):
+    __tablename__ = "event_hours"
+
+    event_id = db.Column(key_type(), db.ForeignKey('events.id'), primary_key=True)
+    hours = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<EventHours event={self.event_id} hours={self.hours}>"
+
+
+class OrganizationMonthlyHours(db.Model):
+    __tablename__ = "organization_monthly_hours"
+
+    organization_id = db.Column(key_type(), db.ForeignKey('organizations.id'), primary_key=True)
+    month = db.Column(db.Date, primary_key=True)  # first day of the month
+    hours = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<OrganizationMonthlyHours org={self.organization_id} month={self.month} hours={self.hours}>"
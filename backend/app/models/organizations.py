@@ -1,11 +1,14 @@
 from datetime import datetime, timezone
 from app.config.database import db
-from .base import BaseModel
+from .base import BaseModel, key_type
 
 class Organization(BaseModel):
     __tablename__ = "organizations"
+    __table_args__ = (
+        db.Index("ix_organizations_owner_id", "owner_id"),
+    )
 
-    owner_id = db.Column(db.String(100), db.ForeignKey("users.id"), nullable=False)
+    owner_id = db.Column(key_type(), db.ForeignKey("users.id"), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
     contact_email = db.Column(db.String(120), unique=True, nullable=False)
@@ -1,12 +1,16 @@
 from datetime import datetime, timezone
 from app.config.database import db
-from .base import BaseModel
+from .base import BaseModel, key_type
 
 class Participation(BaseModel):
     __tablename__ = "participations"
+    __table_args__ = (
+        db.Index("ix_participations_event_id_status", "event_id", "status"),
+        db.Index("uq_participations_user_id_event_id", "user_id", "event_id", unique=True),
+    )
 
-    user_id = db.Column(db.String(100), db.ForeignKey('users.id'), nullable=False)
-    event_id = db.Column(db.String(100), db.ForeignKey('events.id'), nullable=False)
+    user_id = db.Column(key_type(), db.ForeignKey('users.id'), nullable=False)
+    event_id = db.Column(key_type(), db.ForeignKey('events.id'), nullable=False)
     status = db.Column(db.String(20), nullable=False)
     volunteer_hours = db.Column(db.Numeric(5, 2), default=0.00)
     applied_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
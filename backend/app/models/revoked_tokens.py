@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+from app.config.database import db
+from .base import BaseModel, key_type
+
+
+class RevokedToken(BaseModel):
+    """A revoked JWT, by jti. Rows are purged once the token would have expired anyway."""
+    __tablename__ = "revoked_tokens"
+
+    jti = db.Column(db.String(64), nullable=False, unique=True)
+    token_type = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(key_type(), db.ForeignKey('users.id'), nullable=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken {self.token_type} {self.jti}>"
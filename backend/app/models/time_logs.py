@@ -1,14 +1,23 @@
 from datetime import datetime, timezone
 from app.config.database import db
-from .base import BaseModel
+from .base import BaseModel, key_type
 
 
 class TimeLog(BaseModel):
     __tablename__ = "time_logs"
+    __table_args__ = (
+        # Only open sessions are looked up by participation, keep the index small
+        db.Index(
+            "ix_time_logs_open_participation_id",
+            "participation_id",
+            sqlite_where=db.text("check_out_time IS NULL"),
+            postgresql_where=db.text("check_out_time IS NULL")
+        ),
+    )
 
-    participation_id = db.Column(db.String(100), db.ForeignKey('participations.id'), nullable=False)
-    user_id = db.Column(db.String(100), db.ForeignKey('users.id'), nullable=False)
-    event_id = db.Column(db.String(100), db.ForeignKey('events.id'), nullable=False)
+    participation_id = db.Column(key_type(), db.ForeignKey('participations.id'), nullable=False)
+    user_id = db.Column(key_type(), db.ForeignKey('users.id'), nullable=False)
+    event_id = db.Column(key_type(), db.ForeignKey('events.id'), nullable=False)
     check_in_time = db.Column(db.DateTime, nullable=False)
     check_out_time = db.Column(db.DateTime, nullable=True)
     hours_worked = db.Column(db.Numeric(5, 2), default=0.00)
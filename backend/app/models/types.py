@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+import uuid
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+_uuid7_lock = threading.Lock()
+_uuid7_last = [0, 0]  # last timestamp (ms) and sequence handed out
+
+
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit Unix time in milliseconds,
+    then a 12-bit sequence that keeps ids monotonic within the same
+    millisecond, then 62 random bits. Consecutive inserts land next to each
+    other in B-tree indexes instead of at random pages.
+    """
+    with _uuid7_lock:
+        timestamp = time.time_ns() // 1_000_000
+        last_timestamp, sequence = _uuid7_last
+        if timestamp <= last_timestamp:
+            # Same millisecond (or clock went backwards): keep counting up
+            timestamp = last_timestamp
+            sequence += 1
+            if sequence > 0xFFF:
+                timestamp += 1
+                sequence = 0
+        else:
+            sequence = int.from_bytes(os.urandom(2), "big") & 0x3FF
+        _uuid7_last[0], _uuid7_last[1] = timestamp, sequence
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (
+        (timestamp & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | sequence << 64
+        | 0b10 << 62
+        | random_bits
+    )
+    return uuid.UUID(int=value)
+
+
+class CompactUUID(TypeDecorator):
+    """
+    UUID key stored as native UUID on PostgreSQL and as a 16-byte BLOB
+    elsewhere, instead of 36+ characters of text.
+
+    Python code keeps seeing the canonical string form ("0192...-...") in and
+    out, so route parameters such as <string:participation_id> and JSON
+    payloads do not change. A value that is not a UUID binds as NULL, which
+    simply matches no row.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            try:
+                value = uuid.UUID(str(value))
+            except ValueError:
+                return None
+        return value if dialect.name == "postgresql" else value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return str(uuid.UUID(bytes=bytes(value)))
+
+    def process_literal_param(self, value, dialect):
+        value = self.process_bind_param(value, dialect)
+        if value is None:
+            return "NULL"
+        if dialect.name == "postgresql":
+            return f"'{value}'"
+        return f"X'{value.hex()}'"
@@ -1,14 +1,17 @@
 from datetime import datetime, timezone
 from app.config.database import db
-from .base import BaseModel
+from .base import BaseModel, key_type
 
 class UserBadge(BaseModel):
     __tablename__ = "user_badges"
+    __table_args__ = (
+        db.Index("uq_user_badges_user_id_badge_id", "user_id", "badge_id", unique=True),
+    )
 
-    user_id = db.Column(db.String(100), db.ForeignKey('users.id'), nullable=False)
-    badge_id = db.Column(db.String(100), db.ForeignKey('badges.id'), nullable=False)
+    user_id = db.Column(key_type(), db.ForeignKey('users.id'), nullable=False)
+    badge_id = db.Column(key_type(), db.ForeignKey('badges.id'), nullable=False)
     awarded_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
-    event_id = db.Column(db.String(100), db.ForeignKey('events.id'), nullable=True)
+    event_id = db.Column(key_type(), db.ForeignKey('events.id'), nullable=True)
 
     # Relationships
     user = db.relationship("User", back_populates="user_badges")
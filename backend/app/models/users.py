@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
-from app.config.database import db,bcrypt
+from app.config.database import db
+from app.utils.password_hasher import password_hasher
 from .base import BaseModel
 
 class User(BaseModel):
@@ -31,10 +32,13 @@ class User(BaseModel):
     time_logs = db.relationship("TimeLog", back_populates="user", lazy=True)
 
     def set_password(self, password):
-        self.password = bcrypt.generate_password_hash(password).decode("utf-8")
+        self.password = password_hasher.hash(password)
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password, password)
+        return password_hasher.verify(password, self.password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password)
 
     def __repr__(self):
         return f"<User {self.name} ({self.role})>"
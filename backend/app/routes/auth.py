@@ -1,11 +1,18 @@
-from flask import request, jsonify
-from datetime import timedelta
+from flask import current_app, request, jsonify
 from flask_restful import Resource
 from flask_cors import cross_origin
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_current_user, set_access_cookies, set_refresh_cookies, unset_jwt_cookies, create_refresh_token
+from flask_jwt_extended import jwt_required, get_current_user, get_jwt, decode_token, set_access_cookies, set_refresh_cookies, unset_jwt_cookies
+from jwt.exceptions import PyJWTError
+from sqlalchemy.exc import IntegrityError
 from app.config.database import db
 from app.models.users import User
 from app.models.organizations import Organization
+from app.utils.auth_helper import claims_required, create_identity_token, create_session_tokens, load_user_for_update
+from app.utils.password_hasher import HasherBusy
+from app.utils.token_blocklist import token_blocklist
+
+# Sent with 503 when the password hashing pool is saturated
+BUSY_HEADERS = {"Retry-After": "1"}
 
 class RegisterUser(Resource):
   
@@ -34,7 +41,10 @@ class RegisterUser(Resource):
             phone_number=phone_number,
             role = role
         )
-        user.set_password(password)
+        try:
+            user.set_password(password)
+        except HasherBusy:
+            return {"message": "Server is busy, please try again shortly."}, 503, BUSY_HEADERS
         db.session.add(user)
         db.session.commit()
 
@@ -53,8 +63,16 @@ class LoginUser(Resource):
             User.username == username
         ).first()
 
-        if not user or not user.check_password(password):
-            return {"message": "Invalid credentials."}, 401
+        try:
+            if not user or not user.check_password(password):
+                return {"message": "Invalid credentials."}, 401
+
+            # Upgrade hashes made with an outdated cost while we have the plain password
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
+        except HasherBusy:
+            return {"message": "Server is busy, please try again shortly."}, 503, BUSY_HEADERS
 
         response = jsonify({
             "message": "Login successful.",
@@ -67,14 +85,8 @@ class LoginUser(Resource):
                 "is_org_onboarded": user.is_org_onboarded
             }})
 
-        access_token = create_access_token(
-            identity=user.id,
-            expires_delta=timedelta(hours=2)
-        )
-        refresh_token = create_refresh_token(
-            identity=user.id,
-            expires_delta=timedelta(days=7)
-        )
+        # Role and organization ride along as claims so views can authorize without a lookup
+        access_token, refresh_token = create_session_tokens(user)
         set_access_cookies(response,access_token)
         set_refresh_cookies(response, refresh_token)
         response.status_code = 200
@@ -82,14 +94,22 @@ class LoginUser(Resource):
         return response
     
 class LogoutUser(Resource):
-    @jwt_required()
+    @claims_required()
     def post(self):
-        user = get_current_user()
-        current_user_id = get_jwt_identity()
+        # Revoke both tokens so copies of the cookies stop working right away
+        access = get_jwt()
+        token_blocklist.revoke(access["jti"], "access", access["exp"], user_id=access["sub"])
+
+        refresh_cookie = request.cookies.get(current_app.config["JWT_REFRESH_COOKIE_NAME"])
+        if refresh_cookie:
+            try:
+                refresh = decode_token(refresh_cookie)
+            except PyJWTError:
+                refresh = None
+            if refresh and refresh["sub"] == access["sub"]:
+                token_blocklist.revoke(refresh["jti"], "refresh", refresh["exp"], user_id=refresh["sub"])
+        db.session.commit()
 
-        if user.id != current_user_id:
-            return {"message": "Unauthorized"}, 401
-        
         response = jsonify({
             "message": f"User logged out successfully"
         })
@@ -97,14 +117,40 @@ class LogoutUser(Resource):
         response.status_code = 200
         return response
 
-class OnboardOrganisation(Resource):
-    @jwt_required()
+class RefreshToken(Resource):
+    @jwt_required(refresh=True)
     def post(self):
+        """
+        Exchange the refresh cookie for a new access token and a new refresh
+        token, without a password check. Each refresh token works once; a
+        spent one presented again revokes the session (see detect_refresh_reuse).
+        """
         user = get_current_user()
-        current_user_id = get_jwt_identity()
+        refresh = get_jwt()
+
+        # 1. Spend the presented refresh token
+        token_blocklist.revoke(refresh["jti"], "rotated", refresh["exp"], user_id=user.id)
+
+        # 2. New pair in the same session family
+        access_token, refresh_token = create_session_tokens(user, family=refresh.get("family"))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request already rotated this token
+            db.session.rollback()
+            return {"msg": "Token has been revoked"}, 401
+
+        response = jsonify({"message": "Token refreshed."})
+        set_access_cookies(response, access_token)
+        set_refresh_cookies(response, refresh_token)
+        response.status_code = 200
+        return response
 
-        if user.id != current_user_id:
-            return {"message": "Unauthorized"}, 401
+
+class OnboardOrganisation(Resource):
+    @jwt_required()
+    def post(self):
+        user = load_user_for_update(get_current_user().id)
 
         if user.role != "organization":
             return {"message": "Only organization accounts can complete onboarding."}, 403
@@ -142,6 +188,11 @@ class OnboardOrganisation(Resource):
         db.session.add(organization)
         db.session.commit()
 
-        return {"message": "Organization onboarded successfully!"}, 201
-    
-# TODO Refrsh resource 
\ No newline at end of file
+        response = jsonify({"message": "Organization onboarded successfully!"})
+        # The token claims now carry the new organization
+        set_access_cookies(
+            response,
+            create_identity_token(user, organization_id=organization.id, family=get_jwt().get("family"))
+        )
+        response.status_code = 201
+        return response
@@ -0,0 +1,65 @@
+from flask import request
+from flask_restful import Resource
+from app.utils.auth_helper import claims_required, current_identity
+from app.utils.leaderboard import leaderboard
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, parse_limit
+
+
+class Leaderboard(Resource):
+    @claims_required()
+    def get(self):
+        """
+        Volunteers by total hours, best first, globally or among the volunteers
+        of ?organization_id=. Volunteers with equal hours share a rank.
+        Pass the returned `next` cursor back to fetch the following page.
+        """
+        args = request.args
+
+        try:
+            limit = parse_limit(args.get("limit"))
+        except ValueError as e:
+            return {"message": str(e)}, 400
+
+        after = None
+        cursor = args.get("next")
+        if cursor:
+            try:
+                after = tuple(decode_cursor(cursor, 2))
+            except InvalidCursor as e:
+                return {"message": str(e)}, 400
+            # Board keys are (-hours in cents, user id); anything else cannot be compared with them
+            hours, user_id = after
+            if isinstance(hours, bool) or not isinstance(hours, (int, float)) or not isinstance(user_id, str):
+                return {"message": "Invalid pagination cursor."}, 400
+
+        page = leaderboard.top(limit, args.get("organization_id"), after)
+        if page is None:
+            return {"message": "Organization not found."}, 404
+        entries, last, volunteers = page
+
+        return {
+            "message": "Leaderboard retrieved successfully",
+            "volunteers": volunteers,
+            "entries": entries,
+            "next": encode_cursor(*last) if last else None
+        }, 200
+
+
+class LeaderboardMe(Resource):
+    @claims_required(role="volunteer", message="Only volunteers are ranked.")
+    def get(self):
+        """The caller's rank, as in "#rank of volunteers", globally or in ?organization_id=."""
+        ranked = leaderboard.rank(current_identity().id, request.args.get("organization_id"))
+        if ranked is None:
+            return {"message": "Organization not found."}, 404
+
+        entry, volunteers = ranked
+        if entry is None:
+            return {"message": "You are not on this leaderboard yet.", "volunteers": volunteers}, 404
+
+        return {
+            "message": "Rank retrieved successfully",
+            "rank": entry["rank"],
+            "volunteers": volunteers,
+            "hours": entry["hours"]
+        }, 200
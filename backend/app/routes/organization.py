@@ -1,129 +1,394 @@
-from flask import request, jsonify
+import csv
+from flask import current_app, request, jsonify
 from flask_restful import Resource
-from flask_jwt_extended import jwt_required, get_current_user, get_jwt_identity
 from app.config.database import db
 from app.models.events import Event
 from app.models.organizations import Organization
-from app.schema.event_schema import events_schema
-from datetime import datetime
+from app.models.participations import Participation
+from app.schema.event_schema import EVENT_COLUMNS, encode_event
+from app.schema.row_encoder import encode_rows, row_encoder
+from app.utils.auth_helper import claims_required, current_identity
+from app.utils.event_import import InvalidEvent, csv_records, import_events, parse_event
+from app.utils.event_search import render_snippet, search_events, search_terms
+from app.utils.http_cache import not_modified, validators
+from app.utils.organization_analytics import organization_analytics
+from app.utils.response_cache import cache_tags, cached_response
+from app.utils.single_flight import coalesce_requests
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, parse_bool, parse_limit
+from datetime import datetime, timezone
+from sqlalchemy import func, select, tuple_
 
 class EventManagement(Resource):
-    @jwt_required()
+    @claims_required(role="organization", message="Only organization accounts can create events.", organization=True)
     def post(self):
-        user = get_current_user()
-        current_user_id = get_jwt_identity()
-
-        if user.id != current_user_id:
-            return {"message": "Unauthorized"}, 401
-        
-        if user.role != "organization":
-            return {"message": "Only organization accounts can create events."}, 403
-        
-        organization = Organization.query.filter_by(owner_id=user.id).first()
-        if not organization:
-            return {"message": "Organization not found."}, 404
+        identity = current_identity()
+
+        try:
+            values = parse_event(request.get_json())
+        except InvalidEvent as e:
+            return {"message": str(e)}, 400
 
-        data = request.get_json()
+        event = Event(organization_id=identity.organization_id, **values)
+
+        db.session.add(event)
+        db.session.commit()
 
-        title = data.get("title")
-        description = data.get("description")
-        location = data.get("location")
-        start_time = data.get("start_time")
-        end_time = data.get("end_time")
-        max_participants = data.get("max_participants")
+        return {"message": "Event created successfully!"}, 201
 
-        if not all([title, description, location, start_time, end_time, max_participants]):
-            return {"message": "All fields are required."}, 400
+
+    @coalesce_requests()
+    @cached_response
+    def get(self):
+        """
+        Public, keyset-paginated event feed ordered by (start_time, id).
+        Pass the returned `next` cursor back to fetch the following page.
+        Pages carry a weak ETag; a matching If-None-Match gets a bare 304.
+        """
+        args = request.args
 
         try:
-            start_time = datetime.fromisoformat(start_time)
-            end_time = datetime.fromisoformat(end_time)
+            limit = parse_limit(args.get("limit"))
+        except ValueError as e:
+            return {"message": str(e)}, 400
+
+        # 1. Filters
+        criteria = []
+        organization_id = args.get("organization_id")
+        if organization_id:
+            criteria.append(Event.organization_id == organization_id)
+
+        try:
+            starts_from = args.get("from")
+            starts_to = args.get("to")
+            if starts_from:
+                criteria.append(Event.start_time >= datetime.fromisoformat(starts_from))
+            if starts_to:
+                criteria.append(Event.start_time < datetime.fromisoformat(starts_to))
         except ValueError:
             return {"message": "Invalid datetime format. Use ISO format (YYYY-MM-DDTHH:MM:SS)."}, 400
 
-        if end_time <= start_time:
-            return {"message": "End time must be after start time."}, 400
-
-        event = Event(
-            organization_id=organization.id,
-            title=title,
-            description=description,
-            location=location,
-            start_time=start_time,
-            end_time=end_time,
-            max_participants=max_participants
+        if parse_bool(args.get("upcoming")):
+            criteria.append(Event.start_time >= datetime.now(timezone.utc))
+
+        if parse_bool(args.get("has_seats")):
+            criteria.append(Event.approved_count < Event.max_participants)
+
+        # 2. Seek past the last row of the previous page
+        cursor = args.get("next")
+        if cursor:
+            try:
+                last_start, last_id = decode_cursor(cursor, 2)
+            except InvalidCursor as e:
+                return {"message": str(e)}, 400
+            criteria.append(
+                tuple_(Event.start_time, Event.id) > (last_start, last_id)
+            )
+
+        # 3. Keys and versions of the page, one extra row to know whether
+        # another page exists
+        keys = db.session.execute(
+            select(Event.id, Event.start_time, Event.updated_at)
+            .where(*criteria)
+            .order_by(Event.start_time.asc(), Event.id.asc())
+            .limit(limit + 1)
+        ).all()
+
+        if not keys and not cursor:
+            return {"message": "No events found for this organization."}, 404
+
+        next_cursor = None
+        if len(keys) > limit:
+            keys = keys[:limit]
+            next_cursor = encode_cursor(keys[-1].start_time, keys[-1].id)
+
+        # 4. What the page shows, for the response cache: any event of the
+        # listing, and the counters of the events on it
+        cache_tags(
+            f"org:{organization_id}" if organization_id else "events:list",
+            *(f"event:{key.id}" for key in keys)
         )
+        if parse_bool(args.get("has_seats")):
+            cache_tags("events:seats")
+
+        # 5. Same rows at the same versions: the client's copy is current.
+        # No Last-Modified: which rows make the page also depends on the
+        # clock (upcoming) and on rows whose updated_at it would not cover
+        headers = validators(tuple((key.id, key.updated_at) for key in keys), next_cursor)
+        unchanged = not_modified(headers)
+        if unchanged is not None:
+            return unchanged
+
+        # 6. Only the columns of the public representation, as Row tuples
+        rows_by_id = {}
+        if keys:
+            rows = db.session.execute(
+                select(*EVENT_COLUMNS).where(Event.id.in_([key.id for key in keys]))
+            ).all()
+            rows_by_id = {row.id: row for row in rows}
+        events = [encode_event(rows_by_id[key.id]) for key in keys if key.id in rows_by_id]
+
+        return ({
+            "message": "Events retrieved successfully",
+            "events": events,
+            "count": len(events),
+            "next": next_cursor
+        },), 200, headers
+
+
+class EventBulkImport(Resource):
+    @claims_required(role="organization", message="Only organization accounts can create events.", organization=True)
+    def post(self):
+        """
+        Create many events at once from a JSON array, or from a CSV upload
+        (a text/csv body or a multipart `file`) with a header row naming the
+        event fields. Rows are validated like single events; invalid rows are
+        reported by number and the valid ones are still created, all in one
+        transaction.
+        """
+        identity = current_identity()
+
+        # 1. Records, read incrementally for CSV
+        try:
+            if request.mimetype == "text/csv":
+                records = csv_records(request.stream)
+            elif "file" in request.files:
+                records = csv_records(request.files["file"].stream)
+            else:
+                records = request.get_json(silent=True)
+                if isinstance(records, dict):
+                    records = records.get("events")
+                if not isinstance(records, list):
+                    return {"message": "Send a JSON array of events or a CSV file."}, 400
+
+            # 2. Validate and insert in batches
+            created, errors = import_events(
+                identity.organization_id,
+                records,
+                chunk_size=current_app.config["BULK_EVENT_CHUNK_SIZE"],
+                max_rows=current_app.config["BULK_EVENT_MAX_ROWS"]
+            )
+        except InvalidEvent as e:
+            db.session.rollback()
+            return {"message": str(e)}, 400
+        except UnicodeDecodeError:
+            db.session.rollback()
+            return {"message": "The CSV file must be UTF-8 encoded."}, 400
+        except csv.Error as e:
+            db.session.rollback()
+            return {"message": f"Malformed CSV: {e}"}, 400
+
+        if not created:
+            db.session.rollback()
+            return {"message": "No events were created.", "created": 0, "errors": errors}, 400
 
-        db.session.add(event)
         db.session.commit()
 
-        return {"message": "Event created successfully!"}, 201
+        return {
+            "message": f"{created} events created successfully!",
+            "created": created,
+            "errors": errors
+        }, 201
 
 
+class EventSearch(Resource):
     def get(self):
-        events = Event.query.all()
+        """
+        Public keyword search over event titles, locations and descriptions,
+        best match first. Each event carries an HTML `snippet` with the
+        matched words wrapped in <mark>. Paginate with the `next` cursor.
+        """
+        args = request.args
 
-        if not events:
-            return {"message": "No events found for this organization."}, 404
+        terms = search_terms(args.get("q"))
+        if not terms:
+            return {"message": "A search query (q) is required."}, 400
+
+        try:
+            limit = parse_limit(args.get("limit"))
+        except ValueError as e:
+            return {"message": str(e)}, 400
+
+        after = None
+        cursor = args.get("next")
+        if cursor:
+            try:
+                after = decode_cursor(cursor, 2)
+            except InvalidCursor as e:
+                return {"message": str(e)}, 400
+
+        # 1. Ranked ids and snippets, one extra row to detect a next page
+        hits = search_events(terms, limit + 1, after=after)
+
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            next_cursor = encode_cursor(hits[-1].score, hits[-1].tiebreak)
+
+        # 2. Load the page's events and keep the ranking order
+        events_by_id = {}
+        if hits:
+            rows = db.session.execute(
+                select(*EVENT_COLUMNS).where(Event.id.in_([hit.id for hit in hits]))
+            ).all()
+            events_by_id = {row.id: encode_event(row) for row in rows}
+
+        results = []
+        for hit in hits:
+            data = events_by_id.get(hit.id)
+            if data is None:
+                continue
+            data["snippet"] = render_snippet(hit.snippet)
+            results.append(data)
 
         return {
             "message": "Events retrieved successfully",
-            "events": events_schema.dump(events) 
-        },
+            "events": results,
+            "count": len(results),
+            "next": next_cursor
+        }, 200
+
+
+ORGANIZATION_EVENT_COLUMNS = (
+    Event.id,
+    Event.title,
+    Event.description,
+    Event.location,
+    Event.start_time,
+    Event.end_time,
+    func.count(Participation.id).label("participants_count"),
+)
+encode_organization_event = row_encoder(*ORGANIZATION_EVENT_COLUMNS)
 
 
 class OrganizationSpecificEvents(Resource):
-    @jwt_required()
+    @claims_required()
+    # The listing is the same for every signed-in caller
+    @coalesce_requests()
     def get(self, organization_id):
-  
-        current_user = get_current_user()
 
-        # 1. Check if the Organization exists
-        organization = Organization.query.get(organization_id)
-        if not organization:
+        # 1. Check if the Organization exists, with the versions of its events.
+        # Applications bump their event's updated_at through the counters.
+        state = db.session.execute(
+            select(
+                Organization.name,
+                Organization.updated_at,
+                select(func.max(Event.updated_at))
+                .where(Event.organization_id == Organization.id)
+                .scalar_subquery().label("events_updated_at"),
+                select(func.count(Event.id))
+                .where(Event.organization_id == Organization.id)
+                .scalar_subquery().label("events_count"),
+            ).where(Organization.id == organization_id)
+        ).first()
+        if not state:
             return {"message": "Organization not found."}, 404
 
-        # 2. Base Query – fetch all events for this organization
-        events = (
-            Event.query
-            .filter_by(organization_id=organization_id)
-            .order_by(Event.created_at.desc())
-            .all()
+        headers = validators(
+            *state,
+            last_modified=max(filter(None, (state.updated_at, state.events_updated_at)), default=None),
+            private=True
         )
+        unchanged = not_modified(headers)
+        if unchanged is not None:
+            return unchanged
+
+        # 2. Base Query – fetch all events for this organization, counting
+        # participations in the same statement instead of loading them
+        events = db.session.execute(
+            select(*ORGANIZATION_EVENT_COLUMNS)
+            .outerjoin(Participation, Participation.event_id == Event.id)
+            .where(Event.organization_id == organization_id)
+            .group_by(Event.id)
+            .order_by(Event.created_at.desc())
+        ).all()
 
         # 3. Return the event list
         return {
-            "message": f"Events for {organization.name}",
+            "message": f"Events for {state.name}",
             "count": len(events),
-            "events": [
-                {
-                    "id": e.id,
-                    "title": e.title,
-                    "description": e.description,
-                    "location": e.location,
-                    "start_time": e.start_time.isoformat(),
-                    "end_time": e.end_time.isoformat(),
-                    "participants_count": len(e.participations)
-                }
-                for e in events
-            ]
-        }, 200
+            "events": encode_rows(encode_organization_event, events)
+        }, 200, headers
+
+class OrganizationAnalytics(Resource):
+    @claims_required(role="organization", message="Only organizations can view analytics.", organization=True)
+    def get(self, organization_id):
+        """
+        Fill rate, application funnel, no-show rate and hours delivered of the
+        organization's events, per event and in total, for events starting in
+        [?from, ?to). Cached until the organization's events, applications or
+        time logs change.
+        """
+        identity = current_identity()
+        if identity.organization_id != organization_id:
+            return {"message": "You can only view your own organization's analytics."}, 403
+        return self._analytics(organization_id)
+
+    # Below the ownership check, so a cached copy is only served to the organization
+    @cached_response
+    def _analytics(self, organization_id):
+        try:
+            starts_from = datetime.fromisoformat(request.args["from"]) if request.args.get("from") else None
+            starts_to = datetime.fromisoformat(request.args["to"]) if request.args.get("to") else None
+        except ValueError:
+            return {"message": "Invalid datetime format. Use ISO format (YYYY-MM-DDTHH:MM:SS)."}, 400
+
+        totals, events = organization_analytics(organization_id, starts_from, starts_to)
+        cache_tags(
+            f"org:{organization_id}",
+            *(f"event:{event['event_id']}" for event in events),
+            *(f"event:{event['event_id']}:logs" for event in events)
+        )
+
+        return {
+            "message": "Analytics retrieved successfully",
+            "from": starts_from.isoformat() if starts_from else None,
+            "to": starts_to.isoformat() if starts_to else None,
+            "totals": totals,
+            "events": events
+        }, 200, {"Cache-Control": "private, no-cache", "Vary": "Cookie"}
 
 class OrganizationProfile(Resource):
+    @cached_response
     def get(self, organization_id):
         """
         Public endpoint: Anyone can view an organization's basic details.
         """
-        org = Organization.query.get(organization_id)
+        # Calculate active (not yet ended) events for a nice summary
+        active_events_count = (
+            select(func.count(Event.id))
+            .where(
+                Event.organization_id == Organization.id,
+                Event.end_time >= datetime.now(timezone.utc)
+            )
+            .scalar_subquery()
+        )
+        org = db.session.execute(
+            select(
+                Organization.id,
+                Organization.name,
+                Organization.description,
+                Organization.address,
+                Organization.website,
+                Organization.contact_email,
+                Organization.phone,
+                Organization.created_at,
+                Organization.updated_at,
+                active_events_count.label("active_events"),
+            ).where(Organization.id == organization_id)
+        ).first()
 
         if not org:
             return {"message": "Organization not found."}, 404
 
-        # Calculate active events for a nice summary
-        active_events_count = Event.query.filter_by(
-            organization_id=org.id, 
-            status='published'
-        ).count()
+        # Profile edits and the organization's events
+        cache_tags(f"org:{org.id}")
+
+        # No Last-Modified: the active event count changes without the
+        # organization row, so only the ETag covers the whole representation
+        headers = validators(org.updated_at, org.active_events)
+        unchanged = not_modified(headers)
+        if unchanged is not None:
+            return unchanged
 
         return {
             "organization": {
@@ -136,30 +401,45 @@ class OrganizationProfile(Resource):
                 "phone": org.phone,
                 "joined_at": org.created_at.isoformat(),
                 "stats": {
-                    "active_events": active_events_count
+                    "active_events": org.active_events
                 }
             }
-        }, 200
+        }, 200, headers
 
 
 class MyOrganization(Resource):
-    @jwt_required()
+    @claims_required(role="organization", message="Only organizations have profiles.")
     def get(self):
         """
         Private endpoint: The logged-in Organization fetching their own details.
         Useful for the 'Edit Profile' page or Dashboard Header.
         """
-        user = get_current_user()
+        identity = current_identity()
 
-        if user.role != "organization":
-            return {"message": "Only organizations have profiles."}, 403
-
-        # Find the org owned by this user
-        org = Organization.query.filter_by(owner_id=user.id).first()
+        # The org owned by this user, as recorded in the token
+        org = None
+        if identity.organization_id:
+            org = db.session.execute(
+                select(
+                    Organization.id,
+                    Organization.name,
+                    Organization.description,
+                    Organization.contact_email,
+                    Organization.phone,
+                    Organization.website,
+                    Organization.address,
+                    Organization.updated_at,
+                ).where(Organization.id == identity.organization_id)
+            ).first()
 
         if not org:
             return {"message": "Profile not setup yet. Please complete onboarding."}, 404
 
+        headers = validators(org.id, org.updated_at, last_modified=org.updated_at, private=True)
+        unchanged = not_modified(headers)
+        if unchanged is not None:
+            return unchanged
+
         return {
             "organization": {
                 "id": org.id,
@@ -171,4 +451,4 @@ class MyOrganization(Resource):
                 "address": org.address,
                 "updated_at": org.updated_at.isoformat() if org.updated_at else None
             }
-        }, 200
\ No newline at end of file
+        }, 200, headers
@@ -1,24 +1,23 @@
+from flask import current_app, request
 from flask_restful import Resource
-from flask_jwt_extended import jwt_required, get_current_user, get_jwt_identity
 from app.config.database import db
 from app.models.events import Event
 from app.models.participations import Participation
-from app.models.organizations import Organization
 from app.models.users import User
+from app.utils.auth_helper import claims_required, current_identity, load_current_user
 from app.utils.badge_helper import check_and_award_badges
+from app.utils.capacity_helper import add_pending, release_seats, reserve_seats
+from app.utils.hour_rollups import record_sessions
+from app.utils.leaderboard import leaderboard
 from datetime import datetime, timezone
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 class ApplyToEvent(Resource):
-    @jwt_required()
+    @claims_required(role="volunteer", message="Only volunteers can apply to events.")
     def post(self, event_id):
-        user = get_current_user()
-        current_user_id = get_jwt_identity()
-
-        if user.id != current_user_id:
-            return {"message": "Unauthorized"}, 401
-        
-        if user.role != "volunteer":
-            return {"message": "Only volunteers can apply to events."}, 403
+        user = current_identity()
 
         event = Event.query.get(event_id)
         if not event:
@@ -34,12 +33,7 @@ class ApplyToEvent(Resource):
             return {"message": "You have already applied to this event."}, 409
 
         # Check if event has space
-        current_participants = Participation.query.filter_by(
-            event_id=event_id,
-            status="approved"
-        ).count()
-        
-        if current_participants >= event.max_participants:
+        if event.approved_count >= event.max_participants:
             return {"message": "Event is full."}, 400
 
         # Create participation
@@ -50,75 +44,191 @@ class ApplyToEvent(Resource):
         )
 
         db.session.add(participation)
-        db.session.commit()
+        add_pending(event_id)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request from the same user won the unique (user_id, event_id) index
+            db.session.rollback()
+            return {"message": "You have already applied to this event."}, 409
 
         return {"message": "Application submitted successfully!"}, 201
 
 
 class ApproveParticipation(Resource):
-    @jwt_required()
+    @claims_required(role="organization", message="Only organizations can approve applications.", organization=True)
     def put(self, participation_id):
-        user = get_current_user()
-        current_user_id = get_jwt_identity()
-
-        if user.id != current_user_id:
-            return {"message": "Unauthorized"}, 401
-        
-        if user.role != "organization":
-            return {"message": "Only organizations can approve applications."}, 403
-
-        organization = Organization.query.filter_by(owner_id=user.id).first()
-        if not organization:
-            return {"message": "Organization not found."}, 404
+        identity = current_identity()
 
         participation = Participation.query.get(participation_id)
         if not participation:
             return {"message": "Participation not found."}, 404
 
         # Check if event belongs to this organization
-        if participation.event.organization_id != organization.id:
+        if participation.event.organization_id != identity.organization_id:
             return {"message": "You can only approve applications for your own events."}, 403
 
         # Check if already approved
         if participation.status == "approved":
             return {"message": "Application already approved."}, 409
 
-        # Check if event still has space
-        current_participants = Participation.query.filter_by(
-            event_id=participation.event_id,
-            status="approved"
-        ).count()
-        
-        if current_participants >= participation.event.max_participants:
+        # Take a seat; fails if the event filled up in the meantime
+        previous_status = participation.status
+        if not reserve_seats(participation.event_id, pending=int(previous_status == "pending")):
+            db.session.rollback()
             return {"message": "Event is full."}, 400
 
-        # Update participation
-        participation.status = "approved"
-        participation.approved_at = datetime.now(timezone.utc)
+        # Update participation, unless a concurrent request already approved it
+        approved = db.session.execute(
+            update(Participation)
+            .where(
+                Participation.id == participation.id,
+                Participation.status == previous_status
+            )
+            .values(status="approved", approved_at=datetime.now(timezone.utc))
+        )
+        if approved.rowcount != 1:
+            db.session.rollback()
+            return {"message": "Application already approved."}, 409
 
         db.session.commit()
 
         return {"message": "Application approved successfully!"}, 200
 
 
+class ApproveApplications(Resource):
+    @claims_required(role="organization", message="Only organizations can approve applications.", organization=True)
+    def put(self, event_id):
+        """
+        Decide many applications of one event at once:
+        {"approve": [participation ids], "reject": [participation ids]}.
+        Approvals are admitted in application order while seats remain; the
+        rest are reported as overflowed and stay as they were. Everything
+        happens in one transaction.
+        """
+        identity = current_identity()
+
+        data = request.get_json(silent=True) or {}
+        approve_ids = data.get("approve", data.get("participation_ids")) or []
+        reject_ids = data.get("reject") or []
+        if not isinstance(approve_ids, list) or not isinstance(reject_ids, list) \
+                or not all(isinstance(i, str) for i in approve_ids + reject_ids):
+            return {"message": "approve and reject must be lists of participation ids."}, 400
+        if not approve_ids and not reject_ids:
+            return {"message": "No applications given."}, 400
+        max_ids = current_app.config["BATCH_APPROVAL_MAX_IDS"]
+        if len(approve_ids) + len(reject_ids) > max_ids:
+            return {"message": f"At most {max_ids} applications can be decided at once."}, 400
+
+        # 1. Event and ownership, once. Lock the row (where supported) so
+        # concurrent approvals of the same event queue behind this batch.
+        event = db.session.execute(
+            select(Event.organization_id, Event.max_participants, Event.approved_count)
+            .where(Event.id == event_id)
+            .with_for_update()
+        ).first()
+        if not event:
+            return {"message": "Event not found."}, 404
+        if event.organization_id != identity.organization_id:
+            return {"message": "You can only approve applications for your own events."}, 403
+
+        # 2. Current state of every listed application of this event
+        approve_set, reject_set = set(approve_ids), set(reject_ids)
+        applications = {
+            row.id: row for row in db.session.execute(
+                select(Participation.id, Participation.status, Participation.applied_at)
+                .where(
+                    Participation.event_id == event_id,
+                    Participation.id.in_(approve_set | reject_set)
+                )
+            )
+        }
+
+        invalid = []
+        to_reject = []
+        for participation_id in dict.fromkeys(reject_ids):
+            application = applications.get(participation_id)
+            if application is None:
+                invalid.append({"id": participation_id, "message": "Participation not found."})
+            elif participation_id in approve_set:
+                invalid.append({"id": participation_id, "message": "Listed for both approval and rejection."})
+            elif application.status != "pending":
+                invalid.append({"id": participation_id, "message": "Only pending applications can be rejected."})
+            else:
+                to_reject.append(participation_id)
+
+        candidates = []
+        for participation_id in dict.fromkeys(approve_ids):
+            application = applications.get(participation_id)
+            if participation_id in reject_set:
+                continue
+            if application is None:
+                invalid.append({"id": participation_id, "message": "Participation not found."})
+            elif application.status not in ("pending", "rejected"):
+                invalid.append({"id": participation_id, "message": f"Application already {application.status}."})
+            else:
+                candidates.append(application)
+
+        # 3. First come, first served up to the free seats
+        candidates.sort(key=lambda a: (a.applied_at is None, a.applied_at, a.id))
+        free_seats = max(0, event.max_participants - event.approved_count)
+        admitted, overflowed = candidates[:free_seats], candidates[free_seats:]
+
+        # 4. Set-based updates; any count mismatch means a concurrent change
+        # slipped in, so nothing is applied
+        if to_reject:
+            rejected = db.session.execute(
+                update(Participation)
+                .where(Participation.id.in_(to_reject), Participation.status == "pending")
+                .values(status="rejected")
+            )
+            if rejected.rowcount != len(to_reject):
+                db.session.rollback()
+                return {"message": "Applications changed while being processed. Please retry."}, 409
+            add_pending(event_id, -len(to_reject))
+
+        if admitted:
+            from_pending = sum(a.status == "pending" for a in admitted)
+            if not reserve_seats(event_id, seats=len(admitted), pending=from_pending):
+                db.session.rollback()
+                return {"message": "Applications changed while being processed. Please retry."}, 409
+            approved = db.session.execute(
+                update(Participation)
+                .where(
+                    Participation.id.in_([a.id for a in admitted]),
+                    Participation.status.in_(("pending", "rejected"))
+                )
+                .values(status="approved", approved_at=datetime.now(timezone.utc))
+            )
+            if approved.rowcount != len(admitted):
+                db.session.rollback()
+                return {"message": "Applications changed while being processed. Please retry."}, 409
+
+        db.session.commit()
+        if admitted:
+            # Core updates bypass the hooks that track organization leaderboard members
+            leaderboard.invalidate_organizations(event.organization_id)
+
+        return {
+            "message": f"{len(admitted)} approved, {len(to_reject)} rejected.",
+            "approved": [a.id for a in admitted],
+            "rejected": to_reject,
+            "overflowed": [a.id for a in overflowed],
+            "invalid": invalid
+        }, 200
+
+
 class CompleteParticipation(Resource):
-    @jwt_required()
+    @claims_required(role="volunteer", message="Only volunteers can complete events.")
     def put(self, participation_id):
-        user = get_current_user()
-        current_user_id = get_jwt_identity()
-
-        if user.id != current_user_id:
-            return {"message": "Unauthorized"}, 401
-        
-        if user.role != "volunteer":
-            return {"message": "Only volunteers can complete events."}, 403
+        identity = current_identity()
 
         participation = Participation.query.get(participation_id)
         if not participation:
             return {"message": "Participation not found."}, 404
 
         # Check if participation belongs to this user
-        if participation.user_id != user.id:
+        if participation.user_id != identity.id:
             return {"message": "You can only complete your own participations."}, 403
 
         # Check if participation is approved
@@ -136,53 +246,62 @@ class CompleteParticipation(Resource):
 
         # Check if event has ended
         now = datetime.now(timezone.utc)
-        if event.end_time > now:
+        end_time = event.end_time
+        if end_time.tzinfo is None:
+            end_time = end_time.replace(tzinfo=timezone.utc)
+        if end_time > now:
             return {"message": "Event has not ended yet."}, 400
 
-        # Calculate hours from event duration
-        event_duration = event.end_time - event.start_time
-        hours = event_duration.total_seconds() / 3600  # Convert to hours
-
-        # Update participation
+        # Volunteers who checked in were credited at each check-out; the
+        # others are credited the event's duration, to the cent
         participation.status = "completed"
-        participation.volunteer_hours = int(hours)  # Store as integer
         participation.completed_at = now
+        release_seats(event.id)
+        hours = 0.0
+        if not participation.time_logs:
+            hours = round((event.end_time - event.start_time).total_seconds() / 3600, 2)
+            participation.volunteer_hours = hours
+            record_sessions([(participation.user_id, event.id, event.organization_id, event.start_time, hours)])
 
         # Update user's total volunteer hours
+        user = load_current_user()
         current_total = float(user.total_volunteer_hours) if user.total_volunteer_hours else 0
         user.total_volunteer_hours = current_total + hours
 
-        # Check and award badges based on new total hours
-        check_and_award_badges(user)
+        # Check and award badges for the thresholds crossed by this completion
+        new_badges = check_and_award_badges(user, previous_hours=current_total)
 
         db.session.commit()
 
         return {
             "message": "Event completed successfully!",
-            "hours_logged": hours,
-            "total_hours": float(user.total_volunteer_hours)
+            "hours_logged": float(participation.volunteer_hours or 0),
+            "total_hours": float(user.total_volunteer_hours),
+            "new_badges": new_badges
         }, 200
 
 class EventApplications(Resource):
-    @jwt_required()
+    # 1. Security Check: Only organizations can view applicant lists
+    @claims_required(role="organization", message="Access denied. Only organizations can view applications.")
     def get(self, event_id):
-        user = get_current_user()
+        identity = current_identity()
 
-        # 1. Security Check: Only organizations can view applicant lists
-        if user.role != "organization":
-            return {"message": "Access denied. Only organizations can view applications."}, 403
-
-        event = Event.query.get(event_id)
+        event = db.session.get(Event, event_id)
         if not event:
             return {"message": "Event not found."}, 404
 
         # 2. Ownership Check: Ensure this event belongs to the logged-in user's organization
-        if event.organization.owner_id != user.id:
+        if event.organization_id != identity.organization_id:
             return {"message": "Unauthorized. You can only view applications for your own events."}, 403
 
         # 3. Fetch Participations
         # For now, we return ALL applications so you can see pending vs approved
-        participations = Participation.query.filter_by(event_id=event_id).all()
+        participations = (
+            Participation.query
+            .options(joinedload(Participation.user))
+            .filter_by(event_id=event_id)
+            .all()
+        )
 
         # 4. Serialize Data
         results = []
@@ -1,7 +1,6 @@
-from flask_marshmallow import Marshmallow
+from app.config.database import ma
 from app.models.events import Event
-
-ma = Marshmallow()
+from app.schema.row_encoder import row_encoder
 
 class EventSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
@@ -9,4 +8,21 @@ class EventSchema(ma.SQLAlchemyAutoSchema):
         
 
 event_schema = EventSchema()
-events_schema = EventSchema(many=True) 
\ No newline at end of file
+events_schema = EventSchema(many=True) 
+
+# Same fields as EventSchema, for list endpoints that select Row tuples
+# instead of loading Event instances
+EVENT_COLUMNS = (
+    Event.id,
+    Event.title,
+    Event.description,
+    Event.location,
+    Event.start_time,
+    Event.end_time,
+    Event.max_participants,
+    Event.approved_count,
+    Event.pending_count,
+    Event.created_at,
+    Event.updated_at,
+)
+encode_event = row_encoder(*EVENT_COLUMNS)
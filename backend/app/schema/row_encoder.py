@@ -0,0 +1,53 @@
+from sqlalchemy import Boolean, Date, DateTime, Numeric, Time
+
+# Compiled encoders, one per (key, conversion) shape
+_encoders = {}
+
+
+def _conversion(sql_type):
+    if isinstance(sql_type, (DateTime, Date, Time)):
+        return "iso"
+    if isinstance(sql_type, Numeric) and sql_type.asdecimal:
+        return "float"
+    if isinstance(sql_type, Boolean):
+        return "bool"
+    return None
+
+
+def _compile(shape):
+    names = [f"_{i}" for i in range(len(shape))]
+    items = []
+    for name, (key, conversion) in zip(names, shape):
+        if conversion == "iso":
+            value = f"None if {name} is None else {name}.isoformat()"
+        elif conversion == "float":
+            value = f"None if {name} is None else float({name})"
+        elif conversion == "bool":
+            value = f"bool({name})"
+        else:
+            value = name
+        items.append(f"{key!r}: {value}")
+
+    unpack = ", ".join(names) + ("," if len(names) == 1 else "")
+    source = f"def encode(row):\n    {unpack} = row\n    return {{{', '.join(items)}}}\n"
+    namespace = {}
+    exec(compile(source, "<row_encoder>", "exec"), namespace)
+    return namespace["encode"]
+
+
+def row_encoder(*columns):
+    """
+    Return a function turning a Row of `select(*columns)` into a JSON-ready
+    dict keyed by column key (use .label() to rename). Datetimes become ISO
+    strings, Decimals floats. The function is generated once per shape, so
+    encoding a row is a tuple unpack and a dict literal.
+    """
+    shape = tuple((column.key, _conversion(column.type)) for column in columns)
+    encoder = _encoders.get(shape)
+    if encoder is None:
+        encoder = _encoders[shape] = _compile(shape)
+    return encoder
+
+
+def encode_rows(encoder, rows):
+    return list(map(encoder, rows))
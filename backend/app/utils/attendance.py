@@ -0,0 +1,147 @@
+from datetime import timezone
+from sqlalchemy import update
+from app.config.database import db
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+from app.utils.auth_helper import load_user_for_update
+from app.utils.badge_helper import check_and_award_badges
+from app.utils.hour_rollups import record_sessions
+from app.utils.response_cache import mark_dirty
+
+# A forgotten check-out never counts for more than this
+MAX_SESSION_HOURS = 12.0
+
+
+def check_in(participation_id, user_id, now):
+    """
+    Open a time log session for the volunteer's approved participation.
+    Returns (body, status); the caller commits.
+    """
+    # 1. Get Participation Record
+    participation = db.session.get(Participation, participation_id)
+    if not participation:
+        return {"message": "Participation record not found."}, 404
+
+    # 2. Security: Ensure user owns this participation
+    if participation.user_id != user_id:
+        return {
+            "message": "Unauthorized. You can only check in to your own events."
+        }, 403
+
+    # 3. Status Guard: Must be approved
+    if participation.status != "approved":
+        return {
+            "message": f"Cannot check in. Your application status is {participation.status}."
+        }, 400
+
+    # 4. Prevent Double Check-in
+    # Look for a TimeLog for this participation that has NO check_out_time
+    active_log = TimeLog.query.filter_by(
+        participation_id=participation_id, check_out_time=None
+    ).first()
+
+    if active_log:
+        return {
+            "message": "You are already checked in. Please check out first."
+        }, 409
+
+    # 5. Create New TimeLog
+    # We deliberately explicitly fill user_id and event_id for the analytics benefits
+    new_log = TimeLog(
+        participation_id=participation.id,
+        user_id=participation.user_id,
+        event_id=participation.event_id,
+        check_in_time=now,
+    )
+
+    db.session.add(new_log)
+    db.session.flush()
+
+    return {
+        "message": "Checked in successfully!",
+        "session_id": new_log.id,
+        "start_time": new_log.check_in_time.isoformat(),
+    }, 201
+
+
+def check_out(participation_id, user_id, now):
+    """
+    Close the volunteer's open session and add its hours to the
+    participation and user totals. Returns (body, status); the caller commits.
+    """
+    # 1. Get Participation
+    participation = db.session.get(Participation, participation_id)
+    if not participation:
+        return {"message": "Participation record not found."}, 404
+
+    if participation.user_id != user_id:
+        return {"message": "Unauthorized."}, 403
+
+    # 2. Find the Active Session, locked against a concurrent check-out or sweep
+    active_log = TimeLog.query.filter_by(
+        participation_id=participation_id, check_out_time=None
+    ).with_for_update().first()
+
+    if not active_log:
+        return {"message": "You are not checked in."}, 400
+
+    # 3. Calculate Duration
+    check_in_time = active_log.check_in_time
+    if check_in_time.tzinfo is None:
+        check_in_time = check_in_time.replace(tzinfo=timezone.utc)
+
+    duration = now - check_in_time
+
+    # Convert seconds to hours (float)
+    hours_worked = duration.total_seconds() / 3600
+
+    # 4. Sanity Check (Anti-Abuse)
+    # If a user forgets to checkout and does so 3 days later, cap it at 12 hours
+    if hours_worked > MAX_SESSION_HOURS:
+        hours_worked = MAX_SESSION_HOURS
+
+    # If they check out instantly (e.g. accidental click), ensure at least 0.01 or 0
+    if hours_worked < 0:
+        hours_worked = 0
+
+    # The totals below add exactly what the log records, so they stay its sum
+    hours_worked = round(hours_worked, 2)
+
+    # 5. Update The TimeLog (Close the session)
+    # Only while it is still open: without row locks (SQLite) the sweeper
+    # may have closed and credited it since it was read
+    closed = db.session.execute(
+        update(TimeLog)
+        .where(TimeLog.id == active_log.id, TimeLog.check_out_time.is_(None))
+        .values(check_out_time=now, hours_worked=hours_worked)
+    ).rowcount
+    if closed != 1:
+        return {"message": "You are not checked in."}, 400
+    mark_dirty(f"event:{participation.event_id}:logs")
+
+    # 6. Update Participation Running Total
+    # We treat participation.volunteer_hours as a cache
+    current_event_total = float(participation.volunteer_hours or 0)
+    participation.volunteer_hours = current_event_total + hours_worked
+
+    # 7. Update User Grand Total
+    user = load_user_for_update(user_id)
+    current_user_total = float(user.total_volunteer_hours or 0)
+    user.total_volunteer_hours = current_user_total + hours_worked
+
+    # 8. Pre-aggregated hours for reports, in the same transaction
+    record_sessions([(
+        user_id, participation.event_id, participation.event.organization_id,
+        active_log.check_in_time, active_log.hours_worked
+    )])
+
+    # 9. Gamification Trigger
+    new_badges = check_and_award_badges(user, previous_hours=current_user_total)
+
+    return {
+        "message": "Checked out successfully!",
+        "session_hours": float(active_log.hours_worked),
+        "event_total_hours": float(participation.volunteer_hours),
+        "user_total_hours": float(user.total_volunteer_hours),
+        "new_badges": new_badges,
+    }, 200
@@ -0,0 +1,144 @@
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from flask import g
+from flask_jwt_extended import create_access_token, create_refresh_token, get_current_user, verify_jwt_in_request
+from sqlalchemy import select
+from app.config.database import db
+from app.models.organizations import Organization
+from app.models.revoked_tokens import RevokedToken
+from app.models.users import User
+from app.utils.identity_cache import identity_cache
+from app.utils.token_blocklist import family_key, token_blocklist
+
+ACCESS_TOKEN_EXPIRES = timedelta(hours=2)
+REFRESH_TOKEN_EXPIRES = timedelta(days=7)
+
+# Who is calling, as far as the access token tells
+TokenIdentity = namedtuple("TokenIdentity", ["id", "role", "organization_id", "is_org_onboarded"])
+
+
+def identity_claims(user, organization_id=None):
+    """Authorization claims embedded in access tokens."""
+    if organization_id is None and user.role == "organization":
+        organization_id = db.session.execute(
+            select(Organization.id).where(Organization.owner_id == user.id).limit(1)
+        ).scalar()
+    return {
+        "role": user.role,
+        "organization_id": organization_id,
+        "is_org_onboarded": bool(user.is_org_onboarded),
+    }
+
+
+def create_identity_token(user, organization_id=None, family=None, expires_delta=ACCESS_TOKEN_EXPIRES):
+    claims = identity_claims(user, organization_id)
+    if family:
+        claims["family"] = family
+    return create_access_token(identity=user.id, additional_claims=claims, expires_delta=expires_delta)
+
+
+def create_session_tokens(user, family=None, organization_id=None):
+    """
+    Access and refresh token pair for a login session. Every token of the
+    session shares a `family` claim, so the whole chain of rotated refresh
+    tokens can be revoked at once (see RefreshToken).
+    """
+    family = family or uuid.uuid4().hex
+    access_token = create_identity_token(user, organization_id=organization_id, family=family)
+    refresh_token = create_refresh_token(
+        identity=user.id,
+        additional_claims={"family": family},
+        expires_delta=REFRESH_TOKEN_EXPIRES
+    )
+    return access_token, refresh_token
+
+
+def detect_refresh_reuse(jwt_data, grace):
+    """
+    Called when a revoked refresh token is presented. If it was spent by a
+    rotation more than `grace` seconds ago (two tabs refreshing at once land
+    within the grace), a copy of it is in someone else's hands: revoke every
+    token of its session family. Returns True when the family was revoked.
+    """
+    family = jwt_data.get("family")
+    if jwt_data.get("type") != "refresh" or not family:
+        return False
+
+    rotated_at = db.session.execute(
+        select(RevokedToken.revoked_at)
+        .where(RevokedToken.jti == jwt_data["jti"], RevokedToken.token_type == "rotated")
+    ).scalar()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if rotated_at is None or now - rotated_at < grace:
+        return False
+    if token_blocklist.is_revoked(family_key(family)):
+        return True
+
+    token_blocklist.revoke(family_key(family), "family", now + REFRESH_TOKEN_EXPIRES, user_id=jwt_data["sub"])
+    db.session.commit()
+    return True
+
+
+def token_identity(jwt_data):
+    """
+    Build the caller's identity from the token claims alone. Tokens issued
+    before the claims existed fall back to the user row (and organization).
+    """
+    if "role" in jwt_data:
+        return TokenIdentity(
+            id=jwt_data["sub"],
+            role=jwt_data["role"],
+            organization_id=jwt_data.get("organization_id"),
+            is_org_onboarded=jwt_data.get("is_org_onboarded", False),
+        )
+
+    user = identity_cache.load_user(jwt_data["sub"])
+    if user is None:
+        return None
+    return TokenIdentity(id=user.id, **identity_claims(user))
+
+
+def claims_required(role=None, message="Access denied.", organization=False):
+    """
+    Like @jwt_required(), but the current identity (see current_identity)
+    comes from the token claims and no user is loaded from the database.
+    Optionally require a role (403 with `message` otherwise) and, for
+    organization accounts, an onboarded organization (404 otherwise).
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            # Read by the user_lookup_loader in create_app
+            g._claims_only = True
+            verify_jwt_in_request()
+            identity = get_current_user()
+
+            if role and identity.role != role:
+                return {"message": message}, 403
+            if organization and not identity.organization_id:
+                return {"message": "Organization not found."}, 404
+
+            return fn(*args, **kwargs)
+        return decorator
+    return wrapper
+
+
+def current_identity():
+    """TokenIdentity of the caller inside a @claims_required view."""
+    return get_current_user()
+
+
+def load_user_for_update(user_id):
+    """
+    Current User row, locked for the rest of the transaction, for code that
+    writes to it. The identity cache only serves authentication: its
+    snapshots can be behind other processes' writes (e.g. the sweeper).
+    """
+    return db.session.get(User, user_id, populate_existing=True, with_for_update=True)
+
+
+def load_current_user():
+    """Full User row of the caller, for @claims_required views that modify it."""
+    return load_user_for_update(current_identity().id)
@@ -1,50 +1,160 @@
+import threading
+import time
+from bisect import bisect_right
+from sqlalchemy import event, exists, insert, select
+from sqlalchemy.orm import Session
 from app.config.database import db
 from app.models.badges import Badge
 from app.models.user_badges import UserBadge
 from app.models.users import User
 
-def check_and_award_badges(user):
+# Badge names and the total volunteer hours needed to earn them
+BADGE_THRESHOLDS = [
+    {"name": "Beginner", "hours": 10},
+    {"name": "Novice", "hours": 50},
+    {"name": "Changemaker", "hours": 75},
+    {"name": "Skillful Intern", "hours": 100},
+    {"name": "Expert Intern", "hours": 300},
+    {"name": "Elite Intern", "hours": 450},
+]
+
+
+class BadgeCatalog:
+    """
+    Process-wide, sorted view of the hour thresholds and the badge rows that
+    back them. Loaded with one query and reloaded when the badges table
+    changes (or after `ttl` seconds, to pick up changes made elsewhere).
+    """
+
+    def __init__(self, thresholds, ttl=300):
+        self.thresholds = sorted(thresholds, key=lambda t: t["hours"])
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (hours, badges) swapped in as one tuple, so readers never pair
+        # the thresholds of one load with the badges of another
+        self._levels = ([], [])
+        self._loaded_at = None
+
+    def init_app(self, app):
+        self.ttl = app.config.get("BADGE_CATALOG_TTL", self.ttl)
+        self.invalidate()
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def _ensure_loaded(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return
+
+            names = [t["name"] for t in self.thresholds]
+            ids_by_name = dict(
+                db.session.execute(
+                    select(Badge.name, Badge.id).where(Badge.name.in_(names))
+                ).all()
+            )
+
+            # Thresholds whose badge has not been seeded yet are skipped
+            hours, badges = [], []
+            for threshold in self.thresholds:
+                badge_id = ids_by_name.get(threshold["name"])
+                if badge_id:
+                    hours.append(threshold["hours"])
+                    badges.append((badge_id, threshold["name"]))
+
+            self._levels = (hours, badges)
+            self._loaded_at = time.monotonic()
+
+    def earned(self, total_hours, previous_hours=None):
+        """
+        Badges (id, name) whose threshold lies in (previous_hours, total_hours].
+        With no previous_hours, every threshold up to total_hours is returned.
+        """
+        self._ensure_loaded()
+        hours, badges = self._levels
+        upper = bisect_right(hours, total_hours)
+        lower = 0 if previous_hours is None else bisect_right(hours, previous_hours)
+        return badges[lower:upper]
+
+    def levels(self):
+        """(hours, badge id, name) of every seeded threshold, lowest first."""
+        self._ensure_loaded()
+        hours, badges = self._levels
+        return [(level, badge_id, name) for level, (badge_id, name) in zip(hours, badges)]
+
+
+badge_catalog = BadgeCatalog(BADGE_THRESHOLDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _reload_catalog_on_badge_change(session, flush_context):
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, Badge) for obj in changed):
+        badge_catalog.invalidate()
+
+
+def check_and_award_badges(user, previous_hours=None):
     """
     Check user's total volunteer hours and award badges accordingly.
     Badges are cumulative - user gets all badges they qualify for.
+
+    Pass previous_hours (the total before the current change) to only look at
+    the thresholds crossed by that change; when nothing was crossed no query
+    is issued. The caller is responsible for committing.
+    Returns the names of the newly awarded badges.
     """
-    # Convert total_volunteer_hours to float for comparison
     total_hours = float(user.total_volunteer_hours) if user.total_volunteer_hours else 0
-    
-    # Define badge thresholds
-    badge_thresholds = [
-        {"name": "Beginner", "hours": 10},
-        {"name": "Novice", "hours": 50},
-        {"name": "Changemaker", "hours": 75},
-        {"name": "Skillful Intern", "hours": 100},
-        {"name": "Expert Intern", "hours": 300},
-        {"name": "Elite Intern", "hours": 450},
-    ]
-    
-    # Check each badge threshold
-    for badge_info in badge_thresholds:
-        if total_hours >= badge_info["hours"]:
-            # Find the badge by name
-            badge = Badge.query.filter_by(name=badge_info["name"]).first()
-            
-            if not badge:
-                # Badge doesn't exist yet (should be created by seed script)
-                continue
-            
-            # Check if user already has this badge
-            existing_user_badge = UserBadge.query.filter_by(
-                user_id=user.id,
-                badge_id=badge.id
-            ).first()
-            
-            # If user doesn't have this badge, award it
-            if not existing_user_badge:
-                user_badge = UserBadge(
-                    user_id=user.id,
-                    badge_id=badge.id
-                )
-                db.session.add(user_badge)
-    
-    # Commit all new badges
-    db.session.commit()
 
+    candidates = badge_catalog.earned(total_hours, previous_hours)
+    if not candidates:
+        return []
+
+    # One query for the badges the user already holds out of the candidates
+    owned = set(
+        db.session.execute(
+            select(UserBadge.badge_id).where(
+                UserBadge.user_id == user.id,
+                UserBadge.badge_id.in_([badge_id for badge_id, _ in candidates])
+            )
+        ).scalars()
+    )
+
+    missing = [(badge_id, name) for badge_id, name in candidates if badge_id not in owned]
+    if missing:
+        db.session.execute(
+            insert(UserBadge),
+            [{"user_id": user.id, "badge_id": badge_id} for badge_id, _ in missing]
+        )
+
+    return [name for _, name in missing]
+
+
+def award_missing_badges(chunk_size=1000, log=None):
+    """
+    Award every badge a user's stored total qualifies for but they do not
+    hold. Awards made as hours change only look at the thresholds the change
+    crosses, so a badge seeded late or a threshold added later is caught up
+    here. One query per badge, inserts in chunks of `chunk_size`, one
+    transaction per badge. Returns the number of badges awarded.
+    """
+    awarded = 0
+    for hours, badge_id, name in badge_catalog.levels():
+        user_ids = db.session.execute(
+            select(User.id).where(
+                User.total_volunteer_hours >= hours,
+                ~exists().where(UserBadge.user_id == User.id, UserBadge.badge_id == badge_id)
+            )
+        ).scalars().all()
+        for start in range(0, len(user_ids), chunk_size):
+            db.session.execute(
+                insert(UserBadge),
+                [{"user_id": user_id, "badge_id": badge_id} for user_id in user_ids[start:start + chunk_size]]
+            )
+        db.session.commit()
+        awarded += len(user_ids)
+        if log:
+            log(f"{name}: awarded to {len(user_ids)} users.")
+    return awarded
@@ -0,0 +1,49 @@
+from sqlalchemy import update
+from app.config.database import db
+from app.models.events import Event
+from app.utils.response_cache import mark_dirty
+
+
+def add_pending(event_id, delta=1):
+    """Adjust the pending applications counter of an event."""
+    mark_dirty(f"event:{event_id}")
+    db.session.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(pending_count=Event.pending_count + delta)
+    )
+
+
+def reserve_seats(event_id, seats=1, pending=None):
+    """
+    Atomically take `seats` approved seats on an event, only if they are all
+    still free. `pending` is how many of them come out of the pending counter
+    (defaults to all of them).
+
+    The check and the increment are one conditional UPDATE, so concurrent
+    approvals cannot overbook max_participants. Returns True on success.
+    """
+    pending = seats if pending is None else pending
+    mark_dirty(f"event:{event_id}", "events:seats")
+    result = db.session.execute(
+        update(Event)
+        .where(
+            Event.id == event_id,
+            Event.approved_count + seats <= Event.max_participants
+        )
+        .values(
+            approved_count=Event.approved_count + seats,
+            pending_count=Event.pending_count - pending
+        )
+    )
+    return result.rowcount == 1
+
+
+def release_seats(event_id, seats=1):
+    """Give back approved seats, e.g. when an approved participation completes."""
+    mark_dirty(f"event:{event_id}", "events:seats")
+    db.session.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(approved_count=Event.approved_count - seats)
+    )
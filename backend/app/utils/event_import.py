@@ -0,0 +1,105 @@
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import insert
+from app.config.database import db
+from app.models.events import Event
+from app.utils.response_cache import mark_dirty
+
+EVENT_FIELDS = ("title", "description", "location", "start_time", "end_time", "max_participants")
+
+
+class InvalidEvent(ValueError):
+    pass
+
+
+def parse_event(data):
+    """
+    Validate one event's fields as submitted by an organization and return
+    the column values, or raise InvalidEvent with a message for the client.
+    """
+    if not isinstance(data, dict):
+        raise InvalidEvent("Each event must be an object.")
+
+    values = {field: data.get(field) for field in EVENT_FIELDS}
+    if not all(values.values()):
+        raise InvalidEvent("All fields are required.")
+
+    try:
+        values["start_time"] = datetime.fromisoformat(values["start_time"])
+        values["end_time"] = datetime.fromisoformat(values["end_time"])
+    except (TypeError, ValueError):
+        raise InvalidEvent("Invalid datetime format. Use ISO format (YYYY-MM-DDTHH:MM:SS).")
+
+    if values["end_time"] <= values["start_time"]:
+        raise InvalidEvent("End time must be after start time.")
+
+    try:
+        values["max_participants"] = int(values["max_participants"])
+    except (TypeError, ValueError):
+        raise InvalidEvent("max_participants must be a whole number.")
+    if values["max_participants"] < 1:
+        raise InvalidEvent("max_participants must be at least 1.")
+
+    # Checked here so one long title cannot fail a whole batch on a strict database
+    for field in ("title", "location"):
+        if not isinstance(values[field], str):
+            raise InvalidEvent(f"{field} must be text.")
+        limit = Event.__table__.c[field].type.length
+        if len(values[field]) > limit:
+            raise InvalidEvent(f"{field} must be at most {limit} characters.")
+
+    return values
+
+
+def csv_records(stream):
+    """
+    Dicts of a CSV upload (header row first), decoded as it is read. Raises
+    InvalidEvent when required columns are missing.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    missing = [field for field in EVENT_FIELDS if field not in (reader.fieldnames or ())]
+    if missing:
+        raise InvalidEvent(f"Missing CSV columns: {', '.join(missing)}.")
+    return reader
+
+
+def import_events(organization_id, records, chunk_size=500, max_rows=1000):
+    """
+    Validate `records` one by one and insert the valid ones for the
+    organization in executemany batches of `chunk_size`, in the caller's
+    transaction. Returns (created, errors) where errors are
+    {"row": <1-based record number>, "message": ...}; invalid rows do not
+    stop the valid ones. At most `max_rows` records are read.
+    """
+    created = 0
+    errors = []
+    batch = []
+
+    def flush_batch():
+        nonlocal created
+        if batch:
+            db.session.execute(insert(Event), batch)
+            created += len(batch)
+            batch.clear()
+
+    for row, record in enumerate(records, start=1):
+        if row > max_rows:
+            errors.append({"row": row, "message": f"Only {max_rows} events can be imported at once; the rest were skipped."})
+            break
+        try:
+            values = parse_event(record)
+        except InvalidEvent as e:
+            errors.append({"row": row, "message": str(e)})
+            continue
+
+        values["organization_id"] = organization_id
+        batch.append(values)
+        if len(batch) >= chunk_size:
+            flush_batch()
+    flush_batch()
+
+    if created:
+        # Core inserts bypass the unit of work the response cache listens to
+        mark_dirty("events:list", f"org:{organization_id}")
+    return created, errors
@@ -0,0 +1,201 @@
+import html
+import re
+from collections import namedtuple
+from sqlalchemy import DDL, and_, bindparam, case, event, func, or_, select, text
+from app.config.database import db
+from app.models.events import Event
+
+FTS_TABLE = "events_fts"
+TS_CONFIG = "english"
+
+# Relative weight of each matched column in the ranking
+TITLE_WEIGHT, LOCATION_WEIGHT, DESCRIPTION_WEIGHT = 10.0, 4.0, 1.0
+
+# Control characters the database wraps around matches; swapped for <mark>
+# only after the snippet has been HTML-escaped.
+_MARK_START, _MARK_END = "\x02", "\x03"
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# Words of context on each side of the first match in LIKE fallback snippets
+SNIPPET_WORDS = 8
+
+SearchHit = namedtuple("SearchHit", ["id", "score", "tiebreak", "snippet"])
+
+# SQLite: external-content FTS5 index over events, kept in sync by triggers.
+# It is keyed on the events rowid; run `flask search rebuild` after a VACUUM.
+# Recreating events (a batch_alter_table migration, a table copy) drops the
+# triggers, so the index silently goes stale: `flask search rebuild`
+# restores them too.
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, location, description,
+        content='events', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+        VALUES (new.rowid, new.title, new.location, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+        VALUES ('delete', old.rowid, old.title, old.location, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title, location, description ON events BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+        VALUES ('delete', old.rowid, old.title, old.location, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+        VALUES (new.rowid, new.title, new.location, new.description);
+    END""",
+]
+
+# PostgreSQL: weighted tsvector maintained by the database, with a GIN index
+POSTGRESQL_DDL = [
+    f"""ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(description, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING GIN (search_vector)",
+]
+
+for statement in SQLITE_DDL:
+    event.listen(Event.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRESQL_DDL:
+    event.listen(Event.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(
+    Event.__table__, "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+)
+
+
+def search_terms(q):
+    """Words of a free-text query, lower-cased; punctuation and operators are dropped."""
+    return [term.lower() for term in _TERM.findall(q or "")]
+
+
+def _sqlite_match(terms):
+    # Every word must match; the last one is treated as a prefix (search-as-you-type)
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " AND ".join(quoted)
+
+
+def render_snippet(raw):
+    """HTML-escape a snippet and turn the match markers into <mark> tags."""
+    escaped = html.escape(raw or "")
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def _like_snippet(description, terms):
+    # The words around the first match, the terms marked as the databases do
+    words = (description or "").split()
+    first = next((i for i, word in enumerate(words) if any(term in word.lower() for term in terms)), 0)
+    start = max(first - SNIPPET_WORDS, 0)
+    snippet = " ".join(words[start:first + SNIPPET_WORDS + 1])
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    snippet = pattern.sub(lambda match: f"{_MARK_START}{match.group(0)}{_MARK_END}", snippet)
+    return ("…" if start else "") + snippet + ("…" if first + SNIPPET_WORDS + 1 < len(words) else "")
+
+
+def _search_like(terms, limit, after=None):
+    """
+    search_events for databases without a full-text index: a scan with LIKE,
+    every term found in some column, scored by the weights of the columns
+    each term is found in.
+    """
+    columns = ((Event.title, TITLE_WEIGHT), (Event.location, LOCATION_WEIGHT), (Event.description, DESCRIPTION_WEIGHT))
+    found = [
+        [(func.lower(column).contains(term, autoescape=True), weight) for column, weight in columns]
+        for term in terms
+    ]
+    score = -sum(case((match, weight), else_=0.0) for term in found for match, weight in term)
+
+    query = select(Event.id, score.label("score"), Event.description).where(
+        *(or_(*(match for match, _ in term)) for term in found)
+    )
+    if after is not None:
+        last_score, last_id = after
+        query = query.where(or_(score > last_score, and_(score == last_score, Event.id > last_id)))
+
+    rows = db.session.execute(query.order_by(score, Event.id).limit(limit)).all()
+    return [SearchHit(row.id, row.score, row.id, _like_snippet(row.description, terms)) for row in rows]
+
+
+def search_events(terms, limit, after=None):
+    """
+    Ranked page of events matching every term, best match first, as rows of
+    (id, score, tiebreak, snippet); lower scores rank higher. `after` is the
+    (score, tiebreak) of the last row of the previous page. Snippets are only
+    built for the rows of the page. Databases other than SQLite and
+    PostgreSQL fall back to an unindexed LIKE scan.
+    """
+    dialect = db.engine.dialect.name
+    params = {"limit": limit}
+
+    if dialect == "sqlite":
+        # Rank and seek on the FTS table alone, ties broken by rowid; events
+        # is only joined for the rows of the page.
+        params["match"] = _sqlite_match(terms)
+        score = f"bm25({FTS_TABLE}, {TITLE_WEIGHT}, {LOCATION_WEIGHT}, {DESCRIPTION_WEIGHT})"
+        tiebreak, tiebreak_type = f"{FTS_TABLE}.rowid", None
+        sql = f"""
+            WITH page AS (
+                SELECT {tiebreak} AS tiebreak, {score} AS score
+                FROM {FTS_TABLE}
+                WHERE {FTS_TABLE} MATCH :match {{SEEK}}
+                ORDER BY score, tiebreak
+                LIMIT :limit
+            )
+            SELECT events.id AS id, page.score AS score, page.tiebreak AS tiebreak,
+                   snippet({FTS_TABLE}, -1, char(2), char(3), '…', 16) AS snippet
+            FROM {FTS_TABLE}
+            JOIN page ON page.tiebreak = {FTS_TABLE}.rowid
+            JOIN events ON events.rowid = page.tiebreak
+            WHERE {FTS_TABLE} MATCH :match
+            ORDER BY page.score, page.tiebreak
+        """
+    elif dialect == "postgresql":
+        params["query"] = " & ".join(f"{term}:*" for term in terms)
+        # ts_rank_cd weights are ordered {D, C, B, A}
+        weights = "{0.0, %s, %s, %s}" % (DESCRIPTION_WEIGHT / 10, LOCATION_WEIGHT / 10, TITLE_WEIGHT / 10)
+        score = f"-ts_rank_cd('{weights}', events.search_vector, to_tsquery('{TS_CONFIG}', :query))"
+        tiebreak, tiebreak_type = "events.id", Event.id.type
+        sql = f"""
+            WITH page AS (
+                SELECT events.id AS id, {score} AS score
+                FROM events
+                WHERE events.search_vector @@ to_tsquery('{TS_CONFIG}', :query) {{SEEK}}
+                ORDER BY score, id
+                LIMIT :limit
+            )
+            SELECT page.id AS id, page.score AS score, page.id AS tiebreak,
+                   ts_headline('{TS_CONFIG}', events.title || ' — ' || events.description,
+                               to_tsquery('{TS_CONFIG}', :query),
+                               'StartSel=' || chr(2) || ', StopSel=' || chr(3) || ', MaxWords=24, MinWords=8')
+                       AS snippet
+            FROM page JOIN events ON events.id = page.id
+            ORDER BY page.score, page.id
+        """
+    else:
+        return _search_like(terms, limit, after)
+
+    seek, bind_types = "", []
+    if after is not None:
+        seek = f"AND ({score} > :last_score OR ({score} = :last_score AND {tiebreak} > :last_tiebreak))"
+        params["last_score"], params["last_tiebreak"] = after
+        if tiebreak_type is not None:
+            bind_types.append(bindparam("last_tiebreak", type_=tiebreak_type))
+
+    statement = text(sql.replace("{SEEK}", seek)).bindparams(*bind_types).columns(Event.id)
+    return db.session.execute(statement, params).all()
+
+
+def rebuild_search_index():
+    """
+    Re-index every event; needed on SQLite after a VACUUM renumbers rowids
+    or events is recreated. Missing index objects are created first.
+    """
+    if db.engine.dialect.name == "sqlite":
+        for statement in SQLITE_DDL:
+            db.session.execute(text(statement))
+        db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        db.session.commit()
@@ -0,0 +1,160 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from app.config.database import db
+
+logger = logging.getLogger("app.group_commit")
+
+
+class WriterBusy(RuntimeError):
+    """Raised when too many mutations are already queued; callers answer 503."""
+
+
+class GroupCommitWriter:
+    """
+    Applies small write transactions in groups. A mutation is a function
+    that changes rows through db.session and returns the view's
+    (body, status) without committing.
+
+    When enabled, a single writer thread collects the mutations submitted
+    within `window_ms` (up to `max_batch`), runs them one after another in
+    one transaction and commits once; each request still gets its own
+    result, and a mutation sees the rows written by the ones before it. If
+    any mutation raises, the group is rolled back and each of its
+    mutations is retried in a transaction of its own. When disabled,
+    mutations run on the request thread and commit immediately.
+    """
+
+    def __init__(self, enabled=False, window_ms=5, max_batch=64, max_pending=1024, timeout=10):
+        self.enabled = enabled
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._app = None
+        self._queue = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("TIME_LOG_GROUP_COMMIT", self.enabled)
+        self.window_ms = app.config.get("TIME_LOG_GROUP_COMMIT_WINDOW_MS", self.window_ms)
+        self.max_batch = app.config.get("TIME_LOG_GROUP_COMMIT_MAX_BATCH", self.max_batch)
+        self.max_pending = app.config.get("TIME_LOG_GROUP_COMMIT_MAX_PENDING", self.max_pending)
+        self.shutdown()
+        self._app = app
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.batches = 0
+        self.mutations = 0
+        self.retried_batches = 0
+
+    def shutdown(self):
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join(timeout=self.timeout)
+            self._queue, self._thread = None, None
+
+    def run(self, mutation, *args):
+        """Apply `mutation(*args)` and return its (body, status) once it is committed."""
+        if not self.enabled:
+            result = mutation(*args)
+            db.session.commit()
+            return result
+
+        with self._lock:
+            if self._thread is None:
+                self._queue = queue.Queue(maxsize=self.max_pending)
+                self._thread = threading.Thread(
+                    target=self._work, args=(self._app, self._queue), name="group-commit", daemon=True
+                )
+                self._thread.start()
+            pending = self._queue
+
+        future = Future()
+        try:
+            pending.put_nowait((mutation, args, future))
+        except queue.Full:
+            raise WriterBusy("Too many writes queued.")
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            # Still queued: withdraw it so the 503 means nothing was written.
+            # Already running: it is about to commit, so wait for its answer
+            if future.cancel():
+                raise WriterBusy("Write timed out.")
+            return future.result()
+
+    def _collect(self, pending):
+        first = pending.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.window_ms / 1000
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                pending.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _work(self, app, pending):
+        while True:
+            batch = self._collect(pending)
+            if batch is None:
+                return
+            with app.app_context():
+                self._apply(batch)
+                db.session.remove()
+
+    def _apply(self, batch):
+        # Drop the mutations whose request gave up waiting
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            results = [mutation(*args) for mutation, args, _ in batch]
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("group of %d writes failed, retrying them one by one", len(batch))
+            self.retried_batches += 1
+            for mutation, args, future in batch:
+                try:
+                    result = mutation(*args)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            return
+
+        self.batches += 1
+        self.mutations += len(batch)
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "batches": self.batches,
+            "mutations": self.mutations,
+            "mean_batch": round(self.mutations / self.batches, 2) if self.batches else 0.0,
+            "retried_batches": self.retried_batches,
+        }
+
+
+time_log_writer = GroupCommitWriter()
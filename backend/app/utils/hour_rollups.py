@@ -0,0 +1,133 @@
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import delete, exists, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.config.database import db
+from app.models.events import Event
+from app.models.hour_rollups import EventHours, OrganizationMonthlyHours, UserDailyHours
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+
+_CENTS = Decimal("0.01")
+
+# (table, key columns, key of a session)
+_ROLLUPS = (
+    (UserDailyHours.__table__, ("user_id", "day"), lambda s: (s[0], s[3].date())),
+    (EventHours.__table__, ("event_id",), lambda s: (s[1],)),
+    (OrganizationMonthlyHours.__table__, ("organization_id", "month"), lambda s: (s[2], s[3].date().replace(day=1))),
+)
+
+
+def _hours(value):
+    return Decimal(str(value or 0)).quantize(_CENTS)
+
+
+def _aggregate(sessions):
+    """Per rollup table: {key: [hours, sessions]} for `sessions` given as
+    (user_id, event_id, organization_id, started_at, hours)."""
+    totals = [defaultdict(lambda: [Decimal("0"), 0]) for _ in _ROLLUPS]
+    for session in sessions:
+        hours = _hours(session[4])
+        for (_, _, key_of), rows in zip(_ROLLUPS, totals):
+            row = rows[key_of(session)]
+            row[0] += hours
+            row[1] += 1
+    return totals
+
+
+def _rows(key_columns, totals):
+    return [
+        {**dict(zip(key_columns, key)), "hours": hours, "sessions": sessions}
+        for key, (hours, sessions) in totals.items()
+    ]
+
+
+def _upsert(table, key_columns, rows):
+    dialect = db.session.get_bind().dialect
+    if dialect.name in ("sqlite", "postgresql"):
+        # One statement per rollup; rows were summed per key beforehand, which
+        # Postgres requires when they are sent as one multi-row INSERT
+        dialect_insert = sqlite.insert if dialect.name == "sqlite" else postgresql.insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={
+                "hours": table.c.hours + stmt.excluded.hours,
+                "sessions": table.c.sessions + stmt.excluded.sessions,
+            }
+        )
+        db.session.execute(stmt, rows)
+        return
+
+    for row in rows:
+        result = db.session.execute(
+            update(table)
+            .where(*(table.c[column] == row[column] for column in key_columns))
+            .values(hours=table.c.hours + row["hours"], sessions=table.c.sessions + row["sessions"])
+        )
+        if result.rowcount == 0:
+            db.session.execute(insert(table), [row])
+
+
+def record_sessions(sessions):
+    """
+    Add closed sessions, as (user_id, event_id, organization_id, started_at,
+    hours) tuples, to the rollups in the caller's transaction. A session
+    counts on the day (UTC) and in the month it started.
+    """
+    sessions = list(sessions)
+    if not sessions:
+        return
+    for (table, key_columns, _), totals in zip(_ROLLUPS, _aggregate(sessions)):
+        _upsert(table, key_columns, _rows(key_columns, totals))
+
+
+def _all_sessions(chunk_size):
+    # 1. Closed time log sessions
+    yield from db.session.execute(
+        select(TimeLog.user_id, TimeLog.event_id, Event.organization_id, TimeLog.check_in_time, TimeLog.hours_worked)
+        .join(Event, Event.id == TimeLog.event_id)
+        .where(TimeLog.check_out_time.is_not(None))
+        .execution_options(yield_per=chunk_size)
+    )
+
+    # 2. Participations completed without checking in, credited the event's duration
+    completed = db.session.execute(
+        select(Participation.user_id, Participation.event_id, Event.organization_id, Event.start_time, Event.end_time)
+        .join(Event, Event.id == Participation.event_id)
+        .where(
+            Participation.status == "completed",
+            ~exists().where(TimeLog.participation_id == Participation.id)
+        )
+        .execution_options(yield_per=chunk_size)
+    )
+    for user_id, event_id, organization_id, start_time, end_time in completed:
+        yield user_id, event_id, organization_id, start_time, (end_time - start_time).total_seconds() / 3600
+
+
+def rebuild_hour_rollups(chunk_size=1000, log=None):
+    """
+    Regenerate every rollup from time_logs (and logless completions) in one
+    transaction, streaming the sessions and inserting in executemany
+    batches of `chunk_size`. Returns the number of sessions aggregated.
+    """
+    sessions = 0
+
+    def counted(rows):
+        nonlocal sessions
+        for row in rows:
+            sessions += 1
+            yield row
+
+    totals = _aggregate(counted(_all_sessions(chunk_size)))
+
+    for (table, key_columns, _), rollup in zip(_ROLLUPS, totals):
+        db.session.execute(delete(table))
+        rows = _rows(key_columns, rollup)
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(insert(table), rows[start:start + chunk_size])
+        if log:
+            log(f"{table.name}: {len(rows)} rows.")
+    db.session.commit()
+    return sessions
+
@@ -0,0 +1,184 @@
+import time
+from sqlalchemy import Float, bindparam, case, cast, func, select, update
+from app.config.database import db
+from app.models.events import Event
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+from app.models.users import User
+from app.utils.hour_rollups import rebuild_hour_rollups
+from app.utils.identity_cache import identity_cache
+from app.utils.leaderboard import leaderboard
+from app.utils.response_cache import mark_dirty
+
+_participations = Participation.__table__
+_users = User.__table__
+
+
+def _guarded_update(table, column):
+    # Skips rows that changed since they were read (e.g. a check-out during the run)
+    return (
+        update(table)
+        .where(
+            table.c.id == bindparam("_id"),
+            func.abs(func.coalesce(table.c[column], 0) - bindparam("_stored", type_=Float)) < 0.0001
+        )
+        .values({column: bindparam("_hours", type_=table.c[column].type)})
+    )
+
+
+def _column_max_cents(column):
+    # Largest value a Numeric(p, s) column holds, in cents
+    return 10 ** column.type.precision - 1 if column.type.scale == 2 else None
+
+
+def _drift(stored, truth, np):
+    diff = truth - stored
+    drifted = np.flatnonzero(diff)
+    return drifted, {
+        "checked": int(stored.size),
+        "drifted": int(drifted.size),
+        "total_drift_hours": round(float(np.abs(diff).sum()) / 100, 2),
+        "max_drift_hours": round(float(np.abs(diff).max()) / 100, 2) if stored.size else 0.0,
+        "net_drift_hours": round(float(diff.sum()) / 100, 2),
+    }
+
+
+def reconcile_hours(chunk_size=50000, dry_run=False, log=None):
+    """
+    Recompute every participation's and volunteer's hours from time_logs and
+    correct the stored ones. A participation is worth the sum of its closed
+    sessions, or the event's duration when it was completed without any
+    session, open or closed; a volunteer is worth the sum of their
+    participations.
+
+    Logs are streamed `chunk_size` rows at a time and summed in NumPy arrays
+    of cents; corrections are applied with executemany UPDATEs in one
+    transaction, each guarded against rows that changed meanwhile, and the
+    hour rollups are then rebuilt. Badges are left as they are. Returns a
+    report with drift statistics and rows/sec; `updated` and
+    `skipped_changed_meanwhile` are None when the driver cannot count the
+    rows an executemany UPDATE matched.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("Hours reconciliation needs numpy (pip install numpy).")
+
+    started = time.perf_counter()
+
+    # 1. Stored values, read before the logs so a concurrent check-out is
+    # caught by the update guards rather than overwritten
+    participation_rows = db.session.execute(
+        select(
+            Participation.id, Participation.user_id, Participation.event_id, Participation.status,
+            cast(func.coalesce(Participation.volunteer_hours, 0), Float), Event.start_time, Event.end_time
+        )
+        .join(Event, Event.id == Participation.event_id)
+    ).all()
+    user_rows = db.session.execute(
+        select(User.id, cast(func.coalesce(User.total_volunteer_hours, 0), Float))
+        .where(User.role == "volunteer")
+    ).all()
+
+    participation_index = {row[0]: i for i, row in enumerate(participation_rows)}
+    user_index = {row[0]: j for j, row in enumerate(user_rows)}
+    participation_user = np.fromiter(
+        (user_index.get(row[1], -1) for row in participation_rows), dtype=np.int64, count=len(participation_rows)
+    )
+
+    def cents(values):
+        return np.rint(np.asarray(values, dtype=np.float64) * 100).astype(np.int64)
+
+    stored_participations = cents([row[4] for row in participation_rows])
+    stored_users = cents([row[1] for row in user_rows])
+
+    # 2. Stream the sessions and add up the closed ones per participation;
+    # an open one still counts as a check-in, as it does at completion
+    logged = np.zeros(len(participation_rows), dtype=np.int64)
+    has_logs = np.zeros(len(participation_rows), dtype=bool)
+    rows = 0
+    # On the session's connection, as plain Core rows: ORM result handling
+    # would cost more than everything else per row
+    closed_hours = case((TimeLog.check_out_time.is_not(None), func.coalesce(TimeLog.hours_worked, 0)), else_=0)
+    result = db.session.connection().execution_options(yield_per=chunk_size).execute(
+        select(TimeLog.participation_id, cast(closed_hours, Float))
+    )
+    for chunk in result.partitions():
+        index = np.fromiter((participation_index.get(row[0], -1) for row in chunk), dtype=np.int64, count=len(chunk))
+        known = index >= 0
+        logged += np.bincount(index[known], weights=cents([row[1] for row in chunk])[known],
+                              minlength=logged.size).astype(np.int64)
+        has_logs[index[known]] = True
+        rows += len(chunk)
+        if log:
+            log(f"{rows} time logs read.")
+
+    # 3. Truth: logged hours, or the event's duration for logless completions
+    completed = np.fromiter((row[3] == "completed" for row in participation_rows), dtype=bool,
+                            count=len(participation_rows))
+    duration = cents([(row[6] - row[5]).total_seconds() / 3600 for row in participation_rows])
+    truth_participations = np.where(has_logs, logged, np.where(completed, duration, 0))
+    counted = participation_user >= 0
+    truth_users = np.bincount(participation_user[counted], weights=truth_participations[counted],
+                              minlength=len(user_rows)).astype(np.int64)
+
+    # Numeric(5, 2) cannot hold more; report it rather than fail the run
+    overflow = 0
+    for truth, column in ((truth_participations, _participations.c.volunteer_hours),
+                          (truth_users, _users.c.total_volunteer_hours)):
+        limit = _column_max_cents(column)
+        if limit is not None:
+            overflow += int((truth > limit).sum())
+            np.minimum(truth, limit, out=truth)
+
+    drifted_participations, participation_report = _drift(stored_participations, truth_participations, np)
+    drifted_users, user_report = _drift(stored_users, truth_users, np)
+
+    # 4. Corrections
+    updated = skipped = 0
+    rollup_sessions = None
+    counted = db.session.get_bind().dialect.supports_sane_multi_rowcount
+    if not dry_run:
+        for statement, stored_rows, truth, drifted in (
+            (_guarded_update(_participations, "volunteer_hours"),
+             [(row[0], row[4]) for row in participation_rows], truth_participations, drifted_participations),
+            (_guarded_update(_users, "total_volunteer_hours"), user_rows, truth_users, drifted_users),
+        ):
+            for start in range(0, drifted.size, chunk_size):
+                batch = drifted[start:start + chunk_size]
+                applied = db.session.execute(statement, [
+                    {"_id": stored_rows[i][0], "_stored": stored_rows[i][1], "_hours": int(truth[i]) / 100}
+                    for i in batch
+                ]).rowcount
+                if counted:
+                    updated += applied
+                    skipped += len(batch) - applied
+        if not counted:
+            updated = skipped = None
+
+        mark_dirty(*{f"event:{participation_rows[i][2]}" for i in drifted_participations})
+        db.session.commit()
+        # Bulk updates bypass the hooks behind the cached users and the
+        # leaderboard; other processes catch up when their copies expire
+        identity_cache.invalidate(*(user_rows[j][0] for j in drifted_users))
+        if drifted_users.size:
+            leaderboard.invalidate()
+        # The rollups aggregate the same sessions and may carry the same drift
+        if drifted_participations.size or drifted_users.size:
+            rollup_sessions = rebuild_hour_rollups()
+    else:
+        db.session.rollback()
+
+    seconds = time.perf_counter() - started
+    return {
+        "time_logs": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds) if seconds else 0,
+        "participations": participation_report,
+        "users": user_report,
+        "overflowed": overflow,
+        "updated": updated,
+        "skipped_changed_meanwhile": skipped,
+        "rollups_rebuilt_from_sessions": rollup_sessions,
+        "dry_run": dry_run,
+    }
@@ -0,0 +1,40 @@
+import hashlib
+from datetime import timezone
+from flask import Response, request
+from werkzeug.http import http_date, is_resource_modified
+
+
+def _as_utc(value):
+    # Timestamps are stored as naive UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def validators(*parts, last_modified=None, private=False):
+    """
+    Response headers for a representation fully determined by `parts`
+    (typically max(updated_at) and a row count) and the request URL: a weak
+    ETag over both, Last-Modified when given, and Cache-Control telling
+    clients to revalidate before reusing their copy.
+    """
+    key = repr((request.path, sorted(request.args.items(multi=True)), parts))
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest()
+
+    headers = {
+        "ETag": f'W/"{digest}"',
+        "Cache-Control": "private, no-cache" if private else "public, no-cache",
+    }
+    if private:
+        headers["Vary"] = "Cookie"
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(_as_utc(last_modified))
+    return headers
+
+
+def not_modified(headers):
+    """
+    A bodiless 304 carrying `headers` when the request's If-None-Match (or,
+    without one, If-Modified-Since) still matches them; None otherwise.
+    """
+    if is_resource_modified(request.environ, etag=headers["ETag"], last_modified=headers.get("Last-Modified")):
+        return None
+    return Response(status=304, headers=headers)
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.config.database import db
+from app.models.users import User
+
+
+class IdentityCache:
+    """
+    Size-bounded, TTL-based LRU of User rows keyed by id, used by the JWT
+    user_lookup_loader so authenticated requests skip the primary-key query.
+
+    Entries are detached snapshots; load_user() merges them into the current
+    session without a SELECT, so handlers can still modify and commit them.
+    """
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        self.max_size = app.config.get("IDENTITY_CACHE_MAX_SIZE", self.max_size)
+        self.ttl = app.config.get("IDENTITY_CACHE_TTL", self.ttl)
+        self.clear()
+
+    def load_user(self, user_id):
+        """Return the session-bound User for user_id, hitting the database only on a miss."""
+        # Already in this session (e.g. loaded earlier in the request): reuse it
+        existing = db.session.identity_map.get(db.session.identity_key(User, user_id))
+        if existing is not None:
+            return existing
+
+        snapshot = self._get(user_id)
+        if snapshot is not None:
+            return db.session.merge(snapshot, load=False)
+
+        user = db.session.get(User, user_id)
+        if user is not None:
+            self._put(user)
+        return user
+
+    def _get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, user):
+        if self.max_size <= 0:
+            return
+
+        snapshot = User(**{
+            attr.key: getattr(user, attr.key)
+            for attr in User.__mapper__.column_attrs
+        })
+        make_transient_to_detached(snapshot)
+
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+identity_cache = IdentityCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_users(session, flush_context):
+    user_ids = {
+        obj.id for obj in session.dirty.union(session.deleted)
+        if isinstance(obj, User)
+    }
+    if user_ids:
+        # Drop now, and again after commit so a concurrent reader that
+        # re-cached the pre-commit row does not keep it until the TTL.
+        identity_cache.invalidate(*user_ids)
+        session.info.setdefault("identity_cache_invalidate", set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    user_ids = session.info.pop("identity_cache_invalidate", None)
+    if user_ids:
+        identity_cache.invalidate(*user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session):
+    session.info.pop("identity_cache_invalidate", None)
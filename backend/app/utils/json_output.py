@@ -0,0 +1,45 @@
+import json
+from decimal import Decimal
+from uuid import UUID
+from flask import current_app, make_response
+from flask_restful.utils import unpack
+from werkzeug.wrappers import Response as ResponseBase
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, the standard library is used without it
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data, debug=False):
+    """Serialize to JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if debug else 0)
+        return orjson.dumps(data, default=_default, option=option)
+    return json.dumps(data, default=_default, indent=4 if debug else None).encode("utf-8")
+
+
+def output_json(data, code, headers=None):
+    """Flask-RESTful representation for application/json, replacing the json.dumps based one."""
+    response = make_response(dumps(data, debug=current_app.debug) + b"\n", code)
+    response.headers.extend(headers or {})
+    response.mimetype = "application/json"
+    return response
+
+
+def render(result):
+    """The Response Flask-RESTful would build from a Resource method's return value."""
+    if isinstance(result, ResponseBase):
+        return result
+    data, code, headers = unpack(result)
+    return output_json(data, code, headers)
@@ -0,0 +1,211 @@
+import uuid
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import Column, MetaData, String, Table, bindparam, inspect, select, text, update
+from app.config.database import db
+from app.config.settings import Config
+from app.models.types import CompactUUID
+from app.utils.hour_rollups import rebuild_hour_rollups
+
+SHADOW_SUFFIX = "__v7"
+LEGACY_SUFFIX = "__legacy"
+
+
+class KeyMigrationError(RuntimeError):
+    pass
+
+
+def key_columns(table):
+    """Names of the uuid key columns of a model table: its primary key and foreign keys."""
+    return [
+        column.name for column in table.columns
+        if (column.primary_key or column.foreign_keys)
+        and isinstance(column.type, (String, CompactUUID))
+    ]
+
+
+def _text_key_tables(engine):
+    """Model tables that exist in the database and still store their keys as text."""
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    tables = []
+    for table in db.metadata.sorted_tables:
+        columns = key_columns(table)
+        if not columns or table.name not in existing:
+            continue
+        stored = {c["name"]: c["type"] for c in inspector.get_columns(table.name)}
+        if isinstance(stored[columns[0]], String):
+            tables.append((table, columns))
+    return tables
+
+
+def _pending_tables(engine):
+    """Text-keyed tables with an `id` key, whose rows are converted and copied."""
+    return [(table, columns) for table, columns in _text_key_tables(engine) if "id" in table.c]
+
+
+def _derived_tables(engine):
+    """
+    Text-keyed tables without an `id` (the hour rollups, keyed by what they
+    aggregate): nothing to backfill, the swap recreates them empty and
+    regenerates their rows from time_logs.
+    """
+    return [table for table, _ in _text_key_tables(engine) if "id" not in table.c]
+
+
+def _shadow_table(table, columns):
+    """Lightweight view of a legacy table: text keys plus their CompactUUID shadows."""
+    return Table(
+        table.name, MetaData(),
+        *[Column(name, String(100), primary_key=(name == "id")) for name in columns],
+        *[Column(name + SHADOW_SUFFIX, CompactUUID()) for name in columns]
+    )
+
+
+def backfill_shadow_keys(chunk_size=1000, log=print):
+    """
+    Online phase. Adds a CompactUUID shadow column next to every text key
+    column and fills it in chunks, committing after each one, so it can run
+    (and be re-run) while the application keeps serving traffic. Keys never
+    change, so a filled shadow never goes stale; re-running only picks up
+    rows inserted since the last run.
+    """
+    engine = db.engine
+    total = 0
+    for table, columns in _pending_tables(engine):
+        existing = {c["name"] for c in inspect(engine).get_columns(table.name)}
+        missing = [name for name in columns if name + SHADOW_SUFFIX not in existing]
+        if missing:
+            with engine.begin() as conn:
+                op = Operations(MigrationContext.configure(conn))
+                for name in missing:
+                    op.add_column(table.name, Column(name + SHADOW_SUFFIX, CompactUUID(), nullable=True))
+
+        shadow = _shadow_table(table, columns)
+        pending = (
+            select(*[shadow.c[name] for name in columns])
+            .where(shadow.c["id" + SHADOW_SUFFIX].is_(None))
+            .order_by(shadow.c.id)
+            .limit(chunk_size)
+        )
+        fill = (
+            update(shadow)
+            .where(shadow.c.id == bindparam("_pk"))
+            .values({name + SHADOW_SUFFIX: bindparam("_" + name) for name in columns})
+        )
+
+        copied = 0
+        while True:
+            with engine.begin() as conn:
+                rows = conn.execute(pending).all()
+                if not rows:
+                    break
+                params = []
+                for row in rows:
+                    values = row._asdict()
+                    for name, value in values.items():
+                        if value is not None:
+                            try:
+                                uuid.UUID(value)
+                            except ValueError:
+                                raise KeyMigrationError(
+                                    f"{table.name}.{name} = {value!r} (row {row.id}) is not a UUID."
+                                )
+                    params.append({"_pk": row.id, **{"_" + name: value for name, value in values.items()}})
+                conn.execute(fill, params)
+            copied += len(rows)
+        log(f"{table.name}: {copied} rows backfilled")
+        total += copied
+    return total
+
+
+def _begin(conn):
+    # pysqlite only opens transactions for DML; begin explicitly so the DDL
+    # of the swap is atomic on SQLite as well.
+    if conn.dialect.name == "sqlite":
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.exec_driver_sql("BEGIN")
+        return conn, lambda: conn.exec_driver_sql("COMMIT"), lambda: conn.exec_driver_sql("ROLLBACK")
+    transaction = conn.begin()
+    return conn, transaction.commit, transaction.rollback
+
+
+def swap_to_compact_keys(chunk_size=1000, log=print):
+    """
+    Offline phase, run in a short maintenance window with the app stopped and
+    KEY_STRATEGY=uuid7. After a final backfill, every table is rebuilt from
+    the model definitions with CompactUUID keys and its rows are copied over
+    with a single INSERT ... SELECT of the shadow columns, in one transaction.
+    Derived tables (the hour rollups) are recreated empty and rebuilt from
+    the converted time_logs afterwards.
+    """
+    if Config.KEY_STRATEGY != "uuid7":
+        raise KeyMigrationError("Run the swap with KEY_STRATEGY=uuid7 so the models describe the target layout.")
+
+    backfill_shadow_keys(chunk_size=chunk_size, log=log)
+
+    engine = db.engine
+    tables = _pending_tables(engine)
+    derived = _derived_tables(engine)
+    if not tables and not derived:
+        log("Nothing to swap, keys are already compact.")
+        return
+
+    with engine.connect() as conn:
+        conn, commit, rollback = _begin(conn)
+        quote = conn.dialect.identifier_preparer.quote
+        try:
+            # 1. Drop the derived tables (children of the others), then move
+            # the legacy tables aside and free their index names
+            for table in reversed(derived):
+                conn.execute(text(f"DROP TABLE {quote(table.name)}"))
+            for table, _ in reversed(tables):
+                legacy = table.name + LEGACY_SUFFIX
+                conn.execute(text(f"ALTER TABLE {quote(table.name)} RENAME TO {quote(legacy)}"))
+                if conn.dialect.name == "postgresql":
+                    names = conn.execute(
+                        text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :t"),
+                        {"t": legacy}
+                    ).scalars().all()
+                    for name in names:
+                        conn.execute(text(f"ALTER INDEX {quote(name)} RENAME TO {quote((name + LEGACY_SUFFIX)[:63])}"))
+                else:
+                    for index in table.indexes:
+                        conn.execute(text(f"DROP INDEX IF EXISTS {quote(index.name)}"))
+                    # Triggers follow the renamed table; drop them so create_all can recreate them
+                    triggers = conn.execute(
+                        text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :t"),
+                        {"t": legacy}
+                    ).scalars().all()
+                    for name in triggers:
+                        conn.execute(text(f"DROP TRIGGER {quote(name)}"))
+
+            # 2. Create the compact tables, with their constraints and indexes
+            db.metadata.create_all(conn, tables=[table for table, _ in tables] + derived)
+
+            # 3. Copy rows, parents first, reading keys from the shadow columns
+            for table, columns in tables:
+                legacy = table.name + LEGACY_SUFFIX
+                legacy_columns = {c["name"] for c in inspect(conn).get_columns(legacy)}
+                names = [c.name for c in table.columns if c.name in legacy_columns]
+                source = [
+                    quote(name + SHADOW_SUFFIX) if name in columns else quote(name)
+                    for name in names
+                ]
+                result = conn.execute(text(
+                    f"INSERT INTO {quote(table.name)} ({', '.join(quote(n) for n in names)}) "
+                    f"SELECT {', '.join(source)} FROM {quote(legacy)}"
+                ))
+                log(f"{table.name}: {result.rowcount} rows copied")
+
+            # 4. Drop the legacy tables, children first
+            for table, _ in reversed(tables):
+                conn.execute(text(f"DROP TABLE {quote(table.name + LEGACY_SUFFIX)}"))
+        except Exception:
+            rollback()
+            raise
+        commit()
+
+    if derived:
+        sessions = rebuild_hour_rollups(chunk_size=chunk_size)
+        log(f"{', '.join(table.name for table in derived)}: rebuilt from {sessions} sessions")
@@ -0,0 +1,226 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from decimal import Decimal
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.config.database import db
+from app.models.events import Event
+from app.models.organizations import Organization
+from app.models.participations import Participation
+from app.models.users import User
+
+# Participations that make a volunteer part of an organization's board
+MEMBER_STATUSES = ("approved", "completed")
+
+
+def _cents(hours):
+    return int((Decimal(str(hours or 0)) * 100).to_integral_value())
+
+
+class _Board:
+    """Volunteers sorted by hours (descending), then id: keys are (-cents, user_id)."""
+
+    def __init__(self, rows=()):
+        self.by_user = {user_id: (-_cents(hours), user_id) for user_id, hours in rows}
+        self.keys = sorted(self.by_user.values())
+        self.loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def set(self, user_id, hours):
+        old = self.by_user.get(user_id)
+        if old is not None:
+            del self.keys[bisect_left(self.keys, old)]
+        key = self.by_user[user_id] = (-_cents(hours), user_id)
+        insort(self.keys, key)
+
+    def remove(self, user_id):
+        old = self.by_user.pop(user_id, None)
+        if old is not None:
+            del self.keys[bisect_left(self.keys, old)]
+
+    def rank_of(self, key):
+        # Volunteers with the same hours share a rank
+        return bisect_left(self.keys, (key[0],)) + 1
+
+    def page(self, after, limit):
+        start = bisect_right(self.keys, after) if after else 0
+        return self.keys[start:start + limit], start + limit < len(self.keys)
+
+
+class Leaderboard:
+    """
+    Volunteers ranked by total_volunteer_hours, globally and per organization
+    (the volunteers with an approved or completed participation in its
+    events), kept in memory as sorted key lists so a rank is a binary search.
+
+    Boards are built from the database on first use and rebuilt after `ttl`
+    seconds, which also picks up writes made by other processes; commits in
+    this process update them in place. Only the `max_organizations` most
+    recently used organization boards are kept.
+    """
+
+    def __init__(self, ttl=300, max_organizations=256):
+        self.ttl = ttl
+        self.max_organizations = max_organizations
+        self._lock = threading.RLock()
+        self._global = None
+        self._organizations = OrderedDict()
+        self._names = {}
+
+    def init_app(self, app):
+        self.ttl = app.config.get("LEADERBOARD_TTL", self.ttl)
+        self.max_organizations = app.config.get("LEADERBOARD_MAX_ORGANIZATIONS", self.max_organizations)
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._global = None
+            self._organizations.clear()
+
+    def invalidate_organizations(self, *organization_ids):
+        """Drop the boards of these organizations (all of them with no ids)."""
+        with self._lock:
+            if not organization_ids:
+                self._organizations.clear()
+            for organization_id in organization_ids:
+                self._organizations.pop(organization_id, None)
+
+    def _fresh(self, board):
+        return board is not None and time.monotonic() - board.loaded_at < self.ttl
+
+    def _board(self, organization_id=None):
+        """The board to rank on, or None for an organization that does not exist."""
+        with self._lock:
+            board = self._organizations.get(organization_id) if organization_id else self._global
+            if self._fresh(board):
+                if organization_id:
+                    self._organizations.move_to_end(organization_id)
+                return board
+
+            if organization_id and db.session.get(Organization, organization_id) is None:
+                self._organizations.pop(organization_id, None)
+                return None
+
+            query = select(User.id, User.total_volunteer_hours, User.name).where(User.role == "volunteer")
+            if organization_id:
+                query = query.where(
+                    select(Participation.id)
+                    .join(Event, Event.id == Participation.event_id)
+                    .where(
+                        Participation.user_id == User.id,
+                        Participation.status.in_(MEMBER_STATUSES),
+                        Event.organization_id == organization_id
+                    )
+                    .exists()
+                )
+            rows = db.session.execute(query).all()
+            self._names.update((user_id, name) for user_id, _, name in rows)
+            board = _Board((user_id, hours) for user_id, hours, _ in rows)
+
+            if organization_id:
+                self._organizations[organization_id] = board
+                self._organizations.move_to_end(organization_id)
+                while len(self._organizations) > self.max_organizations:
+                    self._organizations.popitem(last=False)
+            else:
+                self._global = board
+            return board
+
+    def _entry(self, board, key):
+        return {
+            "rank": board.rank_of(key),
+            "user_id": key[1],
+            "name": self._names.get(key[1]),
+            "hours": -key[0] / 100,
+        }
+
+    def top(self, limit, organization_id=None, after=None):
+        """
+        (entries, key of the last entry when more follow, volunteers on the
+        board) for up to `limit` entries after the `after` key, or None for
+        an organization that does not exist.
+        """
+        with self._lock:
+            board = self._board(organization_id)
+            if board is None:
+                return None
+            keys, more = board.page(after, limit)
+            return [self._entry(board, key) for key in keys], (keys[-1] if more else None), len(board)
+
+    def rank(self, user_id, organization_id=None):
+        """
+        (entry, volunteers on the board), or (None, volunteers) when the user
+        is not on it; None for an organization that does not exist.
+        """
+        with self._lock:
+            board = self._board(organization_id)
+            if board is None:
+                return None
+            key = board.by_user.get(user_id)
+            return (self._entry(board, key) if key else None), len(board)
+
+    def update(self, changes):
+        """Apply {user_id: (total hours, name) or None for removed} after a commit."""
+        with self._lock:
+            boards = [board for board in (self._global, *self._organizations.values()) if board is not None]
+            for user_id, change in changes.items():
+                if change is None:
+                    for board in boards:
+                        board.remove(user_id)
+                    self._names.pop(user_id, None)
+                    continue
+                hours, name = change
+                if name is not None:
+                    self._names[user_id] = name
+                if self._global is not None:
+                    self._global.set(user_id, hours)
+                # Organization boards only follow their current members
+                for board in self._organizations.values():
+                    if user_id in board.by_user:
+                        board.set(user_id, hours)
+
+
+leaderboard = Leaderboard()
+
+
+def _membership_changed(participation):
+    history = db.inspect(participation).attrs.status.history
+    if not history.has_changes():
+        return False
+    before = any(status in MEMBER_STATUSES for status in history.deleted)
+    return before != (participation.status in MEMBER_STATUSES)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_leaderboard_changes(session, flush_context):
+    changes = session.info.setdefault("leaderboard_changes", {})
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, User) and obj.role == "volunteer":
+            changes[obj.id] = (obj.total_volunteer_hours, obj.name)
+        elif isinstance(obj, Participation) and _membership_changed(obj):
+            session.info["leaderboard_members_changed"] = True
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            changes[obj.id] = None
+        elif isinstance(obj, Participation):
+            session.info["leaderboard_members_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_leaderboard_changes(session):
+    changes = session.info.pop("leaderboard_changes", None)
+    if changes:
+        leaderboard.update(changes)
+    # Organization boards are rebuilt on next use when their members change
+    if session.info.pop("leaderboard_members_changed", None):
+        leaderboard.invalidate_organizations()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_leaderboard_changes(session):
+    session.info.pop("leaderboard_changes", None)
+    session.info.pop("leaderboard_members_changed", None)
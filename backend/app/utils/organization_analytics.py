@@ -0,0 +1,111 @@
+from datetime import datetime, timezone
+from sqlalchemy import and_, case, func, select
+from app.config.database import db
+from app.models.events import Event
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+
+# Statuses of volunteers who got (and kept) a seat
+SEATED_STATUSES = ("approved", "completed")
+
+
+def _count(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _rate(part, whole):
+    return round(part / whole, 4) if whole else None
+
+
+def organization_analytics(organization_id, starts_from=None, starts_to=None):
+    """
+    Fill rate, application funnel, no-shows and hours of an organization's
+    events starting in [starts_from, starts_to), per event and in total.
+    Always three GROUP BY/aggregate statements, however many events there are.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    criteria = [Event.organization_id == organization_id]
+    if starts_from:
+        criteria.append(Event.start_time >= starts_from)
+    if starts_to:
+        criteria.append(Event.start_time < starts_to)
+
+    # 1. The events themselves
+    events = db.session.execute(
+        select(Event.id, Event.title, Event.start_time, Event.end_time, Event.max_participants)
+        .where(*criteria)
+        .order_by(Event.start_time, Event.id)
+    ).all()
+
+    # 2. Applications per event and status; a seated volunteer of an event
+    # that has started without any time log is a no-show
+    checked_in = select(TimeLog.id).where(TimeLog.participation_id == Participation.id).exists()
+    funnels = {
+        row.event_id: row for row in db.session.execute(
+            select(
+                Participation.event_id,
+                func.count(Participation.id).label("applications"),
+                _count(Participation.status == "pending").label("pending"),
+                _count(Participation.status == "rejected").label("rejected"),
+                _count(Participation.status.in_(SEATED_STATUSES)).label("approved"),
+                _count(Participation.status == "completed").label("completed"),
+                _count(and_(
+                    Participation.status == "approved", Event.start_time <= now, ~checked_in
+                )).label("no_shows"),
+                _count(and_(Participation.status.in_(SEATED_STATUSES), Event.start_time <= now)).label("expected"),
+                func.coalesce(func.sum(Participation.volunteer_hours), 0).label("hours"),
+            )
+            .join(Event, Event.id == Participation.event_id)
+            .where(*criteria)
+            .group_by(Participation.event_id)
+        )
+    }
+
+    # 3. Check-in sessions per event
+    sessions = {
+        row.event_id: row for row in db.session.execute(
+            select(
+                TimeLog.event_id,
+                func.count(TimeLog.id).label("sessions"),
+                func.count(func.distinct(TimeLog.participation_id)).label("attendees"),
+            )
+            .join(Event, Event.id == TimeLog.event_id)
+            .where(*criteria)
+            .group_by(TimeLog.event_id)
+        )
+    }
+
+    keys = ("applications", "pending", "rejected", "approved", "completed", "no_shows", "expected")
+    totals = dict.fromkeys(keys + ("max_participants", "sessions", "attendees"), 0)
+    totals["hours"] = 0.0
+    per_event = []
+    for event in events:
+        funnel = funnels.get(event.id)
+        counts = {key: int(getattr(funnel, key)) if funnel else 0 for key in keys}
+        log = sessions.get(event.id)
+        entry = {
+            "event_id": event.id,
+            "title": event.title,
+            "start_time": event.start_time.isoformat(),
+            "end_time": event.end_time.isoformat(),
+            "max_participants": event.max_participants,
+            **counts,
+            "sessions": log.sessions if log else 0,
+            "attendees": log.attendees if log else 0,
+            "hours": float(funnel.hours) if funnel else 0.0,
+        }
+        for key in totals:
+            totals[key] += entry[key]
+        per_event.append(_with_rates(entry))
+
+    totals["hours"] = round(totals["hours"], 2)
+    totals["events"] = len(events)
+    return _with_rates(totals), per_event
+
+
+def _with_rates(counts):
+    counts["fill_rate"] = _rate(counts["approved"], counts["max_participants"])
+    counts["approval_rate"] = _rate(counts["approved"], counts["applications"])
+    counts["completion_rate"] = _rate(counts["completed"], counts["approved"])
+    counts["no_show_rate"] = _rate(counts["no_shows"], counts.pop("expected"))
+    return counts
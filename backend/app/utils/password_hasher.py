@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+
+DEFAULT_ROUNDS = 12
+
+
+class HasherBusy(RuntimeError):
+    """Raised when too many hashes are already queued; callers answer 503."""
+
+
+class PasswordHasher:
+    """
+    bcrypt behind a small, bounded thread pool. bcrypt releases the GIL, so
+    hashing runs on at most `workers` threads while request threads only
+    wait on the result; past `max_pending` queued hashes new requests are
+    turned away instead of piling up behind the CPU-bound ones.
+    With workers=0 hashing runs inline on the calling thread.
+    """
+
+    def __init__(self, rounds=DEFAULT_ROUNDS, workers=2, max_pending=32, timeout=10):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.rounds = app.config.get("BCRYPT_LOG_ROUNDS", self.rounds)
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", self.workers)
+        self.max_pending = app.config.get("PASSWORD_HASH_MAX_PENDING", self.max_pending)
+        self.timeout = app.config.get("PASSWORD_HASH_TIMEOUT", self.timeout)
+        self.shutdown()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor, self._slots = None, None
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+                self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+            executor, slots = self._executor, self._slots
+
+        if not slots.acquire(blocking=False):
+            raise HasherBusy("Too many password checks in progress.")
+        try:
+            future = executor.submit(fn, *args)
+        except RuntimeError:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HasherBusy("Password check timed out.")
+
+    def hash(self, password):
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return self._run(bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
+
+    def verify(self, password, hashed):
+        if not hashed:
+            return False
+        try:
+            return self._run(bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+        except ValueError:
+            # Malformed stored hash
+            return False
+
+    def needs_rehash(self, hashed):
+        """True when a stored hash was made with a different cost than the configured one."""
+        try:
+            # $2b$12$<salt+digest>
+            return int(hashed.split("$")[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return True
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,141 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config.database import db
+
+logger = logging.getLogger("app.sql")
+
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_IN_LIST = re.compile(r"\(\s*\?(\s*,\s*\?)+\s*\)")
+
+
+class LazyLoadInLoop(RuntimeError):
+    """Raised in strict mode when the same relationship lazy-loads repeatedly in one request."""
+
+
+def fingerprint(statement):
+    """
+    Reduce a SQL statement to its shape so that the same query issued with
+    different parameters (the signature of an N+1) groups together.
+    """
+    shape = _STRING.sub("?", statement)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestQueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.lazy_loads = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self):
+        return {fp: n for fp, n in self.fingerprints.most_common() if n > 1}
+
+
+def current_stats():
+    """Stats for the request being served, or None outside a profiled request."""
+    if not has_request_context():
+        return None
+    return g.get("_query_stats")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    stats = current_stats()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute: drop its start time
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None:
+        started = conn.info.get("query_start_time")
+        if started:
+            started.pop()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_lazy_loads(orm_execute_state):
+    if not orm_execute_state.is_relationship_load or orm_execute_state.lazy_loaded_from is None:
+        return
+
+    stats = current_stats()
+    if stats is None:
+        return
+
+    relationship = str(orm_execute_state.loader_strategy_path.prop)
+    stats.lazy_loads[relationship] += 1
+
+    if g.get("_strict_lazy_loads") and stats.lazy_loads[relationship] > 1:
+        raise LazyLoadInLoop(
+            f"{relationship} was lazy-loaded {stats.lazy_loads[relationship]} times "
+            f"while serving {request.method} {request.path}; eager-load it instead."
+        )
+
+
+def init_query_profiler(app):
+    """
+    Record statement count, DB time and repeated statement shapes for every
+    request, report them as Server-Timing / X-DB-Queries headers and log one
+    structured line per request.
+    """
+    if not app.config.get("SQL_PROFILING", False):
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+                event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+                event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+                event.listen(engine, "handle_error", _handle_error)
+
+    @app.before_request
+    def start_query_stats():
+        g._query_stats = RequestQueryStats()
+        g._strict_lazy_loads = app.config.get("SQL_STRICT_LAZY_LOADS", False)
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = current_stats()
+        if stats is None:
+            return response
+
+        db_ms = round(stats.duration * 1000, 2)
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers.add("Server-Timing", f'db;dur={db_ms};desc="{stats.count} queries"')
+
+        repeated = stats.repeated()
+        logger.log(
+            logging.WARNING if stats.lazy_loads and max(stats.lazy_loads.values()) > 1 else logging.INFO,
+            json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "endpoint": request.endpoint,
+                "status": response.status_code,
+                "db_queries": stats.count,
+                "db_time_ms": db_ms,
+                "repeated": [{"sql": fp, "count": n} for fp, n in repeated.items()],
+                "lazy_loads": dict(stats.lazy_loads),
+            })
+        )
+        return response
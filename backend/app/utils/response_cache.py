@@ -0,0 +1,355 @@
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+from flask import Response, g, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config.database import db
+from app.models.events import Event
+from app.models.organizations import Organization
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+from app.utils.http_cache import not_modified
+from app.utils.json_output import render
+
+# Headers replayed on a 304 for a cached entry
+VALIDATOR_HEADERS = ("ETag", "Last-Modified", "Cache-Control", "Vary")
+
+
+class LRUBackend:
+    """
+    In-process, size-bounded LRU; invalidation only reaches this process,
+    and so do its hit/miss counters.
+    """
+
+    name = "lru"
+    shared = False
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires, entry, tags)
+        self._tags = {}  # tag -> keys
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._counters = Counter()
+        self.evictions = 0
+
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return item[1]
+
+    def set(self, key, entry, tags, ttl, generation):
+        with self._lock:
+            # Something was invalidated while the entry was computed
+            if generation != self._generation:
+                return False
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, entry, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def _drop(self, key):
+        item = self._entries.pop(key, None)
+        if item is None:
+            return
+        for tag in item[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate(self, tags):
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+
+    def purge(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "tags": len(self._tags), "evictions": self.evictions}
+
+
+class RedisBackend:
+    """
+    Entries in a Redis-compatible server shared by every process. Each tag is
+    a set of entry keys; invalidating a tag deletes its entries. Counters
+    are a hash incremented by every process, so any of them (or the CLI)
+    reads the totals.
+    """
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, url, prefix="wepesi:response:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the redis package (pip install redis).")
+        self._redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._generation_key = f"{prefix}generation"
+        self._counters_key = f"{prefix}counters"
+
+    def _entry_key(self, key):
+        return f"{self.prefix}entry:{key}"
+
+    def _tag_key(self, tag):
+        return f"{self.prefix}tag:{tag}"
+
+    def generation(self):
+        return int(self._redis.get(self._generation_key) or 0)
+
+    def get(self, key):
+        raw = self._redis.get(self._entry_key(key))
+        if raw is None:
+            return None
+        meta, body = raw.split(b"\n", 1)
+        status, headers = json.loads(meta)
+        return body, status, headers
+
+    def set(self, key, entry, tags, ttl, generation):
+        if generation != self.generation():
+            return False
+        body, status, headers = entry
+        raw = json.dumps([status, headers]).encode("utf-8") + b"\n" + body
+        entry_key = self._entry_key(key)
+        pipe = self._redis.pipeline()
+        pipe.set(entry_key, raw, ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), entry_key)
+            pipe.expire(self._tag_key(tag), ttl)
+        pipe.execute()
+        return True
+
+    def invalidate(self, tags):
+        # Bump first, so an entry computed before this point is not stored after it
+        self._redis.incr(self._generation_key)
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        entry_keys = set()
+        for tag_key in tag_keys:
+            entry_keys.update(self._redis.smembers(tag_key))
+        self._redis.delete(*entry_keys, *tag_keys)
+
+    def purge(self):
+        self._redis.incr(self._generation_key)
+        kept = {self._generation_key.encode(), self._counters_key.encode()}
+        keys = [key for key in self._redis.scan_iter(match=f"{self.prefix}*") if key not in kept]
+        if keys:
+            self._redis.delete(*keys)
+
+    def count(self, name):
+        self._redis.hincrby(self._counters_key, name, 1)
+
+    def counters(self):
+        return {name.decode(): int(value) for name, value in self._redis.hgetall(self._counters_key).items()}
+
+    def stats(self):
+        entries = sum(1 for _ in self._redis.scan_iter(match=f"{self.prefix}entry:*"))
+        tags = sum(1 for _ in self._redis.scan_iter(match=f"{self.prefix}tag:*"))
+        return {"entries": entries, "tags": tags}
+
+
+class ResponseCache:
+    """
+    Cache of rendered public GET responses, keyed by path and query string.
+
+    Views decorated with @cached_response declare what their response
+    depends on with cache_tags() (e.g. "org:<id>", "events:list"). Commits
+    that write Event, Organization, Participation or TimeLog rows invalidate the
+    matching tags (see _model_tags); Core statements that bypass the unit
+    of work call mark_dirty() instead. Entries also expire after `ttl`.
+    """
+
+    def __init__(self, max_entries=2048, ttl=300):
+        self.ttl = ttl
+        self.backend = LRUBackend(max_entries)
+
+    def init_app(self, app):
+        self.ttl = app.config.get("RESPONSE_CACHE_TTL", self.ttl)
+        backend = app.config.get("RESPONSE_CACHE_BACKEND", "lru")
+        if backend == "lru":
+            self.backend = LRUBackend(app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 2048))
+        elif backend == "redis":
+            self.backend = RedisBackend(app.config["RESPONSE_CACHE_URL"])
+        elif backend in ("none", "", None):
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND {backend!r}.")
+
+    def count(self, name):
+        """Add one to a counter (hits, misses, stores, stale, invalidations) in the backend."""
+        if self.backend is not None:
+            self.backend.count(name)
+
+    def invalidate(self, *tags):
+        if self.backend is not None and tags:
+            self.count("invalidations")
+            self.backend.invalidate(tags)
+
+    def purge(self, *tags):
+        """Drop the entries of `tags`, or everything."""
+        if self.backend is None:
+            return
+        if tags:
+            self.backend.invalidate(tags)
+        else:
+            self.backend.purge()
+
+    def stats(self):
+        """
+        Configuration, counters and size. The counters cover every process
+        with a shared backend (redis), and only this one otherwise.
+        """
+        counters = self.backend.counters() if self.backend is not None else {}
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        stats = {
+            "backend": self.backend.name if self.backend is not None else "none",
+            "ttl": self.ttl,
+            "counters": "all processes" if getattr(self.backend, "shared", False) else "this process",
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "stores": counters.get("stores", 0),
+            "stale_skips": counters.get("stale", 0),
+            "invalidations": counters.get("invalidations", 0),
+        }
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+
+response_cache = ResponseCache()
+
+
+def cache_tags(*tags):
+    """Declare what the response being computed depends on (no-op outside @cached_response)."""
+    pending = g.get("_response_cache_tags")
+    if pending is not None:
+        pending.update(tags)
+
+
+def mark_dirty(*tags):
+    """Invalidate `tags` when the current session commits, for writes made with Core statements."""
+    db.session.info.setdefault("response_cache_tags", set()).update(tags)
+
+
+def _cache_key():
+    return repr((request.path, sorted(request.args.items(multi=True))))
+
+
+def cached_response(fn):
+    """
+    Serve a Resource GET from the response cache. Only 200 responses whose
+    view called cache_tags() are stored; a hit still answers If-None-Match.
+    """
+    @wraps(fn)
+    def decorator(*args, **kwargs):
+        backend = response_cache.backend
+        if backend is None:
+            return fn(*args, **kwargs)
+
+        key = _cache_key()
+        entry = backend.get(key)
+        if entry is not None:
+            response_cache.count("hits")
+            body, status, headers = entry
+            validators = {name: value for name, value in headers if name in VALIDATOR_HEADERS}
+            if "ETag" in validators:
+                unchanged = not_modified(validators)
+                if unchanged is not None:
+                    unchanged.headers["X-Cache"] = "HIT"
+                    return unchanged
+            response = Response(body, status=status, headers=headers)
+            response.headers["X-Cache"] = "HIT"
+            return response
+
+        response_cache.count("misses")
+        generation = backend.generation()
+        g._response_cache_tags = set()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            tags = g.pop("_response_cache_tags")
+
+        response = render(result)
+        response.headers["X-Cache"] = "MISS"
+        # Not bare 304s from the view's own validators, nor anything personal
+        if response.status_code == 200 and tags and "Set-Cookie" not in response.headers:
+            stored_headers = [
+                (name, value) for name, value in response.headers.items()
+                if name not in ("Content-Length", "X-Cache")
+            ]
+            entry = (response.get_data(), response.status_code, stored_headers)
+            if backend.set(key, entry, tags, response_cache.ttl, generation):
+                response_cache.count("stores")
+            else:
+                response_cache.count("stale")
+        return response
+    return decorator
+
+
+def _model_tags(obj):
+    if isinstance(obj, Event):
+        return ("events:list", f"event:{obj.id}", f"org:{obj.organization_id}")
+    if isinstance(obj, Organization):
+        return (f"org:{obj.id}",)
+    if isinstance(obj, Participation):
+        # Counters shown in the feed, and has_seats listings
+        return (f"event:{obj.event_id}", "events:seats")
+    if isinstance(obj, TimeLog):
+        # Attendance, only shown in organization analytics
+        return (f"event:{obj.event_id}:logs",)
+    return ()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_tags(session, flush_context):
+    tags = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tags.update(_model_tags(obj))
+    if tags:
+        session.info.setdefault("response_cache_tags", set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session):
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_tags(session):
+    session.info.pop("response_cache_tags", None)
@@ -0,0 +1,128 @@
+import logging
+import threading
+from functools import wraps
+from flask import Response, request
+from app.utils.json_output import render
+
+logger = logging.getLogger("app.single_flight")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the
+    leader) runs the function, callers arriving while it runs wait for it
+    and share its result or exception. Nothing is kept once the call ends,
+    so this only removes duplicate work that overlaps in time.
+
+    A waiter gives up after `timeout` seconds and runs the function itself.
+    """
+
+    def __init__(self, timeout=10, enabled=True):
+        self.timeout = timeout
+        self.enabled = enabled
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def init_app(self, app):
+        self.timeout = app.config.get("SINGLE_FLIGHT_TIMEOUT", self.timeout)
+        self.enabled = app.config.get("SINGLE_FLIGHT_ENABLED", self.enabled)
+        with self._lock:
+            self.leaders = self.coalesced = self.timeouts = 0
+
+    def do(self, key, fn):
+        """Return (result, shared): fn()'s result, and whether it came from another caller's run."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                with self._lock:
+                    self.timeouts += 1
+                return fn(), False
+            with self._lock:
+                self.coalesced += 1
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                logger.debug("single-flight %r served %d waiting requests", key, call.waiters)
+        return call.result, False
+
+    def stats(self):
+        with self._lock:
+            served = self.leaders + self.coalesced
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts,
+                "coalesced_ratio": round(self.coalesced / served, 4) if served else 0.0,
+            }
+
+
+single_flight = SingleFlight()
+
+
+def coalesce_requests(scope=None):
+    """
+    Decorator for idempotent Resource GETs whose response depends only on
+    the route, the query string and `scope()` (e.g. the caller's
+    organization). Identical requests in flight at the same time run the
+    view once. Put it below any authentication decorator, so every request
+    is still authenticated on its own.
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            if not single_flight.enabled:
+                return fn(*args, **kwargs)
+
+            key = (
+                request.path,
+                tuple(sorted(request.args.items(multi=True))),
+                # A revalidation may be answered with a bare 304
+                request.headers.get("If-None-Match"),
+                request.headers.get("If-Modified-Since"),
+                scope() if scope is not None else None,
+            )
+
+            def run():
+                # Rendered once; every caller gets its own Response built from it
+                response = render(fn(*args, **kwargs))
+                headers = [(name, value) for name, value in response.headers.items() if name != "Content-Length"]
+                return response.get_data(), response.status_code, headers
+
+            (body, status, headers), shared = single_flight.do(key, run)
+            response = Response(body, status=status, headers=headers)
+            response.headers["X-Single-Flight"] = "coalesced" if shared else "leader"
+            return response
+        return decorator
+    return wrapper
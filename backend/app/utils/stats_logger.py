@@ -0,0 +1,52 @@
+import json
+import logging
+import os
+import threading
+from app.utils.response_cache import response_cache
+from app.utils.single_flight import single_flight
+
+logger = logging.getLogger("app.stats")
+
+
+class StatsLogger:
+    """
+    Optional thread logging this process's cache and request coalescing
+    counters every `interval` seconds (0 disables it). In-process caches
+    (the lru response cache) and single-flight count in each app process,
+    where `flask cache stats` cannot see them.
+    """
+
+    def __init__(self, interval=0):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def init_app(self, app):
+        self.shutdown()
+        self.interval = app.config.get("STATS_LOG_INTERVAL", self.interval)
+        if not self.interval:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="stats-logger", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread = None
+
+    def snapshot(self):
+        return {"pid": os.getpid(), "response_cache": response_cache.stats(), "single_flight": single_flight.stats()}
+
+    def log(self):
+        logger.info("stats %s", json.dumps(self.snapshot()))
+
+    def _run(self, stop):
+        while not stop.wait(self.interval):
+            try:
+                self.log()
+            except Exception:
+                logger.exception("stats logging failed")
+
+
+stats_logger = StatsLogger()
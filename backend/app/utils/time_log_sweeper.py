@@ -0,0 +1,210 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import Numeric, bindparam, func, or_, select, update
+from app.config.database import db
+from app.models.events import Event
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+from app.models.users import User
+from app.utils.attendance import MAX_SESSION_HOURS
+from app.utils.badge_helper import badge_catalog, check_and_award_badges
+from app.utils.hour_rollups import record_sessions
+from app.utils.identity_cache import identity_cache
+from app.utils.leaderboard import leaderboard
+from app.utils.response_cache import mark_dirty
+
+logger = logging.getLogger("app.time_log_sweeper")
+
+_logs = TimeLog.__table__
+_participations = Participation.__table__
+_users = User.__table__
+
+# One statement each, executed for a whole chunk (executemany)
+_CLOSE_LOG = (
+    update(_logs)
+    .where(_logs.c.id == bindparam("_id"), _logs.c.check_out_time.is_(None))
+    .values(check_out_time=bindparam("_out"), hours_worked=bindparam("_hours", type_=Numeric(5, 2)))
+)
+_ADD_PARTICIPATION_HOURS = (
+    update(_participations)
+    .where(_participations.c.id == bindparam("_id"))
+    .values(volunteer_hours=func.coalesce(_participations.c.volunteer_hours, 0) + bindparam("_hours", type_=Numeric(5, 2)))
+)
+_ADD_USER_HOURS = (
+    update(_users)
+    .where(_users.c.id == bindparam("_id"))
+    .values(total_volunteer_hours=func.coalesce(_users.c.total_volunteer_hours, 0) + bindparam("_hours", type_=Numeric(5, 2)))
+)
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _closing(check_in_time, event_end, max_open):
+    """When a forgotten session is considered over, and the hours it is worth."""
+    closed_at = min(check_in_time + max_open, event_end) if event_end else check_in_time + max_open
+    closed_at = max(closed_at, check_in_time)
+    hours = min((closed_at - check_in_time).total_seconds() / 3600, MAX_SESSION_HOURS)
+    return closed_at, Decimal(str(hours)).quantize(Decimal("0.01"))
+
+
+def _close_logs(closes):
+    """Close the chunk's sessions still open; returns how many were."""
+    # Drivers that cannot count an executemany's rows get one statement per session
+    if db.session.get_bind().dialect.supports_sane_multi_rowcount:
+        return db.session.execute(_CLOSE_LOG, closes).rowcount
+    return sum(db.session.execute(_CLOSE_LOG, [close]).rowcount for close in closes)
+
+
+def sweep_stale_time_logs(now=None, max_open_hours=MAX_SESSION_HOURS, chunk_size=500, dry_run=False, log=None,
+                          max_retries=3):
+    """
+    Close time log sessions left open for more than `max_open_hours` or past
+    their event's end, as of `now` (naive UTC). Each session is closed at the
+    earlier of the two and its hours are added to the participation and
+    user totals and to the hour rollups, with one statement per table per
+    chunk of `chunk_size` logs, each chunk in its own transaction. A chunk
+    changed concurrently is retried up to `max_retries` times in a row,
+    after which the sweep stops and leaves the rest to its next run.
+    Returns (sessions closed, hours).
+    """
+    now = now or _utcnow()
+    max_open = timedelta(hours=max_open_hours)
+    closed_total, hours_total = 0, Decimal("0")
+    retries = 0
+
+    # The partial index on open sessions keeps this cheap however long time_logs grows
+    stale_query = (
+        select(
+            TimeLog.id, TimeLog.participation_id, TimeLog.user_id, TimeLog.event_id, TimeLog.check_in_time,
+            Event.organization_id, Event.end_time
+        )
+        .join(Event, Event.id == TimeLog.event_id)
+        .where(
+            TimeLog.check_out_time.is_(None),
+            or_(TimeLog.check_in_time <= now - max_open, Event.end_time <= now)
+        )
+        .order_by(TimeLog.check_in_time)
+    )
+
+    if dry_run:
+        for row in db.session.execute(stale_query.execution_options(yield_per=chunk_size)):
+            closed_total += 1
+            hours_total += _closing(row.check_in_time, row.end_time, max_open)[1]
+        db.session.rollback()
+        return closed_total, hours_total
+
+    while True:
+        # 1. Next chunk; rows a concurrent check-out holds are skipped where supported
+        stale = db.session.execute(
+            stale_query.limit(chunk_size).with_for_update(skip_locked=True, of=TimeLog)
+        ).all()
+        if not stale:
+            break
+
+        # 2. Closing time and hours per session, summed per participation and user
+        closes = []
+        sessions = []
+        by_participation = defaultdict(Decimal)
+        by_user = defaultdict(Decimal)
+        for row in stale:
+            closed_at, hours = _closing(row.check_in_time, row.end_time, max_open)
+            closes.append({"_id": row.id, "_out": closed_at, "_hours": hours})
+            sessions.append((row.user_id, row.event_id, row.organization_id, row.check_in_time, hours))
+            by_participation[row.participation_id] += hours
+            by_user[row.user_id] += hours
+
+        previous_totals = dict(db.session.execute(
+            select(User.id, User.total_volunteer_hours).where(User.id.in_(list(by_user)))
+        ).all())
+
+        # 3. Set-based writes; a session closed concurrently aborts the chunk
+        if _close_logs(closes) != len(closes):
+            db.session.rollback()
+            retries += 1
+            if retries > max_retries:
+                logger.warning("stale time log chunk kept changing concurrently, stopping after %d retries", max_retries)
+                break
+            logger.info("stale time log chunk changed concurrently, retrying")
+            continue
+        retries = 0
+        db.session.execute(_ADD_PARTICIPATION_HOURS, [{"_id": k, "_hours": v} for k, v in by_participation.items()])
+        db.session.execute(_ADD_USER_HOURS, [{"_id": k, "_hours": v} for k, v in by_user.items()])
+        record_sessions(sessions)
+        mark_dirty(*{tag for row in stale for tag in (f"event:{row.event_id}", f"event:{row.event_id}:logs")})
+
+        # 4. Badges for the thresholds crossed by the added hours
+        for user_id, added in by_user.items():
+            previous = float(previous_totals.get(user_id) or 0)
+            if badge_catalog.earned(previous + float(added), previous):
+                user = db.session.get(User, user_id, populate_existing=True)
+                check_and_award_badges(user, previous_hours=previous)
+
+        db.session.commit()
+        # Core updates bypass the flush hooks that keep the user cache and
+        # leaderboard fresh. Both live in this process only: app processes
+        # see the new totals once IDENTITY_CACHE_TTL / LEADERBOARD_TTL expire
+        # (hours are always added to the stored row, never a cached copy)
+        identity_cache.invalidate(*by_user)
+        leaderboard.update({
+            user_id: (Decimal(str(previous_totals.get(user_id) or 0)) + added, None)
+            for user_id, added in by_user.items()
+        })
+
+        chunk_hours = sum(by_user.values())
+        closed_total += len(closes)
+        hours_total += chunk_hours
+        if log:
+            log(f"Closed {len(closes)} sessions ({chunk_hours} h).")
+        if len(stale) < chunk_size:
+            break
+
+    return closed_total, hours_total
+
+
+class TimeLogSweeper:
+    """Optional in-process scheduler running the sweep every `interval` seconds (0 disables it)."""
+
+    def __init__(self, interval=0):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def init_app(self, app):
+        self.shutdown()
+        self.interval = app.config.get("TIME_LOG_SWEEP_INTERVAL", self.interval)
+        if not self.interval:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(app, self._stop), name="time-log-sweeper", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread = None
+
+    def _run(self, app, stop):
+        while not stop.wait(self.interval):
+            with app.app_context():
+                try:
+                    closed, hours = sweep_stale_time_logs(
+                        max_open_hours=app.config.get("TIME_LOG_MAX_OPEN_HOURS", MAX_SESSION_HOURS),
+                        chunk_size=app.config.get("TIME_LOG_SWEEP_CHUNK_SIZE", 500)
+                    )
+                    if closed:
+                        logger.info("closed %d stale time log sessions (%s h)", closed, hours)
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("stale time log sweep failed")
+                finally:
+                    db.session.remove()
+
+
+time_log_sweeper = TimeLogSweeper()
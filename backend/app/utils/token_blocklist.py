@@ -0,0 +1,208 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import Session
+from app.config.database import db
+from app.models.revoked_tokens import RevokedToken
+
+logger = logging.getLogger("app.token_blocklist")
+
+# Re-read rows revoked this long before the newest one already seen, so a
+# slow commit in another process is not skipped by the incremental sync.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings: no false negatives, `error_rate` false positives."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class TokenBlocklist:
+    """
+    In-process mirror of the revoked_tokens table, checked by the JWT
+    blocklist loader on every authenticated request.
+
+    A token that is not revoked (nearly every one) is rejected by the Bloom
+    filter without touching the exact map. The first check in a process
+    loads the mirror; after that, checks only read memory. A background
+    thread pulls rows revoked by other processes every `sync_interval`
+    seconds (0 disables it) and rebuilds the mirror from scratch every
+    `rebuild_interval` seconds, which drops expired tokens from the filter
+    and purges their rows.
+    """
+
+    def __init__(self, capacity=100_000, error_rate=0.001, sync_interval=5, rebuild_interval=600):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._app = None
+        self._stop = threading.Event()
+        self._started = False
+        self._reset()
+
+    def init_app(self, app):
+        self.shutdown()
+        self.capacity = app.config.get("REVOCATION_BLOOM_CAPACITY", self.capacity)
+        self.error_rate = app.config.get("REVOCATION_BLOOM_ERROR_RATE", self.error_rate)
+        self.sync_interval = app.config.get("REVOCATION_SYNC_INTERVAL", self.sync_interval)
+        self.rebuild_interval = app.config.get("REVOCATION_REBUILD_INTERVAL", self.rebuild_interval)
+        self._app = app
+        self._reset()
+
+    def shutdown(self):
+        self._stop.set()
+        self._started = False
+
+    def _reset(self):
+        self._bloom = BloomFilter(self.capacity, self.error_rate)
+        self._expires = {}  # jti -> expires_at
+        self._synced_until = None
+        self._synced_at = None
+        self._rebuilt_at = None
+
+    def is_revoked(self, jti):
+        if not self._started:
+            self._start()
+        if jti not in self._bloom:
+            return False
+        expires_at = self._expires.get(jti)
+        return expires_at is not None and expires_at > _utcnow()
+
+    def _remember(self, jti, expires_at):
+        self._bloom.add(jti)
+        self._expires[jti] = expires_at
+
+    def _start(self):
+        # First check in this process: load the mirror (the only I/O a check
+        # ever does) and leave keeping it current to the refresher thread
+        with self._lock:
+            if self._started:
+                return
+            if self._rebuilt_at is None:
+                self.rebuild()
+            if self.sync_interval and self._app is not None:
+                self._stop = threading.Event()
+                threading.Thread(
+                    target=self._run, args=(self._app, self._stop), name="token-blocklist", daemon=True
+                ).start()
+            self._started = True
+
+    def _run(self, app, stop):
+        while not stop.wait(self.sync_interval):
+            with app.app_context():
+                try:
+                    self.refresh()
+                except Exception:
+                    logger.exception("revoked token mirror refresh failed")
+
+    def refresh(self):
+        """Pull other processes' revocations, or rebuild and purge when a rebuild is due."""
+        with self._lock:
+            if self._rebuilt_at is None or time.monotonic() - self._rebuilt_at >= self.rebuild_interval:
+                self.purge_expired()
+                self.rebuild()
+            else:
+                self._sync()
+
+    def purge_expired(self):
+        """Delete the rows of tokens that have expired anyway."""
+        with db.engine.begin() as conn:
+            conn.execute(delete(RevokedToken).where(RevokedToken.expires_at <= _utcnow()))
+
+    def rebuild(self):
+        """Reload every unexpired revocation into a fresh filter."""
+        now = _utcnow()
+        with db.engine.connect() as conn:
+            rows = conn.execute(
+                select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at)
+                .where(RevokedToken.expires_at > now)
+            ).all()
+
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        expires = {}
+        for jti, expires_at, _ in rows:
+            bloom.add(jti)
+            expires[jti] = expires_at
+
+        # Swap in one step; readers see either the old or the new mirror
+        self._bloom, self._expires = bloom, expires
+        self._synced_until = max((row.revoked_at for row in rows), default=now)
+        self._synced_at = self._rebuilt_at = time.monotonic()
+
+    def _sync(self):
+        with db.engine.connect() as conn:
+            rows = conn.execute(
+                select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at)
+                .where(RevokedToken.revoked_at >= self._synced_until - SYNC_OVERLAP)
+            ).all()
+        for jti, expires_at, revoked_at in rows:
+            self._remember(jti, expires_at)
+            self._synced_until = max(self._synced_until, revoked_at)
+        self._synced_at = time.monotonic()
+
+    def is_token_revoked(self, jwt_data):
+        """Revoked by jti, or because its session family was revoked after a refresh token reuse."""
+        if self.is_revoked(jwt_data["jti"]):
+            return True
+        family = jwt_data.get("family")
+        return bool(family) and self.is_revoked(family_key(family))
+
+    def revoke(self, jti, token_type, expires_at, user_id=None):
+        """
+        Add a revocation to the session; it reaches this process's mirror
+        when the session commits. `expires_at` is the token's exp (a Unix
+        timestamp or a naive UTC datetime).
+        """
+        if not isinstance(expires_at, datetime):
+            expires_at = datetime.fromtimestamp(expires_at, timezone.utc).replace(tzinfo=None)
+        db.session.add(RevokedToken(jti=jti, token_type=token_type, user_id=user_id, expires_at=expires_at))
+        db.session.info.setdefault("revoked_tokens", []).append((jti, expires_at))
+
+    def stats(self):
+        return {"revoked": len(self._expires), "bloom_bits": self._bloom.size, "bloom_hashes": self._bloom.hashes}
+
+
+def family_key(family):
+    return f"family:{family}"
+
+
+token_blocklist = TokenBlocklist()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_revocations(session):
+    for jti, expires_at in session.info.pop("revoked_tokens", ()):
+        token_blocklist._remember(jti, expires_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_revocations(session):
+    session.info.pop("revoked_tokens", None)
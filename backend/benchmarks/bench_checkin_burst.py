@@ -0,0 +1,133 @@
+"""
+Check-in/check-out burst at the start of a large event: every volunteer
+checks in and then out at the same time, with each request committing on its
+own and with the group-commit writer. Reports writes per second, latency
+and failed requests.
+
+    python -m benchmarks.bench_checkin_burst --volunteers 400 --threads 32
+
+The target database is rebuilt from scratch, never point it at real data.
+"""
+import argparse
+import statistics
+import threading
+import time
+from datetime import datetime
+from app.app import create_app
+from app.config.settings import Config
+from app.config.database import db
+from app.models.events import Event
+from app.models.organizations import Organization
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+from app.models.users import User
+from app.utils.auth_helper import create_identity_token
+from app.utils.group_commit import time_log_writer
+
+
+def seed(args):
+    owner = User(name="owner", email="owner@bench.test", username="owner", password="x", role="organization")
+    db.session.add(owner)
+    db.session.flush()
+    org = Organization(owner_id=owner.id, name="Big event", description="d", contact_email="org@bench.test",
+                       address="Nairobi", phone="+254700000000")
+    db.session.add(org)
+    db.session.flush()
+    event = Event(organization_id=org.id, title="Marathon", description="d", location="Nairobi",
+                  start_time=datetime(2030, 1, 1, 7, 0), end_time=datetime(2030, 1, 1, 15, 0),
+                  max_participants=args.volunteers, approved_count=args.volunteers)
+    db.session.add(event)
+    db.session.flush()
+    pairs = []
+    for i in range(args.volunteers):
+        user = User(name=f"v{i}", email=f"v{i}@bench.test", username=f"v{i}", password="x")
+        db.session.add(user)
+        db.session.flush()
+        participation = Participation(user_id=user.id, event_id=event.id, status="approved")
+        db.session.add(participation)
+        db.session.flush()
+        pairs.append((create_identity_token(user), participation.id))
+    db.session.commit()
+    return pairs
+
+
+def run(app, args, pairs, group_commit):
+    with app.app_context():
+        db.session.query(TimeLog).delete()
+        db.session.commit()
+    app.config["TIME_LOG_GROUP_COMMIT"] = group_commit
+    time_log_writer.init_app(app)
+
+    latencies, failures = [], []
+    lock = threading.Lock()
+    work = iter(pairs)
+
+    def worker():
+        client = app.test_client()
+        while True:
+            with lock:
+                item = next(work, None)
+            if item is None:
+                return
+            token, participation_id = item
+            client.set_cookie("access_token", token)
+            for action in ("check-in", "check-out"):
+                started = time.perf_counter()
+                try:
+                    status = client.post(f"/api/participation/{participation_id}/{action}").status_code
+                except Exception:
+                    status = 500
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    if status >= 300:
+                        failures.append(status)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    stats = time_log_writer.stats()
+    time_log_writer.shutdown()
+
+    latencies.sort()
+    return {
+        "writes/s": len(latencies) / wall,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "failed": len(failures),
+        "mean batch": stats["mean_batch"] if group_commit else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="sqlite:////tmp/wepesi-checkin.db")
+    parser.add_argument("--volunteers", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--window-ms", type=int, default=Config.TIME_LOG_GROUP_COMMIT_WINDOW_MS)
+    args = parser.parse_args()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+        SQL_PROFILING = False
+        TIME_LOG_GROUP_COMMIT_WINDOW_MS = args.window_ms
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        pairs = seed(args)
+
+    print(f"{args.volunteers} volunteers checking in and out from {args.threads} threads")
+    print(f"{'mode':<14}{'writes/s':>9}{'p50':>10}{'p99':>10}{'failed':>8}{'mean batch':>12}")
+    for label, group_commit in (("per request", False), ("group commit", True)):
+        r = run(app, args, pairs, group_commit)
+        print(f"{label:<14}{r['writes/s']:>9.1f}{r['p50']:>8.1f}ms{r['p99']:>8.1f}ms{r['failed']:>8}{r['mean batch']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Seed a large dataset, then print the query plan and timings of the queries
+behind the hot routes, before and after the index migration (0a7c43f5e225).
+
+    python -m benchmarks.bench_indexes --database sqlite:////tmp/wepesi-bench.db
+
+The target database is rebuilt from scratch, never point it at real data.
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from flask_migrate import upgrade
+from sqlalchemy import MetaData, Table, text
+from app.app import create_app
+from app.config.settings import Config
+from app.config.database import db
+
+BEFORE_REVISION = "6f2a673e246d"
+INDEX_REVISION = "0a7c43f5e225"
+MIGRATIONS = "migrations"
+
+# (label, SQL issued by the route, parameter kind)
+ROUTE_QUERIES = [
+    (
+        "ApplyToEvent: existing application",
+        "SELECT id FROM participations WHERE user_id = :user_id AND event_id = :event_id LIMIT 1",
+        "participation",
+    ),
+    (
+        "EventApplications: applicants by status",
+        "SELECT id FROM participations WHERE event_id = :event_id AND status = 'approved'",
+        "event",
+    ),
+    (
+        "VolunteerCheckIn/Out: open session",
+        "SELECT id FROM time_logs WHERE participation_id = :participation_id AND check_out_time IS NULL LIMIT 1",
+        "participation",
+    ),
+    (
+        "OrganizationSpecificEvents: newest first",
+        "SELECT id FROM events WHERE organization_id = :organization_id ORDER BY created_at DESC",
+        "organization",
+    ),
+    (
+        "Owner's organization lookup",
+        "SELECT id FROM organizations WHERE owner_id = :owner_id LIMIT 1",
+        "organization",
+    ),
+    (
+        "Badge ownership check",
+        "SELECT badge_id FROM user_badges WHERE user_id = :user_id AND badge_id = :badge_id",
+        "user_badge",
+    ),
+]
+
+
+def new_id():
+    return str(uuid.uuid4())
+
+
+def chunked(rows, size=5000):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def seed(args):
+    """Bulk-insert a synthetic dataset through reflected tables and return sample keys."""
+    meta = MetaData()
+    tables = {
+        name: Table(name, meta, autoload_with=db.engine)
+        for name in ("users", "organizations", "events", "participations", "time_logs", "badges", "user_badges")
+    }
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rnd = random.Random(42)
+
+    users = [
+        {"id": new_id(), "name": f"user {i}", "email": f"u{i}@bench.test", "username": f"u{i}",
+         "password": "x", "role": "volunteer", "total_volunteer_hours": 0, "created_at": now, "updated_at": now}
+        for i in range(args.users)
+    ]
+    owners = users[:args.organizations]
+    organizations = [
+        {"id": new_id(), "owner_id": owner["id"], "name": f"org {i}", "description": "bench",
+         "contact_email": f"org{i}@bench.test", "address": "-", "phone": "-", "created_at": now, "updated_at": now}
+        for i, owner in enumerate(owners)
+    ]
+    events = []
+    for i in range(args.events):
+        start = now + timedelta(hours=rnd.randint(-5000, 5000))
+        events.append({
+            "id": new_id(), "organization_id": rnd.choice(organizations)["id"], "title": f"event {i}",
+            "description": "bench", "location": "-", "start_time": start, "end_time": start + timedelta(hours=3),
+            "max_participants": 50, "created_at": start - timedelta(days=30), "updated_at": now,
+        })
+
+    participations, time_logs = [], []
+    seen = set()
+    while len(participations) < args.participations:
+        user, event = rnd.choice(users), rnd.choice(events)
+        if (user["id"], event["id"]) in seen:
+            continue
+        seen.add((user["id"], event["id"]))
+        participation = {
+            "id": new_id(), "user_id": user["id"], "event_id": event["id"],
+            "status": rnd.choice(("pending", "approved", "completed")), "volunteer_hours": 0, "applied_at": now,
+        }
+        participations.append(participation)
+        for _ in range(args.logs_per_participation):
+            check_in = event["start_time"]
+            is_open = rnd.random() < 0.02
+            time_logs.append({
+                "id": new_id(), "participation_id": participation["id"], "user_id": user["id"],
+                "event_id": event["id"], "check_in_time": check_in,
+                "check_out_time": None if is_open else check_in + timedelta(hours=2),
+                "hours_worked": 0 if is_open else 2,
+            })
+
+    badges = [
+        {"id": new_id(), "name": f"badge {i}", "description": "-", "criteria": "-", "image_url": "-",
+         "created_at": now, "updated_at": now}
+        for i in range(6)
+    ]
+    user_badges = [
+        {"id": new_id(), "user_id": user["id"], "badge_id": badge["id"], "awarded_at": now}
+        for user in users[:args.users // 2]
+        for badge in badges[:rnd.randint(1, 3)]
+    ]
+
+    for name, rows in (("users", users), ("organizations", organizations), ("events", events),
+                       ("participations", participations), ("time_logs", time_logs),
+                       ("badges", badges), ("user_badges", user_badges)):
+        started = time.perf_counter()
+        for chunk in chunked(rows):
+            db.session.execute(tables[name].insert(), chunk)
+        db.session.commit()
+        print(f"  seeded {len(rows):>8} {name:<15} in {time.perf_counter() - started:.2f}s")
+
+    return {
+        "participation": [{"user_id": p["user_id"], "event_id": p["event_id"], "participation_id": p["id"]}
+                          for p in rnd.sample(participations, 200)],
+        "event": [{"event_id": e["id"]} for e in rnd.sample(events, 200)],
+        "organization": [{"organization_id": o["id"], "owner_id": o["owner_id"]}
+                         for o in rnd.sample(organizations, min(200, len(organizations)))],
+        "user_badge": [{"user_id": ub["user_id"], "badge_id": ub["badge_id"]}
+                       for ub in rnd.sample(user_badges, 200)],
+    }
+
+
+def explain(sql, params):
+    if db.engine.dialect.name == "sqlite":
+        rows = db.session.execute(text("EXPLAIN QUERY PLAN " + sql), params).all()
+        return "; ".join(row[-1] for row in rows)
+    rows = db.session.execute(text("EXPLAIN " + sql), params).all()
+    return " | ".join(row[0].strip() for row in rows)
+
+
+def measure(samples, repeat):
+    results = {}
+    for label, sql, kind in ROUTE_QUERIES:
+        statement = text(sql)
+        timings = []
+        for i in range(repeat):
+            params = samples[kind][i % len(samples[kind])]
+            started = time.perf_counter()
+            db.session.execute(statement, params).all()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[label] = (statistics.median(timings), explain(sql, samples[kind][0]))
+    db.session.rollback()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="sqlite:////tmp/wepesi-bench.db")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--organizations", type=int, default=500)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--participations", type=int, default=200000)
+    parser.add_argument("--logs-per-participation", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+        SQL_PROFILING = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.session.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        db.session.commit()
+        upgrade(directory=MIGRATIONS, revision=BEFORE_REVISION)
+
+        print("Seeding...")
+        samples = seed(args)
+
+        print("Measuring without indexes...")
+        before = measure(samples, args.repeat)
+
+        started = time.perf_counter()
+        upgrade(directory=MIGRATIONS, revision=INDEX_REVISION)
+        print(f"Index migration took {time.perf_counter() - started:.2f}s")
+
+        print("Measuring with indexes...")
+        after = measure(samples, args.repeat)
+
+        for label, _, _ in ROUTE_QUERIES:
+            before_ms, before_plan = before[label]
+            after_ms, after_plan = after[label]
+            print(f"\n{label}")
+            print(f"  before: {before_ms:8.3f} ms  {before_plan}")
+            print(f"  after:  {after_ms:8.3f} ms  {after_plan}")
+            print(f"  speed-up: x{before_ms / after_ms if after_ms else float('inf'):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare the legacy text keys (uuid4 in VARCHAR(100)) with compact,
+time-ordered keys (uuid7 in CompactUUID): insert throughput, primary key
+lookup latency and on-disk size of a participations-shaped table.
+
+    python -m benchmarks.bench_keys --directory /tmp/wepesi-keys
+
+One SQLite file is written per layout in --directory.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+import uuid
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+from app.models.types import CompactUUID, uuid7
+
+LAYOUTS = {
+    "text uuid4": (lambda: String(100), lambda: str(uuid.uuid4())),
+    "compact uuid7": (CompactUUID, lambda: str(uuid7())),
+}
+
+
+def build(path, key_type):
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    table = Table(
+        "participations", MetaData(),
+        Column("id", key_type(), primary_key=True),
+        Column("user_id", key_type(), nullable=False, index=True),
+        Column("event_id", key_type(), nullable=False, index=True),
+        Column("volunteer_hours", Integer, default=0),
+    )
+    table.metadata.create_all(engine)
+    return engine, table
+
+
+def run(layout, args):
+    key_type, new_key = LAYOUTS[layout]
+    path = os.path.join(args.directory, layout.replace(" ", "_") + ".db")
+    engine, table = build(path, key_type)
+
+    users = [new_key() for _ in range(args.rows // 20)]
+    events = [new_key() for _ in range(args.rows // 50)]
+    ids = []
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for _ in range(0, args.rows, args.batch):
+            rows = [
+                {"id": new_key(), "user_id": random.choice(users), "event_id": random.choice(events)}
+                for _ in range(args.batch)
+            ]
+            ids.extend(row["id"] for row in rows)
+            conn.execute(table.insert(), rows)
+    insert_seconds = time.perf_counter() - started
+
+    timings = []
+    with engine.connect() as conn:
+        for key in random.sample(ids, args.lookups):
+            statement = select(table.c.event_id).where(table.c.id == key)
+            began = time.perf_counter()
+            conn.execute(statement).one()
+            timings.append((time.perf_counter() - began) * 1_000_000)
+    engine.dispose()
+
+    return {
+        "rows/s": args.rows / insert_seconds,
+        "lookup us": statistics.median(timings),
+        "size MB": os.path.getsize(path) / 1_048_576,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--directory", default="/tmp/wepesi-keys")
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+    os.makedirs(args.directory, exist_ok=True)
+
+    random.seed(42)
+    results = {layout: run(layout, args) for layout in LAYOUTS}
+    print(f"{'layout':<16}{'rows/s':>12}{'lookup us':>12}{'size MB':>10}")
+    for layout, result in results.items():
+        print(f"{layout:<16}{result['rows/s']:>12.0f}{result['lookup us']:>12.1f}{result['size MB']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
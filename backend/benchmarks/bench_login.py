@@ -0,0 +1,115 @@
+"""
+Login latency (p50/p99) under concurrent load, with bcrypt run inline on the
+request threads and through the bounded hashing pool, together with the
+latency of a cheap request (GET /api/event) served during the same burst.
+
+    python -m benchmarks.bench_login --threads 32 --logins 256 --rounds 12
+
+The target database is rebuilt from scratch, never point it at real data.
+"""
+import argparse
+import statistics
+import threading
+import time
+from app.app import create_app
+from app.config.settings import Config
+from app.config.database import db
+from app.models.users import User
+from app.utils.password_hasher import password_hasher
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(app, args, workers):
+    password_hasher.workers = workers
+    password_hasher.shutdown()
+    logins, cheap, statuses = [], [], []
+    lock = threading.Lock()
+    next_login = iter(range(args.logins))
+    done = threading.Event()
+
+    def login_worker():
+        client = app.test_client()
+        while True:
+            with lock:
+                n = next(next_login, None)
+            if n is None:
+                return
+            started = time.perf_counter()
+            response = client.post("/api/auth/login", json={"username": f"u{n % args.users}", "password": "secret123"})
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                logins.append(elapsed)
+                statuses.append(response.status_code)
+
+    def cheap_worker():
+        client = app.test_client()
+        while not done.is_set():
+            started = time.perf_counter()
+            client.get("/api/event", query_string={"limit": 1})
+            cheap.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=login_worker) for _ in range(args.threads)]
+    probe = threading.Thread(target=cheap_worker)
+    probe.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    probe.join()
+    wall = time.perf_counter() - started
+
+    return {
+        "logins/s": len(logins) / wall,
+        "login p50": statistics.median(logins),
+        "login p99": percentile(logins, 99),
+        "cheap p50": statistics.median(cheap),
+        "cheap p99": percentile(cheap, 99),
+        "503s": statuses.count(503),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="sqlite:////tmp/wepesi-login.db")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=256)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=Config.PASSWORD_HASH_WORKERS)
+    args = parser.parse_args()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+        SQL_PROFILING = False
+        BCRYPT_LOG_ROUNDS = args.rounds
+        PASSWORD_HASH_MAX_PENDING = args.threads
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        hashed = password_hasher.hash("secret123")
+        db.session.add_all(
+            User(name=f"u{i}", email=f"u{i}@bench.test", username=f"u{i}", password=hashed)
+            for i in range(args.users)
+        )
+        db.session.commit()
+
+    print(f"{args.threads} concurrent clients, {args.logins} logins, bcrypt cost {args.rounds}")
+    print(f"{'mode':<14}{'logins/s':>9}{'login p50':>11}{'login p99':>11}{'cheap p50':>11}{'cheap p99':>11}{'503s':>6}")
+    for label, workers in (("inline", 0), (f"pool ({args.workers})", args.workers)):
+        r = run(app, args, workers)
+        print(f"{label:<14}{r['logins/s']:>9.1f}{r['login p50']:>9.0f}ms{r['login p99']:>9.0f}ms"
+              f"{r['cheap p50']:>9.1f}ms{r['cheap p99']:>9.1f}ms{r['503s']:>6}")
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
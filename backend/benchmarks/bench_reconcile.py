@@ -0,0 +1,123 @@
+"""
+Hours reconciliation over a large time_logs table: rows/sec of the NumPy
+job (flask hours reconcile) against summing the same streamed rows in a
+Python loop of Decimals, and the time to apply the corrections.
+
+    python -m benchmarks.bench_reconcile --logs 1000000 --volunteers 20000
+
+The target database is rebuilt from scratch, never point it at real data.
+"""
+import argparse
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import insert, select
+from app.app import create_app
+from app.config.settings import Config
+from app.config.database import db
+from app.models.base import new_key
+from app.models.events import Event
+from app.models.organizations import Organization
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+from app.models.users import User
+from app.utils.hours_reconciliation import reconcile_hours
+
+
+def seed(args):
+    rng = random.Random(7)
+    owner = User(name="owner", email="owner@bench.test", username="owner", password="x", role="organization")
+    db.session.add(owner)
+    db.session.flush()
+    org = Organization(owner_id=owner.id, name="Org", description="d", contact_email="org@bench.test",
+                       address="Nairobi", phone="+254700000000")
+    db.session.add(org)
+    db.session.flush()
+    event = Event(organization_id=org.id, title="Season", description="d", location="Nairobi",
+                  start_time=datetime(2030, 1, 1), end_time=datetime(2030, 12, 31), max_participants=args.volunteers)
+    db.session.add(event)
+    db.session.flush()
+
+    users, participations = [], []
+    for i in range(args.volunteers):
+        user_id, participation_id = new_key(), new_key()
+        users.append({"id": user_id, "name": f"v{i}", "email": f"v{i}@bench.test", "username": f"v{i}",
+                      "password": "x", "role": "volunteer"})
+        participations.append({"id": participation_id, "user_id": user_id, "event_id": event.id, "status": "approved"})
+    db.session.execute(insert(User), users)
+    db.session.execute(insert(Participation), participations)
+
+    totals = defaultdict(Decimal)
+    check_in = datetime(2030, 1, 1, 9)
+    for start in range(0, args.logs, 50000):
+        batch = []
+        for _ in range(start, min(start + 50000, args.logs)):
+            i = rng.randrange(args.volunteers)
+            hours = Decimal(rng.randrange(1, 800)) / 100
+            totals[i] += hours
+            batch.append({"id": new_key(), "participation_id": participations[i]["id"], "user_id": users[i]["id"],
+                          "event_id": event.id, "check_in_time": check_in, "check_out_time": check_in,
+                          "hours_worked": hours})
+        db.session.execute(insert(TimeLog), batch)
+
+    # Stored totals, a tenth of them off by up to an hour
+    for column, rows, table in (("volunteer_hours", participations, Participation.__table__),
+                                ("total_volunteer_hours", users, User.__table__)):
+        db.session.execute(
+            table.update().where(table.c.id == db.bindparam("_id")).values({column: db.bindparam("_hours")}),
+            [{"_id": row["id"],
+              "_hours": min(totals[i] + (Decimal(rng.randrange(-100, 100)) / 100 if rng.random() < 0.1 else 0),
+                            Decimal("999.99"))}
+             for i, row in enumerate(rows)]
+        )
+    db.session.commit()
+
+
+def python_loop(chunk_size):
+    started = time.perf_counter()
+    totals = defaultdict(Decimal)
+    rows = 0
+    result = db.session.execute(
+        select(TimeLog.participation_id, TimeLog.hours_worked)
+        .where(TimeLog.check_out_time.is_not(None))
+        .execution_options(yield_per=chunk_size)
+    )
+    for participation_id, hours in result:
+        totals[participation_id] += hours or 0
+        rows += 1
+    db.session.rollback()
+    return rows / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="sqlite:////tmp/wepesi-reconcile.db")
+    parser.add_argument("--logs", type=int, default=1000000)
+    parser.add_argument("--volunteers", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+        SQL_PROFILING = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed(args)
+
+        print(f"{args.logs} time logs, {args.volunteers} volunteers")
+        print(f"python loop (sum only)    {python_loop(args.chunk_size):>10.0f} rows/s")
+        report = reconcile_hours(chunk_size=args.chunk_size, dry_run=True)
+        print(f"numpy, dry run            {report['rows_per_sec']:>10} rows/s")
+        report = reconcile_hours(chunk_size=args.chunk_size)
+        print(f"numpy, with corrections   {report['rows_per_sec']:>10} rows/s  "
+              f"({report['updated']} rows updated, {report['seconds']} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+CPU cost of renewing an expired access token by logging in again (bcrypt)
+versus calling /api/auth/refresh, and what that means for a working day in
+which each volunteer's 2-hour access token expires several times.
+
+    python -m benchmarks.bench_refresh --rounds 12 --renewals 200 --threads 8
+
+The target database is rebuilt from scratch, never point it at real data.
+"""
+import argparse
+import threading
+import time
+from app.app import create_app
+from app.config.settings import Config
+from app.config.database import db
+from app.models.users import User
+from app.utils.password_hasher import password_hasher
+
+
+def burst(app, threads, renewals, renew):
+    """Run `renewals` calls of renew(client, username) over `threads` clients; CPU and wall seconds."""
+    per_thread = renewals // threads
+    clients = []
+    for i in range(threads):
+        client = app.test_client()
+        response = client.post("/api/auth/login", json={"username": f"u{i}", "password": "secret123"})
+        assert response.status_code == 200
+        clients.append((client, f"u{i}"))
+
+    failures = []
+
+    def worker(client, username):
+        for _ in range(per_thread):
+            if renew(client, username).status_code != 200:
+                failures.append(1)
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    workers = [threading.Thread(target=worker, args=pair) for pair in clients]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    assert not failures, f"{len(failures)} failed renewals"
+    return time.process_time() - cpu, time.perf_counter() - wall, per_thread * threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="sqlite:////tmp/wepesi-refresh.db")
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--renewals", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--hours", type=int, default=8, help="length of a working session")
+    args = parser.parse_args()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+        SQL_PROFILING = False
+        BCRYPT_LOG_ROUNDS = args.rounds
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        hashed = password_hasher.hash("secret123")
+        db.session.add_all(
+            User(name=f"u{i}", email=f"u{i}@bench.test", username=f"u{i}", password=hashed)
+            for i in range(args.threads)
+        )
+        db.session.commit()
+
+    def login(client, username):
+        return client.post("/api/auth/login", json={"username": username, "password": "secret123"})
+
+    def refresh(client, username):
+        return client.post("/api/auth/refresh")
+
+    results = {}
+    for label, renew in (("login", login), ("refresh", refresh)):
+        cpu, wall, count = burst(app, args.threads, args.renewals, renew)
+        results[label] = cpu / count
+        print(f"{label:<8} {count} renewals: {cpu / count * 1000:8.2f} ms CPU each, "
+              f"{count / wall:8.1f}/s with {args.threads} clients")
+
+    renewals_per_day = max(1, args.hours // 2)
+    login_only = renewals_per_day * results["login"]
+    with_refresh = results["login"] + (renewals_per_day - 1) * results["refresh"]
+    print(f"\n{args.hours}h session ({renewals_per_day} access tokens): "
+          f"{login_only * 1000:.1f} ms CPU re-logging in vs {with_refresh * 1000:.1f} ms with refresh "
+          f"({(1 - with_refresh / login_only) * 100:.0f}% less login CPU)")
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
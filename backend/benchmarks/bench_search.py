@@ -0,0 +1,103 @@
+"""
+Median latency of /api/event/search (full-text index) next to a LIKE scan
+over the same columns, at growing numbers of events.
+
+    python -m benchmarks.bench_search --database sqlite:////tmp/wepesi-search.db
+
+The target database is rebuilt from scratch, never point it at real data.
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from app.app import create_app
+from app.config.settings import Config
+from app.config.database import db
+from app.models.events import Event
+from app.models.organizations import Organization
+from app.models.users import User
+
+# Zipf-like vocabulary: a few very common words and a long tail of rare ones
+COMMON = "beach cleanup tree planting mentoring library reading food drive community".split()
+VOCABULARY = COMMON + [f"term{i}" for i in range(20000)]
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+# (label, query): a common word (worst case, matches most events), rarer ones, no match
+QUERIES = [("common", "beach"), ("mid", "term40"), ("rare", "term9000"), ("two rare", "term500 term800"),
+           ("no match", "zebra")]
+
+
+def add_events(count, organization_id, rnd):
+    now = datetime(2030, 1, 1)
+    rows = []
+    for _ in range(count):
+        start = now + timedelta(hours=rnd.randint(0, 10000))
+        rows.append({
+            "id": str(uuid.uuid4()), "organization_id": organization_id,
+            "title": " ".join(rnd.choices(VOCABULARY, WEIGHTS, k=3)).capitalize(),
+            "description": " ".join(rnd.choices(VOCABULARY, WEIGHTS, k=40)),
+            "location": rnd.choice(["Nairobi", "Mombasa", "Kisumu", "Nakuru"]),
+            "start_time": start, "end_time": start + timedelta(hours=3), "max_participants": 20,
+        })
+    for i in range(0, len(rows), 5000):
+        db.session.execute(Event.__table__.insert(), rows[i:i + 5000])
+    db.session.commit()
+
+
+def like_scan(query):
+    filters = [
+        or_(Event.title.ilike(f"%{term}%"), Event.description.ilike(f"%{term}%"), Event.location.ilike(f"%{term}%"))
+        for term in query.split()
+    ]
+    return Event.query.filter(*filters).limit(21).all()
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="sqlite:////tmp/wepesi-search.db")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+        SQL_PROFILING = False
+
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    rnd = random.Random(42)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        owner = User(name="bench", email="bench@bench.test", username="bench", role="organization", password="x")
+        db.session.add(owner)
+        db.session.flush()
+        organization = Organization(owner_id=owner.id, name="bench", description="-",
+                                    contact_email="org@bench.test", address="-", phone="-")
+        db.session.add(organization)
+        db.session.commit()
+
+        print(f"{'events':>8}  {'query':<10}{'search ms':>10}{'LIKE ms':>10}")
+        total = 0
+        for size in (int(s) for s in args.sizes.split(",")):
+            add_events(size - total, organization.id, rnd)
+            total = size
+            for label, query in QUERIES:
+                search_ms = timed(lambda: client.get("/api/event/search", query_string={"q": query}), args.repeat)
+                like_ms = timed(lambda: like_scan(query), args.repeat)
+                print(f"{size:>8}  {label:<10}{search_ms:>10.2f}{like_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Rows per second when turning a page of events into a JSON body: the
+marshmallow path (ORM instances + events_schema + json.dumps) against the
+Row path (selected columns + compiled encoder + the API's JSON encoder).
+
+    python -m benchmarks.bench_serialization --events 10000
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.app import create_app
+from app.config.settings import Config
+from app.config.database import db
+from app.models.events import Event
+from app.schema.event_schema import EVENT_COLUMNS, encode_event, events_schema
+from app.schema.row_encoder import encode_rows
+from app.utils.json_output import dumps, orjson
+
+
+def seed(count):
+    now = datetime(2030, 1, 1)
+    rows = [
+        {
+            "id": str(uuid.uuid4()), "organization_id": str(uuid.uuid4()), "title": f"Event {i}",
+            "description": "Help out at the community garden. " * 5, "location": "Nairobi",
+            "start_time": now + timedelta(hours=i), "end_time": now + timedelta(hours=i + 3),
+            "max_participants": 20, "created_at": now, "updated_at": now,
+        }
+        for i in range(count)
+    ]
+    db.session.execute(Event.__table__.insert(), rows)
+    db.session.commit()
+
+
+def marshmallow_path():
+    events = Event.query.order_by(Event.start_time).all()
+    body = json.dumps(events_schema.dump(events))
+    db.session.expunge_all()
+    return body
+
+
+def row_path():
+    rows = db.session.execute(select(*EVENT_COLUMNS).order_by(Event.start_time)).all()
+    return dumps(encode_rows(encode_event, rows))
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+        SQL_PROFILING = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        seed(args.events)
+
+        print(f"JSON encoder: {'orjson' if orjson else 'json (install orjson for the fast path)'}")
+        results = [
+            ("marshmallow", timed(marshmallow_path, args.repeat)),
+            ("rows + encoder", timed(row_path, args.repeat)),
+        ]
+        baseline = results[0][1]
+        for label, seconds in results:
+            print(f"{label:<16}{seconds * 1000:>9.1f} ms{args.events / seconds:>12.0f} rows/s"
+                  f"   x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Bursts of identical polls of /api/organization/<id>/events (every client
+fires at the same instant, as after a popular organization posts an event),
+with and without single-flight coalescing: SQL statements run, requests per
+second and latency.
+
+    python -m benchmarks.bench_single_flight --clients 64 --bursts 20 --events 200
+
+The target database is rebuilt from scratch, never point it at real data.
+"""
+import argparse
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app.app import create_app
+from app.config.settings import Config
+from app.config.database import db
+from app.models.events import Event
+from app.models.organizations import Organization
+from app.models.participations import Participation
+from app.models.users import User
+from app.utils.auth_helper import create_identity_token
+from app.utils.single_flight import single_flight
+
+
+def seed(args):
+    owner = User(name="owner", email="owner@bench.test", username="owner", password="x", role="organization")
+    viewer = User(name="viewer", email="viewer@bench.test", username="viewer", password="x")
+    volunteers = [User(name=f"v{i}", email=f"v{i}@bench.test", username=f"v{i}", password="x") for i in range(20)]
+    db.session.add_all([owner, viewer, *volunteers])
+    db.session.flush()
+    org = Organization(owner_id=owner.id, name="Popular", description="d", contact_email="org@bench.test",
+                       address="Nairobi", phone="+254700000000")
+    db.session.add(org)
+    db.session.flush()
+    start = datetime(2030, 1, 1, 9, 0)
+    for i in range(args.events):
+        e = Event(organization_id=org.id, title=f"Event {i}", description="d", location="Nairobi",
+                  start_time=start + timedelta(days=i), end_time=start + timedelta(days=i, hours=3),
+                  max_participants=50)
+        db.session.add(e)
+        db.session.flush()
+        db.session.add_all(Participation(user_id=v.id, event_id=e.id, status="pending") for v in volunteers[: i % 20])
+    db.session.commit()
+    return org.id, create_identity_token(viewer)
+
+
+def run(app, args, url, token, enabled):
+    single_flight.enabled = enabled
+    single_flight.leaders = single_flight.coalesced = 0
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.clients)
+
+    def client_worker():
+        client = app.test_client()
+        client.set_cookie("access_token", token)
+        for _ in range(args.bursts):
+            barrier.wait()
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = (time.perf_counter() - started) * 1000
+            assert response.status_code == 200
+            with lock:
+                latencies.append(elapsed)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client_worker) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    event.remove(engine, "before_cursor_execute", count)
+
+    latencies.sort()
+    return {
+        "requests/s": len(latencies) / wall,
+        "statements": statements[0],
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "coalesced": single_flight.coalesced,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="sqlite:////tmp/wepesi-single-flight.db")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--bursts", type=int, default=20)
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+        SQL_PROFILING = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        organization_id, token = seed(args)
+    url = f"/api/organization/{organization_id}/events"
+
+    print(f"{args.clients} clients x {args.bursts} bursts of GET /api/organization/<id>/events, {args.events} events")
+    print(f"{'mode':<16}{'requests/s':>11}{'statements':>12}{'p50':>10}{'p99':>10}{'coalesced':>11}")
+    for label, enabled in (("every request", False), ("single-flight", True)):
+        r = run(app, args, url, token, enabled)
+        print(f"{label:<16}{r['requests/s']:>11.1f}{r['statements']:>12}{r['p50']:>8.1f}ms{r['p99']:>8.1f}ms{r['coalesced']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""index hot access paths
+
+Revision ID: 0a7c43f5e225
+Revises: 6f2a673e246d
+Create Date: 2026-10-18 10:47:52.918274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a7c43f5e225'
+down_revision = '6f2a673e246d'
+branch_labels = None
+depends_on = None
+
+OPEN_LOGS = "check_out_time IS NULL"
+
+# (table, index name, columns, unique, partial index predicate)
+INDEXES = [
+    ('participations', 'ix_participations_event_id_status', ['event_id', 'status'], False, None),
+    ('participations', 'uq_participations_user_id_event_id', ['user_id', 'event_id'], True, None),
+    ('time_logs', 'ix_time_logs_open_participation_id', ['participation_id'], False, OPEN_LOGS),
+    ('events', 'ix_events_organization_id_created_at', ['organization_id', 'created_at'], False, None),
+    ('organizations', 'ix_organizations_owner_id', ['owner_id'], False, None),
+    ('user_badges', 'uq_user_badges_user_id_badge_id', ['user_id', 'badge_id'], True, None),
+]
+
+
+# Which of two applications to the same event is kept
+STATUS_RANK = {'completed': 0, 'approved': 1, 'pending': 2}
+
+
+def _duplicates(bind, table, columns):
+    """Rows of `table` sharing `columns` with another row, grouped by them."""
+    on = ' AND '.join(f'd.{column} = t.{column}' for column in columns)
+    keys = ', '.join(columns)
+    rows = bind.execute(sa.text(f"""
+        SELECT t.* FROM {table} t
+        JOIN (SELECT {keys} FROM {table} GROUP BY {keys} HAVING COUNT(*) > 1) d ON {on}
+    """)).mappings().all()
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[column] for column in columns), []).append(row)
+    return groups.values()
+
+
+def dedupe(bind):
+    """
+    Remove the duplicates the unique indexes would reject; on PostgreSQL a
+    concurrent unique build over them fails and leaves an INVALID index.
+
+    Of several applications by a volunteer to one event, the most advanced
+    (completed, approved, pending, then anything else; oldest first) is
+    kept. It takes over the others' time logs and hours, which the user's
+    total already counts, and the events' seat counters are recounted. Of
+    repeated badge awards, the oldest is kept.
+    """
+    events = set()
+    for rows in _duplicates(bind, 'participations', ['user_id', 'event_id']):
+        rows.sort(key=lambda row: (STATUS_RANK.get(row['status'], len(STATUS_RANK)), row['id']))
+        keep, drop = rows[0], [row['id'] for row in rows[1:]]
+        hours = min(sum(row['volunteer_hours'] or 0 for row in rows), 999.99)
+        bind.execute(
+            sa.text("UPDATE time_logs SET participation_id = :keep WHERE participation_id IN :drop")
+            .bindparams(sa.bindparam('drop', expanding=True)),
+            {'keep': keep['id'], 'drop': drop}
+        )
+        bind.execute(sa.text("UPDATE participations SET volunteer_hours = :hours WHERE id = :keep"),
+                     {'keep': keep['id'], 'hours': hours})
+        bind.execute(
+            sa.text("DELETE FROM participations WHERE id IN :drop").bindparams(sa.bindparam('drop', expanding=True)),
+            {'drop': drop}
+        )
+        events.add(keep['event_id'])
+
+    if events:
+        bind.execute(
+            sa.text("""
+                UPDATE events SET
+                    approved_count = (
+                        SELECT COUNT(*) FROM participations
+                        WHERE participations.event_id = events.id AND participations.status = 'approved'
+                    ),
+                    pending_count = (
+                        SELECT COUNT(*) FROM participations
+                        WHERE participations.event_id = events.id AND participations.status = 'pending'
+                    )
+                WHERE id IN :events
+            """).bindparams(sa.bindparam('events', expanding=True)),
+            {'events': list(events)}
+        )
+
+    for rows in _duplicates(bind, 'user_badges', ['user_id', 'badge_id']):
+        rows.sort(key=lambda row: (row['awarded_at'] is None, row['awarded_at'] or 0, row['id']))
+        bind.execute(
+            sa.text("DELETE FROM user_badges WHERE id IN :drop").bindparams(sa.bindparam('drop', expanding=True)),
+            {'drop': [row['id'] for row in rows[1:]]}
+        )
+
+
+def upgrade():
+    bind = op.get_bind()
+    dedupe(bind)
+
+    if bind.dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            # A build that failed earlier leaves an INVALID index behind,
+            # which IF NOT EXISTS would then accept as done
+            invalid = bind.execute(sa.text("""
+                SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE NOT i.indisvalid AND c.relname IN :names
+            """).bindparams(sa.bindparam('names', expanding=True)), {'names': [index[1] for index in INDEXES]}).scalars()
+            for name in list(invalid):
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+            for table, name, columns, unique, where in INDEXES:
+                op.create_index(
+                    name, table, columns,
+                    unique=unique,
+                    postgresql_concurrently=True,
+                    postgresql_where=sa.text(where) if where else None,
+                    if_not_exists=True
+                )
+        return
+
+    for table, name, columns, unique, where in INDEXES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(
+                name, columns,
+                unique=unique,
+                sqlite_where=sa.text(where) if where else None
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for table, name, columns, unique, where in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        return
+
+    for table, name, columns, unique, where in reversed(INDEXES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(name)
@@ -0,0 +1,41 @@
+"""add seat counters to events
+
+Revision ID: 6f2a673e246d
+Revises: 848b8ad75e3f
+Create Date: 2026-10-18 10:04:17.583301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f2a673e246d'
+down_revision = '848b8ad75e3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('approved_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('pending_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing participations
+    op.execute("""
+        UPDATE events SET
+            approved_count = (
+                SELECT COUNT(*) FROM participations
+                WHERE participations.event_id = events.id AND participations.status = 'approved'
+            ),
+            pending_count = (
+                SELECT COUNT(*) FROM participations
+                WHERE participations.event_id = events.id AND participations.status = 'pending'
+            )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('pending_count')
+        batch_op.drop_column('approved_count')
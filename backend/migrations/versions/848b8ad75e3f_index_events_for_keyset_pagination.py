@@ -0,0 +1,26 @@
+"""index events for keyset pagination
+
+Revision ID: 848b8ad75e3f
+Revises: 3bd3b3f38117
+Create Date: 2026-10-18 09:12:41.220135
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '848b8ad75e3f'
+down_revision = '3bd3b3f38117'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.create_index('ix_events_start_time_id', ['start_time', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_start_time_id')
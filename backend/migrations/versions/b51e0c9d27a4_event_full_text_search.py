@@ -0,0 +1,80 @@
+"""event full-text search
+
+Revision ID: b51e0c9d27a4
+Revises: 0a7c43f5e225
+Create Date: 2026-10-18 12:31:08.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b51e0c9d27a4'
+down_revision = '0a7c43f5e225'
+branch_labels = None
+depends_on = None
+
+# The triggers belong to the events table: a later migration using
+# op.batch_alter_table('events') on SQLite copies events into a new table
+# and drops them. Such a migration must run SQLITE_UPGRADE again (the
+# statements are idempotent); `flask search rebuild` also restores them.
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        title, location, description,
+        content='events', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, title, location, description)
+        VALUES (new.rowid, new.title, new.location, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, location, description)
+        VALUES ('delete', old.rowid, old.title, old.location, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title, location, description ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, location, description)
+        VALUES ('delete', old.rowid, old.title, old.location, old.description);
+        INSERT INTO events_fts(rowid, title, location, description)
+        VALUES (new.rowid, new.title, new.location, new.description);
+    END""",
+    # Index the events that already exist
+    "INSERT INTO events_fts(events_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS events_fts_au",
+    "DROP TRIGGER IF EXISTS events_fts_ad",
+    "DROP TRIGGER IF EXISTS events_fts_ai",
+    "DROP TABLE IF EXISTS events_fts",
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE events ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'C')
+            ) STORED
+        """)
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_events_search_vector', 'events', ['search_vector'],
+                postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True
+            )
+        return
+
+    for statement in SQLITE_UPGRADE:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_events_search_vector', table_name='events', if_exists=True)
+        op.drop_column('events', 'search_vector')
+        return
+
+    for statement in SQLITE_DOWNGRADE:
+        op.execute(statement)
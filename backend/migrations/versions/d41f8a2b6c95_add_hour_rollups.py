@@ -0,0 +1,49 @@
+"""add hour rollups
+
+Revision ID: d41f8a2b6c95
+Revises: c7d2e91f4a3b
+Create Date: 2026-10-18 16:42:09.104238
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41f8a2b6c95'
+down_revision = 'c7d2e91f4a3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_daily_hours',
+    sa.Column('user_id', sa.String(length=100), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('hours', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('sessions', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.create_table('event_hours',
+    sa.Column('event_id', sa.String(length=100), nullable=False),
+    sa.Column('hours', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('sessions', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    op.create_table('organization_monthly_hours',
+    sa.Column('organization_id', sa.String(length=100), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('hours', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('sessions', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('organization_id', 'month')
+    )
+    # Fill them from the existing time logs afterwards: `flask rollups rebuild`
+
+
+def downgrade():
+    op.drop_table('organization_monthly_hours')
+    op.drop_table('event_hours')
+    op.drop_table('user_daily_hours')
@@ -0,0 +1,180 @@
+import logging.config
+import os
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from flask_migrate import upgrade
+
+from app.app import create_app
+from app.config.database import db
+from app.config.settings import TestingConfig
+from app.models.users import User
+from app.models.organizations import Organization
+from app.models.events import Event
+from app.models.participations import Participation
+from app.utils.auth_helper import create_identity_token
+from app.utils.token_blocklist import token_blocklist
+
+MIGRATIONS = os.path.join(os.path.dirname(__file__), "..", "migrations")
+
+
+@pytest.fixture
+def app():
+    """Fresh application bound to an in-memory database for every test"""
+    app = create_app("app.config.settings.TestingConfig")
+
+    with app.app_context():
+        db.create_all()
+        # Load the revoked-token mirror up front, as a warmed-up process would have it
+        token_blocklist.rebuild()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def migrated_app(tmp_path, monkeypatch):
+    """App on a database built by the migrations up to head, with text keys."""
+    class MigratedConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'head.db'}"
+
+    # env.py would reconfigure logging for the rest of the test session
+    monkeypatch.setattr(logging.config, "fileConfig", lambda *args, **kwargs: None)
+    app = create_app(MigratedConfig)
+    app.extensions["migrate"].directory = MIGRATIONS
+    with app.app_context():
+        upgrade()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    counter = {"n": 0}
+
+    def _make_user(role="volunteer", **kwargs):
+        counter["n"] += 1
+        n = counter["n"]
+        password = kwargs.pop("password", "secret123")
+        user = User(
+            name=kwargs.pop("name", f"User {n}"),
+            email=kwargs.pop("email", f"user{n}@example.com"),
+            username=kwargs.pop("username", f"user{n}"),
+            role=role,
+            **kwargs
+        )
+        user.set_password(password)
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    return _make_user
+
+
+@pytest.fixture
+def make_organization(app, make_user):
+    def _make_organization(owner=None, **kwargs):
+        owner = owner or make_user(role="organization", is_org_onboarded=True)
+        org = Organization(
+            owner_id=owner.id,
+            name=kwargs.pop("name", f"{owner.name} Org"),
+            description=kwargs.pop("description", "A volunteer organization."),
+            contact_email=kwargs.pop("contact_email", f"contact-{owner.username}@example.org"),
+            address=kwargs.pop("address", "Nairobi, Kenya"),
+            phone=kwargs.pop("phone", "+254712345678"),
+            **kwargs
+        )
+        db.session.add(org)
+        db.session.commit()
+        return org
+
+    return _make_organization
+
+
+@pytest.fixture
+def make_event(app):
+    def _make_event(organization, start_time=None, **kwargs):
+        start_time = start_time or datetime(2030, 1, 1, 9, 0)
+        event = Event(
+            organization_id=organization.id,
+            title=kwargs.pop("title", "Beach clean-up"),
+            description=kwargs.pop("description", "Help us clean the beach."),
+            location=kwargs.pop("location", "Mombasa"),
+            start_time=start_time,
+            end_time=kwargs.pop("end_time", start_time + timedelta(hours=3)),
+            max_participants=kwargs.pop("max_participants", 10),
+            **kwargs
+        )
+        db.session.add(event)
+        db.session.commit()
+        return event
+
+    return _make_event
+
+
+@pytest.fixture
+def make_participation(app):
+    def _make_participation(user, event, status="pending", **kwargs):
+        participation = Participation(
+            user_id=user.id,
+            event_id=event.id,
+            status=status,
+            **kwargs
+        )
+        db.session.add(participation)
+        # Keep the event's denormalized counters in step, as the routes do
+        if status == "approved":
+            event.approved_count += 1
+        elif status == "pending":
+            event.pending_count += 1
+        db.session.commit()
+        return participation
+
+    return _make_participation
+
+
+@pytest.fixture
+def login(client):
+    """
+    Authenticate the test client as the given user via the access cookie,
+    with the same claims LoginUser issues (legacy=True: identity only)
+    """
+    def _login(user, legacy=False):
+        if legacy:
+            token = create_access_token(identity=user.id)
+        else:
+            token = create_identity_token(user)
+        client.set_cookie("access_token", token)
+        return token
+
+    return _login
+
+
+@pytest.fixture
+def count_queries(app):
+    """
+    Context manager that records every SQL statement sent to the engine.
+    Usage: `with count_queries() as statements: ...; len(statements)`
+    """
+    @contextmanager
+    def _count_queries():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    return _count_queries
@@ -0,0 +1,184 @@
+from datetime import timedelta
+from flask_jwt_extended import decode_token
+from app.config.database import db
+from app.models.revoked_tokens import RevokedToken
+from app.models.users import User
+from app.utils.password_hasher import HasherBusy, password_hasher
+
+
+def _login(client, username, password):
+    return client.post("/api/auth/login", json={"username": username, "password": password})
+
+
+def test_login_upgrades_outdated_password_hash(client, make_user):
+    """
+    GIVEN a user whose hash was made with an older bcrypt cost
+    WHEN they log in successfully
+    THEN the stored hash is replaced by one with the configured cost
+    """
+    user = make_user()
+    password_hasher.rounds = 5
+    try:
+        user.set_password("secret123")
+        db.session.commit()
+    finally:
+        password_hasher.rounds = 4
+    old_hash = user.password
+
+    assert _login(client, user.username, "wrong").status_code == 401
+    assert user.password == old_hash
+
+    assert _login(client, user.username, "secret123").status_code == 200
+    db.session.refresh(user)
+    assert user.password != old_hash
+    assert user.password.startswith("$2b$04$")
+
+
+def test_login_answers_503_when_the_hasher_is_saturated(client, make_user, monkeypatch):
+    user = make_user()
+
+    def busy(*args):
+        raise HasherBusy("busy")
+
+    monkeypatch.setattr(password_hasher, "_run", busy)
+    response = _login(client, user.username, "secret123")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def _access_claims(client):
+    return decode_token(client.get_cookie("access_token").value)
+
+
+def test_login_embeds_authorization_claims(client, make_organization):
+    org = make_organization()
+    owner = db.session.get(User, org.owner_id)
+
+    assert _login(client, owner.username, "secret123").status_code == 200
+
+    claims = _access_claims(client)
+    assert claims["sub"] == owner.id
+    assert claims["role"] == "organization"
+    assert claims["organization_id"] == org.id
+    assert claims["is_org_onboarded"] is True
+
+
+def test_claims_authorize_without_user_or_organization_queries(client, login, count_queries, make_organization):
+    """
+    GIVEN an organization token carrying role and organization claims
+    WHEN it creates an event
+    THEN neither the users nor the organizations table is read
+    """
+    org = make_organization()
+    login(db.session.get(User, org.owner_id))
+    db.session.expunge_all()
+
+    payload = {
+        "title": "Tree planting", "description": "Bring boots.", "location": "Karura",
+        "start_time": "2030-05-01T09:00:00", "end_time": "2030-05-01T12:00:00", "max_participants": 5,
+    }
+    with count_queries() as statements:
+        response = client.post("/api/event", json=payload)
+
+    assert response.status_code == 201
+    assert not [s for s in statements if "FROM users" in s or "FROM organizations" in s]
+
+
+def test_legacy_tokens_fall_back_to_the_database(client, login, make_organization, make_user):
+    org = make_organization()
+    login(db.session.get(User, org.owner_id), legacy=True)
+    assert client.get("/api/auth/my-organization-profile").get_json()["organization"]["id"] == org.id
+
+    login(make_user(), legacy=True)
+    assert client.get("/api/auth/my-organization-profile").status_code == 403
+
+
+def test_onboarding_reissues_the_access_token(client, login, make_user):
+    owner = make_user(role="organization")
+    login(owner)
+    assert _access_claims(client)["organization_id"] is None
+
+    response = client.post("/api/auth/onboard-organization", json={
+        "name": "Green Belt", "description": "Trees", "contact_email": "hello@greenbelt.org",
+        "address": "Nairobi", "phone": "+254700000000",
+    })
+
+    assert response.status_code == 201
+    claims = _access_claims(client)
+    assert claims["organization_id"] is not None and claims["is_org_onboarded"] is True
+    assert client.get("/api/auth/my-organization-profile").get_json()["organization"]["name"] == "Green Belt"
+
+
+def test_logout_revokes_access_and_refresh_tokens(client, make_user):
+    user = make_user()
+    _login(client, user.username, "secret123")
+    access = client.get_cookie("access_token").value
+    refresh = client.get_cookie("refresh_token").value
+
+    assert client.post("/api/auth/logout").status_code == 200
+
+    # Replaying the old cookies no longer works
+    client.set_cookie("access_token", access)
+    assert client.get("/api/auth/my-organization-profile").status_code == 401
+    assert RevokedToken.query.filter_by(user_id=user.id).count() == 2
+    assert {t.jti for t in RevokedToken.query.all()} == {decode_token(access)["jti"], decode_token(refresh)["jti"]}
+
+
+def _refresh(client, refresh_token=None):
+    if refresh_token:
+        client.set_cookie("refresh_token", refresh_token)
+    return client.post("/api/auth/refresh")
+
+
+def test_refresh_rotates_tokens_without_checking_the_password(client, make_user, monkeypatch):
+    user = make_user()
+    _login(client, user.username, "secret123")
+    first_refresh = client.get_cookie("refresh_token").value
+
+    def no_hashing(*args):
+        raise AssertionError("refresh must not hash passwords")
+
+    monkeypatch.setattr(password_hasher, "_run", no_hashing)
+    response = _refresh(client)
+
+    assert response.status_code == 200
+    second_refresh = client.get_cookie("refresh_token").value
+    assert second_refresh != first_refresh
+    claims = _access_claims(client)
+    assert claims["role"] == "volunteer"
+    assert claims["family"] == decode_token(first_refresh)["family"] == decode_token(second_refresh)["family"]
+    assert _refresh(client).status_code == 200
+
+
+def test_refresh_token_reuse_revokes_the_session(app, client, make_user):
+    """
+    GIVEN a refresh token that was already rotated
+    WHEN it is presented again after the grace period
+    THEN it is refused and every token of its session stops working
+    """
+    app.config["REFRESH_REUSE_GRACE"] = timedelta(0)
+    user = make_user()
+    _login(client, user.username, "secret123")
+    stolen = client.get_cookie("refresh_token").value
+
+    assert _refresh(client).status_code == 200
+    current_access = client.get_cookie("access_token").value
+    current_refresh = client.get_cookie("refresh_token").value
+
+    assert _refresh(client, stolen).status_code == 401
+    assert _refresh(client, current_refresh).status_code == 401
+    client.set_cookie("access_token", current_access)
+    assert client.post("/api/auth/logout").status_code == 401
+
+
+def test_refresh_token_replay_within_grace_keeps_the_session(client, make_user):
+    user = make_user()
+    _login(client, user.username, "secret123")
+    raced = client.get_cookie("refresh_token").value
+
+    assert _refresh(client).status_code == 200
+    current_refresh = client.get_cookie("refresh_token").value
+
+    assert _refresh(client, raced).status_code == 401
+    assert _refresh(client, current_refresh).status_code == 200
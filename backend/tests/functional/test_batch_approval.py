@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from app.config.database import db
+from app.models.events import Event
+from app.models.participations import Participation
+
+
+def _apply_in_order(make_user, make_participation, event, count):
+    base = datetime(2030, 1, 1, 8, 0)
+    return [
+        make_participation(make_user(), event, applied_at=base + timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+def test_batch_admits_in_application_order_up_to_capacity(client, login, make_user, make_organization,
+                                                         make_event, make_participation, count_queries):
+    """
+    GIVEN an event with 3 seats, 1 already taken, and 5 pending applications
+    WHEN the organization approves 4 of them and rejects 1 in one request
+    THEN the 2 earliest applicants are admitted, the others overflow, and
+         the counters and statuses change in a constant number of statements
+    """
+    owner = make_user(role="organization", is_org_onboarded=True)
+    event = make_event(make_organization(owner=owner), max_participants=3)
+    make_participation(make_user(), event, status="approved")
+    first, second, third, fourth, fifth = [p.id for p in _apply_in_order(make_user, make_participation, event, 5)]
+    event_id = event.id
+    login(owner)
+    # Start from an empty identity map, like a fresh request session
+    db.session.expunge_all()
+
+    with count_queries() as statements:
+        response = client.put(
+            f"/api/event/{event_id}/applications/approve",
+            json={"approve": [fourth, second, first, third, "missing"], "reject": [fifth]}
+        )
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["approved"] == [first, second]
+    assert body["overflowed"] == [third, fourth]
+    assert body["rejected"] == [fifth]
+    assert body["invalid"] == [{"id": "missing", "message": "Participation not found."}]
+    # event, applications, reject + pending counter, seats + approve
+    assert len(statements) == 6
+
+    event = db.session.get(Event, event_id)
+    assert (event.approved_count, event.pending_count) == (3, 2)
+    assert db.session.get(Participation, fifth).status == "rejected"
+    assert db.session.get(Participation, third).status == "pending"
+
+
+def test_batch_checks_ownership_and_already_decided_applications(client, login, make_user, make_organization,
+                                                                 make_event, make_participation):
+    owner = make_user(role="organization", is_org_onboarded=True)
+    event = make_event(make_organization(owner=owner))
+    approved = make_participation(make_user(), event, status="approved")
+    url = f"/api/event/{event.id}/applications/approve"
+
+    login(make_organization().owner)
+    assert client.put(url, json={"approve": [approved.id]}).status_code == 403
+
+    login(owner)
+    body = client.put(url, json={"approve": [approved.id], "reject": [approved.id]}).get_json()
+    assert body["invalid"] == [{"id": approved.id, "message": "Listed for both approval and rejection."}]
+    body = client.put(url, json={"approve": [approved.id]}).get_json()
+    assert body["invalid"] == [{"id": approved.id, "message": "Application already approved."}]
+    assert client.put(url, json={"approve": "everyone"}).status_code == 400
@@ -0,0 +1,57 @@
+from datetime import datetime
+from app.config.database import db
+from app.utils.response_cache import response_cache
+
+
+def test_feed_is_served_from_cache_until_an_event_is_written(client, count_queries, make_organization, make_event):
+    """
+    GIVEN a feed page already requested once
+    WHEN it is requested again, and again after a new event is committed
+    THEN the repeat is a cache hit without SQL, and the write invalidates it
+    """
+    org = make_organization()
+    make_event(org)
+    assert client.get("/api/event").headers["X-Cache"] == "MISS"
+
+    with count_queries() as statements:
+        hit = client.get("/api/event")
+    assert hit.headers["X-Cache"] == "HIT"
+    assert hit.get_json()[0]["count"] == 1
+    assert statements == []
+
+    make_event(org, start_time=datetime(2030, 5, 1, 9, 0))
+    fresh = client.get("/api/event")
+    assert fresh.headers["X-Cache"] == "MISS"
+    assert fresh.get_json()[0]["count"] == 2
+    assert response_cache.stats()["hits"] == 1
+
+
+def test_applications_invalidate_only_pages_showing_the_event(client, login, make_user, make_organization, make_event):
+    applied_org, other_org = make_organization(), make_organization()
+    event = make_event(applied_org)
+    make_event(other_org)
+    applied_url = f"/api/event?organization_id={applied_org.id}"
+    other_url = f"/api/event?organization_id={other_org.id}"
+    client.get(applied_url)
+    client.get(other_url)
+
+    login(make_user())
+    assert client.post(f"/api/event/{event.id}/apply").status_code == 201
+
+    refreshed = client.get(applied_url)
+    assert refreshed.headers["X-Cache"] == "MISS"
+    assert refreshed.get_json()[0]["events"][0]["pending_count"] == 1
+    assert client.get(other_url).headers["X-Cache"] == "HIT"
+
+
+def test_organization_profile_is_invalidated_by_profile_edits(client, make_organization):
+    org = make_organization()
+    url = f"/api/auth/organization-profile/{org.id}"
+    client.get(url)
+    assert client.get(url).headers["X-Cache"] == "HIT"
+
+    org.description = "Now planting trees too."
+    db.session.commit()
+    refreshed = client.get(url)
+    assert refreshed.headers["X-Cache"] == "MISS"
+    assert refreshed.get_json()["organization"]["description"] == "Now planting trees too."
@@ -0,0 +1,40 @@
+from app.config.database import db
+from app.models.events import Event
+
+
+def test_apply_and_approve_keep_seat_counters(client, login, make_user, make_organization, make_event):
+    owner = make_user(role="organization", is_org_onboarded=True)
+    event = make_event(make_organization(owner=owner), max_participants=1)
+    event_id = event.id
+    first, second = make_user(), make_user()
+
+    for volunteer in (first, second):
+        login(volunteer)
+        assert client.post(f"/api/event/{event_id}/apply").status_code == 201
+
+    event = db.session.get(Event, event_id)
+    db.session.refresh(event)
+    assert (event.pending_count, event.approved_count) == (2, 0)
+
+    login(owner)
+    ids = [p.id for p in event.participations]
+    assert client.put(f"/api/participation/{ids[0]}/approve").status_code == 200
+    assert client.put(f"/api/participation/{ids[0]}/approve").status_code == 409
+
+    response = client.put(f"/api/participation/{ids[1]}/approve")
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Event is full."
+
+    db.session.refresh(event)
+    assert (event.pending_count, event.approved_count) == (1, 1)
+
+
+def test_full_event_rejects_new_applications(client, login, make_user, make_organization,
+                                             make_event, make_participation):
+    event = make_event(make_organization(), max_participants=1)
+    make_participation(make_user(), event, status="approved")
+
+    login(make_user())
+    response = client.post(f"/api/event/{event.id}/apply")
+
+    assert response.status_code == 400
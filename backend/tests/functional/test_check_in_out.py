@@ -0,0 +1,191 @@
+import threading
+import time
+import pytest
+from sqlalchemy import update
+from app.config.database import db
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+from app.models.users import User
+from app.utils import attendance
+from app.utils.auth_helper import create_identity_token
+from app.utils.group_commit import GroupCommitWriter, WriterBusy, time_log_writer
+from app.utils.identity_cache import identity_cache
+
+
+@pytest.fixture(params=[False, True], ids=["direct", "group-commit"])
+def writer(request, app):
+    app.config["TIME_LOG_GROUP_COMMIT"] = request.param
+    app.config["TIME_LOG_GROUP_COMMIT_WINDOW_MS"] = 50
+    time_log_writer.init_app(app)
+    yield time_log_writer
+    time_log_writer.shutdown()
+
+
+def test_check_in_and_out_keep_per_request_answers(writer, client, login, make_user, make_organization,
+                                                   make_event, make_participation):
+    volunteer = make_user()
+    participation = make_participation(volunteer, make_event(make_organization()), status="approved")
+    pending = make_participation(volunteer, make_event(make_organization()))
+    login(volunteer)
+    url = f"/api/participation/{participation.id}"
+
+    assert client.post(f"{url}/check-out").status_code == 400
+    assert client.post(f"{url}/check-in").status_code == 201
+    assert client.post(f"{url}/check-in").status_code == 409
+    assert client.post(f"/api/participation/{pending.id}/check-in").status_code == 400
+
+    response = client.post(f"{url}/check-out")
+    assert response.status_code == 200
+    assert response.get_json()["user_total_hours"] == pytest.approx(0, abs=0.01)
+    assert TimeLog.query.filter(TimeLog.check_out_time.is_(None)).count() == 0
+
+    login(make_user())
+    assert client.post(f"{url}/check-in").status_code == 403
+
+
+def test_check_out_adds_to_the_stored_total_not_a_cached_one(writer, client, login, make_user,
+                                                             make_organization, make_event, make_participation):
+    """
+    GIVEN a volunteer cached by the identity cache and hours credited to them by another process
+    WHEN they check out
+    THEN the session is added to the stored total, not to the cached snapshot
+    """
+    volunteer = make_user(total_volunteer_hours=1)
+    participation = make_participation(volunteer, make_event(make_organization()), status="approved")
+    user_id, url = volunteer.id, f"/api/participation/{participation.id}"
+    login(volunteer)
+    assert client.post(f"{url}/check-in").status_code == 201
+
+    db.session.remove()
+    identity_cache.load_user(user_id)
+    db.session.execute(User.__table__.update().values(total_volunteer_hours=5))
+    db.session.commit()  # a Core write, invisible to the cache like one from the sweeper's process
+    db.session.remove()
+
+    response = client.post(f"{url}/check-out")
+    assert response.status_code == 200
+    assert response.get_json()["user_total_hours"] == pytest.approx(5, abs=0.01)
+
+
+def test_check_out_credits_nothing_for_a_session_closed_meanwhile(client, login, make_user, make_organization,
+                                                                  make_event, make_participation, monkeypatch):
+    """
+    GIVEN an open session the sweeper closes after check-out has read it
+    WHEN the check-out goes on to close it
+    THEN it answers 400 and credits no hours on top of the sweeper's
+    """
+    volunteer = make_user()
+    participation = make_participation(volunteer, make_event(make_organization()), status="approved")
+    participation_id, url = participation.id, f"/api/participation/{participation.id}"
+    login(volunteer)
+    assert client.post(f"{url}/check-in").status_code == 201
+
+    def closed_by_the_sweeper(table):
+        db.session.execute(update(TimeLog).values(check_out_time=TimeLog.check_in_time, hours_worked=1))
+        return update(table)
+
+    monkeypatch.setattr(attendance, "update", closed_by_the_sweeper)
+    assert client.post(f"{url}/check-out").status_code == 400
+
+    db.session.remove()
+    assert float(db.session.get(Participation, participation_id).volunteer_hours or 0) == 0
+    assert float(TimeLog.query.one().hours_worked) == 1
+
+
+def test_burst_of_check_ins_commits_as_one_group(app, make_user, make_organization, make_event, make_participation):
+    """
+    GIVEN the group-commit writer
+    WHEN several volunteers check in at once, one of them twice
+    THEN their writes share one transaction and the duplicate still gets 409
+    """
+    app.config.update(TIME_LOG_GROUP_COMMIT=True, TIME_LOG_GROUP_COMMIT_WINDOW_MS=200)
+    time_log_writer.init_app(app)
+    event = make_event(make_organization())
+    participations = [make_participation(make_user(), event, status="approved") for _ in range(3)]
+    requests = [(p.user, p.id) for p in participations] + [(participations[0].user, participations[0].id)]
+    tokens = {user.id: create_identity_token(user) for user, _ in requests}
+
+    statuses = []
+
+    def check_in(user_id, participation_id):
+        client = app.test_client()
+        client.set_cookie("access_token", tokens[user_id])
+        statuses.append(client.post(f"/api/participation/{participation_id}/check-in").status_code)
+
+    threads = [threading.Thread(target=check_in, args=(user.id, pid)) for user, pid in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    time_log_writer.shutdown()
+
+    assert sorted(statuses) == [201, 201, 201, 409]
+    assert time_log_writer.stats()["batches"] == 1
+    assert time_log_writer.stats()["mutations"] == 4
+    assert TimeLog.query.count() == 3
+
+
+def test_failing_write_is_isolated_from_its_group(app):
+    app.config.update(TIME_LOG_GROUP_COMMIT=True, TIME_LOG_GROUP_COMMIT_WINDOW_MS=200)
+    time_log_writer.init_app(app)
+
+    def add_user():
+        db.session.add(User(name="kept", email="kept@example.com", username="kept", password="x"))
+        db.session.flush()
+        return {"message": "added"}, 201
+
+    def broken():
+        raise ValueError("bad write")
+
+    outcomes = {}
+
+    def submit(name, mutation):
+        try:
+            outcomes[name] = time_log_writer.run(mutation)
+        except ValueError as e:
+            outcomes[name] = e
+
+    threads = [threading.Thread(target=submit, args=item) for item in (("good", add_user), ("bad", broken))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    time_log_writer.shutdown()
+
+    assert outcomes["good"] == ({"message": "added"}, 201)
+    assert isinstance(outcomes["bad"], ValueError)
+    assert time_log_writer.stats()["retried_batches"] == 1
+    assert User.query.filter_by(username="kept").count() == 1
+
+
+def test_timed_out_write_is_withdrawn(app):
+    """
+    GIVEN a writer busy with a slow group
+    WHEN a queued write times out
+    THEN the caller gets WriterBusy and the write is never applied
+    """
+    app.config.update(TIME_LOG_GROUP_COMMIT=True, TIME_LOG_GROUP_COMMIT_WINDOW_MS=0)
+    writer = GroupCommitWriter(timeout=0.2)
+    writer.init_app(app)
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return {"message": "slow"}, 200
+
+    def add_user():
+        db.session.add(User(name="late", email="late@example.com", username="late", password="x"))
+        db.session.flush()
+        return {"message": "added"}, 201
+
+    first = threading.Thread(target=writer.run, args=(slow,))
+    first.start()
+    time.sleep(0.05)
+    with pytest.raises(WriterBusy):
+        writer.run(add_user)
+    release.set()
+    first.join()
+    writer.shutdown()
+
+    assert writer.stats()["mutations"] == 1
+    assert User.query.filter_by(username="late").count() == 0
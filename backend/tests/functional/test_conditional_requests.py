@@ -0,0 +1,81 @@
+from datetime import datetime
+from app.config.database import db
+from app.utils.capacity_helper import add_pending
+
+
+def _revalidate(client, url, response):
+    return client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+
+
+def test_event_feed_answers_304_until_a_page_event_changes(client, count_queries, make_organization, make_event):
+    """
+    GIVEN a feed page fetched once
+    WHEN it is fetched again with its ETag
+    THEN the server answers 304 without loading the page, and 200 again
+         once an event on the page changes, including through the counters
+    """
+    event = make_event(make_organization())
+    first = client.get("/api/event")
+    assert first.status_code == 200
+    assert first.headers["ETag"].startswith('W/"')
+
+    with count_queries() as statements:
+        again = _revalidate(client, "/api/event", first)
+    assert again.status_code == 304
+    assert again.data == b""
+    # Served from the response cache's validators
+    assert len(statements) == 0
+
+    # Filters are part of the representation
+    assert _revalidate(client, "/api/event?limit=5", first).status_code == 200
+
+    add_pending(event.id)
+    db.session.commit()
+    changed = _revalidate(client, "/api/event", first)
+    assert changed.status_code == 200
+    assert changed.get_json()[0]["events"][0]["pending_count"] == 1
+    assert changed.headers["ETag"] != first.headers["ETag"]
+
+
+def test_organization_events_revalidate_on_new_events(client, login, make_user, make_organization, make_event):
+    org = make_organization()
+    make_event(org)
+    login(make_user())
+    url = f"/api/organization/{org.id}/events"
+
+    first = client.get(url)
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    assert _revalidate(client, url, first).status_code == 304
+
+    make_event(org, start_time=datetime(2030, 3, 1, 9, 0))
+    changed = _revalidate(client, url, first)
+    assert changed.status_code == 200
+    assert changed.get_json()["count"] == 2
+
+
+def test_organization_profiles_revalidate_on_event_changes(client, login, make_organization, make_event):
+    org = make_organization()
+    make_event(org, start_time=datetime(2030, 1, 1, 9, 0))
+    url = f"/api/auth/organization-profile/{org.id}"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.get_json()["organization"]["stats"]["active_events"] == 1
+    # The organization's updated_at does not cover its event count
+    assert "Last-Modified" not in first.headers
+    assert _revalidate(client, url, first).status_code == 304
+
+    make_event(org, start_time=datetime(2030, 2, 1, 9, 0))
+    changed = _revalidate(client, url, first)
+    assert changed.status_code == 200
+    assert changed.get_json()["organization"]["stats"]["active_events"] == 2
+
+    login(org.owner)
+    mine = client.get("/api/auth/my-organization-profile")
+    assert _revalidate(client, "/api/auth/my-organization-profile", mine).status_code == 304
+
+    org.name = "Renamed"
+    db.session.commit()
+    changed = _revalidate(client, "/api/auth/my-organization-profile", mine)
+    assert changed.status_code == 200
+    assert changed.get_json()["organization"]["name"] == "Renamed"
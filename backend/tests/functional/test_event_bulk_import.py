@@ -0,0 +1,80 @@
+import io
+from app.config.database import db
+from app.models.events import Event
+
+VALID = {
+    "title": "Tree planting",
+    "description": "Plant seedlings along the river.",
+    "location": "Kisumu",
+    "start_time": "2030-03-01T09:00:00",
+    "end_time": "2030-03-01T12:00:00",
+    "max_participants": 20,
+}
+
+
+def _login_organization(login, make_organization):
+    org = make_organization()
+    login(org.owner)
+    return org
+
+
+def test_json_import_creates_valid_rows_and_reports_the_rest(client, login, make_organization):
+    """
+    GIVEN a JSON array mixing valid and invalid events
+    WHEN it is posted to /api/event/bulk
+    THEN the valid events are created and each invalid row is reported by number
+    """
+    org = _login_organization(login, make_organization)
+    rows = [
+        VALID,
+        {**VALID, "end_time": "2030-03-01T08:00:00"},
+        {**VALID, "title": "Second shift", "start_time": "2030-03-02T09:00:00", "end_time": "2030-03-02T12:00:00"},
+        {**VALID, "start_time": "next tuesday"},
+        {**VALID, "title": "x" * 101},
+    ]
+
+    response = client.post("/api/event/bulk", json=rows)
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["created"] == 2
+    assert [e["row"] for e in body["errors"]] == [2, 4, 5]
+    assert body["errors"][0]["message"] == "End time must be after start time."
+    assert Event.query.filter_by(organization_id=org.id).count() == 2
+
+
+def test_csv_upload_is_inserted_in_executemany_batches(app, client, login, make_organization, count_queries):
+    org = _login_organization(login, make_organization)
+    app.config["BULK_EVENT_CHUNK_SIZE"] = 2
+    lines = ["title,description,location,start_time,end_time,max_participants"]
+    for day in range(1, 6):
+        lines.append(f"Shift {day},Help out,Nakuru,2030-04-0{day}T09:00:00,2030-04-0{day}T11:00:00,15")
+    lines.append("Broken,Help out,Nakuru,2030-04-09T09:00:00,2030-04-09T11:00:00,many")
+
+    with count_queries() as statements:
+        response = client.post(
+            "/api/event/bulk",
+            data={"file": (io.BytesIO("\n".join(lines).encode("utf-8")), "semester.csv")},
+            content_type="multipart/form-data"
+        )
+
+    assert response.status_code == 201
+    assert response.get_json()["created"] == 5
+    assert response.get_json()["errors"] == [{"row": 6, "message": "max_participants must be a whole number."}]
+    assert sum(s.startswith("INSERT INTO events") for s in statements) == 3
+    assert db.session.get(Event, Event.query.filter_by(title="Shift 3").one().id).max_participants == 15
+
+
+def test_import_without_valid_rows_creates_nothing(client, login, make_organization, make_user):
+    _login_organization(login, make_organization)
+    response = client.post("/api/event/bulk", data="title,location\nA,B\n", content_type="text/csv")
+    assert response.status_code == 400
+    assert response.get_json()["message"].startswith("Missing CSV columns: description")
+
+    response = client.post("/api/event/bulk", json=[{**VALID, "title": ""}])
+    assert response.status_code == 400
+    assert response.get_json()["created"] == 0
+    assert Event.query.count() == 0
+
+    login(make_user())
+    assert client.post("/api/event/bulk", json=[VALID]).status_code == 403
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+
+def _page(client, **params):
+    response = client.get("/api/event", query_string=params)
+    return response.status_code, response.get_json()
+
+
+def test_event_feed_walks_pages_in_start_time_order(client, make_organization, make_event):
+    """
+    GIVEN more events than fit on one page
+    WHEN following the `next` cursor until it runs out
+    THEN every event is returned exactly once, ordered by start_time
+    """
+    org = make_organization()
+    base = datetime(2030, 1, 1, 9, 0)
+    created = [make_event(org, start_time=base + timedelta(days=i)) for i in (4, 0, 3, 1, 2)]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["next"] = cursor
+        status, body = _page(client, **params)
+        assert status == 200
+        page = body[0]
+        seen.extend(e["id"] for e in page["events"])
+        cursor = page["next"]
+        if not cursor:
+            break
+
+    expected = [e.id for e in sorted(created, key=lambda e: e.start_time)]
+    assert seen == expected
+
+
+def test_event_feed_filters(client, make_organization, make_event, make_user, make_participation):
+    org = make_organization()
+    other_org = make_organization()
+    full = make_event(org, start_time=datetime(2030, 2, 1, 9, 0), max_participants=1)
+    open_event = make_event(org, start_time=datetime(2030, 3, 1, 9, 0))
+    make_event(other_org, start_time=datetime(2030, 3, 1, 9, 0))
+    past = make_event(org, start_time=datetime(2001, 1, 1, 9, 0))
+    make_participation(make_user(), full, status="approved")
+
+    _, body = _page(client, organization_id=org.id)
+    assert {e["id"] for e in body[0]["events"]} == {full.id, open_event.id, past.id}
+
+    _, body = _page(client, organization_id=org.id, upcoming="true")
+    assert {e["id"] for e in body[0]["events"]} == {full.id, open_event.id}
+
+    _, body = _page(client, organization_id=org.id, has_seats="1", upcoming="1")
+    assert [e["id"] for e in body[0]["events"]] == [open_event.id]
+
+    _, body = _page(client, **{"from": "2030-02-15T00:00:00", "to": "2030-03-02T00:00:00"})
+    assert len(body[0]["events"]) == 2
+
+
+def test_event_feed_rejects_bad_cursor(client, make_organization, make_event):
+    make_event(make_organization())
+
+    status, _ = _page(client, next="not-a-cursor")
+    assert status == 400
@@ -0,0 +1,117 @@
+from flask_migrate import check
+from sqlalchemy import text
+from app.config.database import db
+from app.config.settings import Config
+from app.utils.event_search import rebuild_search_index
+from app.utils.key_migration import swap_to_compact_keys
+
+
+def _search(client, **params):
+    response = client.get("/api/event/search", query_string=params)
+    return response.status_code, response.get_json()
+
+
+def test_search_ranks_title_matches_first(client, make_organization, make_event):
+    """
+    GIVEN events mentioning a keyword in different fields
+    WHEN searching for it
+    THEN title matches rank above description-only matches and snippets highlight the word
+    """
+    org = make_organization()
+    in_description = make_event(org, title="Weekend cleanup", description="Bring gloves for the beach trash pickup.")
+    in_title = make_event(org, title="Beach restoration day", description="Planting dune grass.")
+    make_event(org, title="Library reading hour", description="Reading with kids.")
+
+    status, body = _search(client, q="beach")
+
+    assert status == 200
+    assert [e["id"] for e in body["events"]] == [in_title.id, in_description.id]
+    assert "<mark>Beach</mark>" in body["events"][0]["snippet"]
+
+
+def test_search_prefix_match_and_escaped_snippet(client, make_organization, make_event):
+    org = make_organization()
+    event = make_event(org, title="<b>Tree</b> planting", description="Planting trees in Karura forest.")
+
+    _, body = _search(client, q="karu")
+
+    assert [e["id"] for e in body["events"]] == [event.id]
+    assert "<b>" not in body["events"][0]["snippet"]
+    assert "<mark>Karura</mark>" in body["events"][0]["snippet"]
+
+
+def test_search_follows_edits_and_deletes(client, make_organization, make_event):
+    org = make_organization()
+    event = make_event(org, title="Food drive", description="Collect tins.")
+
+    event.title = "Clothes drive"
+    db.session.commit()
+    assert _search(client, q="food")[1]["events"] == []
+    assert [e["id"] for e in _search(client, q="clothes")[1]["events"]] == [event.id]
+
+    db.session.delete(event)
+    db.session.commit()
+    assert _search(client, q="clothes")[1]["events"] == []
+
+
+def test_search_pages_with_cursor(client, make_organization, make_event):
+    org = make_organization()
+    created = {make_event(org, title=f"Mentoring session {i}").id for i in range(5)}
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "mentoring", "limit": 2}
+        if cursor:
+            params["next"] = cursor
+        status, body = _search(client, **params)
+        assert status == 200
+        seen.extend(e["id"] for e in body["events"])
+        cursor = body["next"]
+        if not cursor:
+            break
+
+    assert len(seen) == 5 and set(seen) == created
+
+
+def test_search_requires_a_query(client):
+    assert _search(client, q="  ?! ")[0] == 400
+    assert _search(client, q="x", next="garbage")[0] == 400
+
+
+def test_search_falls_back_to_like_on_other_databases(client, monkeypatch, make_organization, make_event):
+    """
+    GIVEN a database without a supported full-text index
+    WHEN searching
+    THEN matching events come from a LIKE scan, title matches first, paged with the cursor
+    """
+    org = make_organization()
+    in_description = make_event(org, title="Weekend cleanup", description="Bring gloves for the beach trash pickup.")
+    in_title = make_event(org, title="Beach restoration day", description="Planting dune grass.")
+    make_event(org, title="Library reading hour", description="Reading with kids.")
+    monkeypatch.setattr(db.engine.dialect, "name", "mssql")
+
+    status, body = _search(client, q="beach", limit=1)
+    assert status == 200
+    assert [e["id"] for e in body["events"]] == [in_title.id]
+
+    _, body = _search(client, q="beach", limit=1, next=body["next"])
+    assert [e["id"] for e in body["events"]] == [in_description.id]
+    assert "<mark>beach</mark>" in body["events"][0]["snippet"]
+
+
+def test_migrations_leave_the_search_index_alone(migrated_app):
+    """
+    GIVEN a database migrated to head, FTS5 tables and triggers included
+    WHEN autogenerate compares it with the models, and after events lost its triggers
+    THEN no drop of the search objects is proposed, and `search rebuild` restores the triggers
+    """
+    if Config.KEY_STRATEGY == "uuid7":
+        swap_to_compact_keys()  # head has text keys until then
+    check()  # exits when it detects schema changes
+
+    db.session.execute(text("DROP TRIGGER events_fts_ai"))
+    db.session.commit()
+    rebuild_search_index()
+
+    triggers = db.session.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars().all()
+    assert {"events_fts_ai", "events_fts_ad", "events_fts_au"} <= set(triggers)
@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta, timezone
+from app.config.database import db
+from app.models.hour_rollups import EventHours, OrganizationMonthlyHours, UserDailyHours
+from app.models.time_logs import TimeLog
+from app.utils.hour_rollups import rebuild_hour_rollups
+from app.utils.time_log_sweeper import sweep_stale_time_logs
+
+
+def _snapshot():
+    return {
+        model.__tablename__: sorted(
+            (tuple(str(v) for v in row[:-2]), float(row[-2]), row[-1])
+            for row in db.session.execute(db.select(*model.__table__.c)).all()
+        )
+        for model in (UserDailyHours, EventHours, OrganizationMonthlyHours)
+    }
+
+
+def test_check_outs_update_rollups_and_rebuild_matches(app, client, login, make_user, make_organization,
+                                                      make_event, make_participation):
+    """
+    GIVEN a volunteer checking out twice on one day and a stale session closed by the sweeper
+    WHEN the rollups are read, then rebuilt from time_logs
+    THEN they hold the per day, event and month sums, and the rebuild gives the same rows
+    """
+    organization = make_organization()
+    event = make_event(organization, start_time=datetime(2030, 1, 1), end_time=datetime(2030, 1, 2))
+    volunteer = make_user()
+    participation = make_participation(volunteer, event, status="approved")
+    login(volunteer)
+    url = f"/api/participation/{participation.id}"
+    started = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=2)
+
+    for _ in range(2):
+        assert client.post(f"{url}/check-in").status_code == 201
+        TimeLog.query.filter_by(check_out_time=None).update({"check_in_time": started})
+        db.session.commit()
+        assert client.post(f"{url}/check-out").status_code == 200
+
+    stale = TimeLog(participation_id=participation.id, user_id=volunteer.id, event_id=event.id,
+                    check_in_time=datetime(2030, 1, 1, 9))
+    db.session.add(stale)
+    db.session.commit()
+    sweep_stale_time_logs(now=datetime(2030, 1, 3))
+
+    day = db.session.get(UserDailyHours, (volunteer.id, started.date()))
+    assert (float(day.hours), day.sessions) == (4, 2)
+    assert float(db.session.get(UserDailyHours, (volunteer.id, date(2030, 1, 1))).hours) == 12
+    event_hours = db.session.get(EventHours, event.id)
+    assert (float(event_hours.hours), event_hours.sessions) == (16, 3)
+    month = db.session.get(OrganizationMonthlyHours, (organization.id, date(2030, 1, 1)))
+    assert (float(month.hours), month.sessions) == (12, 1)
+
+    incremental = _snapshot()
+    assert rebuild_hour_rollups(chunk_size=2) == 3
+    assert _snapshot() == incremental
+
+
+def test_completion_without_check_in_is_rolled_up(app, client, login, make_user, make_organization,
+                                                  make_event, make_participation):
+    organization = make_organization()
+    event = make_event(organization, start_time=datetime(2020, 5, 4, 9), end_time=datetime(2020, 5, 4, 12))
+    volunteer = make_user()
+    participation = make_participation(volunteer, event, status="approved")
+    login(volunteer)
+
+    assert client.put(f"/api/participation/{participation.id}/complete").status_code == 200
+
+    assert float(db.session.get(EventHours, event.id).hours) == 3
+    assert float(db.session.get(OrganizationMonthlyHours, (organization.id, date(2020, 5, 1))).hours) == 3
+    assert "Rollups rebuilt from 1 sessions." in app.test_cli_runner().invoke(args=["rollups", "rebuild"]).output
+    assert float(db.session.get(UserDailyHours, (volunteer.id, date(2020, 5, 4))).hours) == 3
@@ -0,0 +1,74 @@
+import json
+from datetime import datetime
+from app.config.database import db
+from app.models.hour_rollups import EventHours
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+from app.models.users import User
+from app.utils.hours_reconciliation import reconcile_hours
+
+
+def _log(participation, hours, check_out=True):
+    db.session.add(TimeLog(
+        participation_id=participation.id, user_id=participation.user_id, event_id=participation.event_id,
+        check_in_time=datetime(2030, 1, 1, 9), check_out_time=datetime(2030, 1, 1, 12) if check_out else None,
+        hours_worked=hours
+    ))
+
+
+def test_reconcile_fixes_drifted_totals(app, make_user, make_organization, make_event, make_participation):
+    """
+    GIVEN totals that drifted from the time logs, a logless completion and open sessions
+    WHEN the reconciliation runs, first as a dry run
+    THEN the dry run only reports the drift and the real run stores the logged sums,
+         crediting no duration to a completion with an open session
+    """
+    organization = make_organization()
+    checked_in = make_event(organization)
+    completed = make_event(organization, start_time=datetime(2030, 2, 1, 9))  # three hours long
+    volunteer = make_user(total_volunteer_hours=10.12)
+    logged = make_participation(volunteer, checked_in, status="approved", volunteer_hours=3.7)
+    make_participation(volunteer, completed, status="completed", volunteer_hours=3)
+    exact = make_user(total_volunteer_hours=1)
+    exact_participation = make_participation(exact, checked_in, status="approved", volunteer_hours=1)
+    _log(logged, 1.5)
+    _log(logged, 2.25)
+    _log(logged, 0, check_out=False)
+    _log(exact_participation, 1)
+    still_open = make_participation(exact, completed, status="completed", volunteer_hours=0)
+    _log(still_open, None, check_out=False)
+    db.session.commit()
+    ids = volunteer.id, logged.id
+
+    report = reconcile_hours(chunk_size=2, dry_run=True)
+    assert report["time_logs"] == 5
+    assert (report["participations"]["drifted"], report["users"]["drifted"]) == (1, 1)
+    assert report["users"]["net_drift_hours"] == -3.37
+    assert report["updated"] == 0
+
+    report = reconcile_hours(chunk_size=2)
+    db.session.expire_all()
+    assert report["updated"] == 2
+    assert report["rollups_rebuilt_from_sessions"] == 4
+    assert float(db.session.get(EventHours, checked_in.id).hours) == 4.75
+    assert float(db.session.get(Participation, ids[1]).volunteer_hours) == 3.75
+    assert float(db.session.get(User, ids[0]).total_volunteer_hours) == 6.75
+    assert float(db.session.get(User, exact.id).total_volunteer_hours) == 1
+
+    output = app.test_cli_runner().invoke(args=["hours", "reconcile"]).output
+    report = json.loads(output[output.index("{"):])
+    assert (report["participations"]["drifted"], report["users"]["drifted"]) == (0, 0)
+
+
+def test_reconcile_reports_unknown_counts_without_multi_rowcount(app, make_user, make_organization, make_event,
+                                                                 make_participation, monkeypatch):
+    volunteer = make_user(total_volunteer_hours=5)
+    participation = make_participation(volunteer, make_event(make_organization()), status="approved")
+    _log(participation, 2)
+    db.session.commit()
+    monkeypatch.setattr(db.engine.dialect, "supports_sane_multi_rowcount", False)
+
+    report = reconcile_hours()
+
+    assert (report["updated"], report["skipped_changed_meanwhile"]) == (None, None)
+    assert float(db.session.get(User, volunteer.id).total_volunteer_hours) == 2
@@ -0,0 +1,60 @@
+import uuid
+import pytest
+from sqlalchemy import inspect, text
+from app.config.database import db
+from app.config.settings import Config
+from app.models.hour_rollups import EventHours, UserDailyHours
+from app.models.users import User
+from app.utils.key_migration import KeyMigrationError, backfill_shadow_keys, swap_to_compact_keys
+
+
+def _seed():
+    ids = {name: str(uuid.uuid4()) for name in ("user", "owner", "org", "event", "participation", "log")}
+    for statement in (
+        "INSERT INTO users (id, name, email, username, password, role, total_volunteer_hours) "
+        "VALUES (:user, 'v', 'v@example.com', 'v', 'x', 'volunteer', 2.5)",
+        "INSERT INTO users (id, name, email, username, password, role) "
+        "VALUES (:owner, 'o', 'o@example.com', 'o', 'x', 'organization')",
+        "INSERT INTO organizations (id, owner_id, name, description, contact_email, address, phone) "
+        "VALUES (:org, :owner, 'Org', 'd', 'org@example.com', 'Nairobi', '+254700000000')",
+        "INSERT INTO events (id, organization_id, title, description, location, start_time, end_time, max_participants) "
+        "VALUES (:event, :org, 'Cleanup', 'd', 'Nairobi', '2030-01-01 09:00:00', '2030-01-01 17:00:00', 5)",
+        "INSERT INTO participations (id, user_id, event_id, status, volunteer_hours) "
+        "VALUES (:participation, :user, :event, 'approved', 2.5)",
+        "INSERT INTO time_logs (id, participation_id, user_id, event_id, check_in_time, check_out_time, hours_worked) "
+        "VALUES (:log, :participation, :user, :event, '2030-01-01 09:00:00', '2030-01-01 11:30:00', 2.5)",
+        "INSERT INTO event_hours (event_id, hours, sessions) VALUES (:event, 2.5, 1)",
+        "INSERT INTO user_daily_hours (user_id, day, hours, sessions) VALUES (:user, '2030-01-01', 2.5, 1)",
+    ):
+        db.session.execute(text(statement), ids)
+    db.session.commit()
+    return ids
+
+
+def test_backfill_and_swap_a_head_database(migrated_app):
+    """
+    GIVEN a database migrated to head, rollup tables included, with text keys
+    WHEN the keys are backfilled and, with KEY_STRATEGY=uuid7, swapped
+    THEN the id-keyed tables are converted and the rollups regenerated
+    """
+    ids = _seed()
+    messages = []
+
+    assert backfill_shadow_keys(chunk_size=2, log=messages.append) == 6
+    # The rollups have no id: nothing to backfill there
+    assert "user_id__v7" not in {c["name"] for c in inspect(db.engine).get_columns("user_daily_hours")}
+    assert "time_logs: 1 rows backfilled" in messages
+
+    if Config.KEY_STRATEGY != "uuid7":
+        with pytest.raises(KeyMigrationError):
+            swap_to_compact_keys(log=messages.append)
+        return
+
+    swap_to_compact_keys(chunk_size=2, log=messages.append)
+    db.session.expire_all()
+
+    assert db.session.get(User, ids["user"]).email == "v@example.com"
+    assert float(db.session.get(EventHours, ids["event"]).hours) == 2.5
+    assert UserDailyHours.query.filter_by(user_id=ids["user"]).one().sessions == 1
+    swap_to_compact_keys(log=messages.append)
+    assert messages[-1] == "Nothing to swap, keys are already compact."
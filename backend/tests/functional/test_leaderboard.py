@@ -0,0 +1,87 @@
+from app.config.database import db
+from app.utils.identity_cache import identity_cache
+from app.utils.leaderboard import leaderboard
+from app.utils.pagination import encode_cursor
+
+
+def test_top_pages_with_shared_ranks(client, login, make_user):
+    """
+    GIVEN volunteers with 30, 20, 20 and 5 hours
+    WHEN the leaderboard is read two entries at a time
+    THEN the tied volunteers share rank 2 and the cursor continues after them
+    """
+    users = [make_user(total_volunteer_hours=hours) for hours in (20, 5, 30, 20)]
+    make_user(role="organization", total_volunteer_hours=100)
+    login(users[0])
+
+    first = client.get("/api/leaderboard?limit=2").get_json()
+    second = client.get(f"/api/leaderboard?limit=2&next={first['next']}").get_json()
+
+    assert first["volunteers"] == 4
+    assert [(e["rank"], e["hours"]) for e in first["entries"]] == [(1, 30), (2, 20)]
+    assert [(e["rank"], e["hours"]) for e in second["entries"]] == [(2, 20), (4, 5)]
+    assert second["next"] is None
+    assert client.get("/api/leaderboard?next=nope").status_code == 400
+    assert client.get(f"/api/leaderboard?next={encode_cursor('20', users[0].id)}").status_code == 400
+    assert client.get(f"/api/leaderboard?next={encode_cursor(-2000, [users[0].id])}").status_code == 400
+
+
+def test_rank_follows_hour_changes_without_rebuilding(client, login, make_user, count_queries):
+    leader = make_user(total_volunteer_hours=50)
+    volunteer = make_user(total_volunteer_hours=10)
+    login(volunteer)
+    assert client.get("/api/leaderboard/me").get_json()["rank"] == 2
+
+    user = identity_cache.load_user(volunteer.id)
+    user.total_volunteer_hours = 60
+    db.session.commit()
+
+    with count_queries() as statements:
+        body = client.get("/api/leaderboard/me").get_json()
+    assert (body["rank"], body["volunteers"], body["hours"]) == (1, 2, 60)
+    assert statements == []
+
+    login(leader)
+    assert client.get("/api/leaderboard/me").get_json()["rank"] == 2
+
+
+def test_organization_board_lists_its_volunteers(client, login, make_user, make_organization,
+                                                 make_event, make_participation):
+    organization = make_organization()
+    event = make_event(organization)
+    member = make_user(total_volunteer_hours=3)
+    make_participation(member, event, status="approved")
+    applicant = make_user(total_volunteer_hours=40)
+    applicant_participation = make_participation(applicant, event)
+    make_user(total_volunteer_hours=90)
+    login(applicant)
+    url = f"/api/leaderboard?organization_id={organization.id}"
+
+    assert [e["user_id"] for e in client.get(url).get_json()["entries"]] == [member.id]
+    assert client.get(f"/api/leaderboard/me?organization_id={organization.id}").status_code == 404
+
+    applicant_participation.status = "approved"
+    db.session.commit()
+
+    assert [e["user_id"] for e in client.get(url).get_json()["entries"]] == [applicant.id, member.id]
+    assert client.get("/api/leaderboard/me").get_json()["rank"] == 2
+
+
+def test_organization_boards_are_bounded_and_unknown_ones_rejected(client, login, make_user, make_organization,
+                                                                   monkeypatch):
+    """
+    GIVEN room for one organization board
+    WHEN two organizations' boards and one of an unknown organization are read
+    THEN only the latest board is kept and the unknown organization gets 404
+    """
+    monkeypatch.setattr(leaderboard, "max_organizations", 1)
+    first, second = make_organization(), make_organization()
+    login(make_user())
+
+    assert client.get(f"/api/leaderboard?organization_id={first.id}").status_code == 200
+    assert client.get(f"/api/leaderboard?organization_id={second.id}").status_code == 200
+    assert list(leaderboard._organizations) == [second.id]
+
+    assert client.get("/api/leaderboard?organization_id=no-such-organization").status_code == 404
+    assert client.get("/api/leaderboard/me?organization_id=no-such-organization").status_code == 404
+    assert list(leaderboard._organizations) == [second.id]
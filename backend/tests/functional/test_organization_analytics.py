@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from app.config.database import db
+from app.models.time_logs import TimeLog
+
+
+def test_analytics_aggregates_every_event_in_three_queries(client, login, make_user, make_organization,
+                                                          make_event, make_participation, count_queries):
+    """
+    GIVEN a past event with every kind of application and a future one
+    WHEN the organization reads its analytics
+    THEN the funnel, fill, no-show and hour figures come from three statements
+    """
+    organization = make_organization()
+    past = make_event(organization, start_time=datetime(2020, 3, 1, 9), max_participants=4)
+    future = make_event(organization, start_time=datetime(2030, 3, 1, 9))
+    attended = make_participation(make_user(), past, status="approved")
+    make_participation(make_user(), past, status="approved")  # never checked in
+    make_participation(make_user(), past, status="completed", volunteer_hours=3)
+    make_participation(make_user(), past, status="rejected")
+    make_participation(make_user(), future)
+    db.session.add(TimeLog(participation_id=attended.id, user_id=attended.user_id, event_id=past.id,
+                           check_in_time=datetime(2020, 3, 1, 9), check_out_time=datetime(2020, 3, 1, 11),
+                           hours_worked=2))
+    attended.volunteer_hours = 2
+    db.session.commit()
+    login(organization.owner)
+
+    with count_queries() as statements:
+        response = client.get(f"/api/organization/{organization.id}/analytics")
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert len(statements) == 3
+    first = body["events"][0]
+    assert first["event_id"] == past.id
+    assert (first["applications"], first["approved"], first["completed"], first["rejected"]) == (4, 3, 1, 1)
+    assert (first["fill_rate"], first["no_shows"], first["no_show_rate"]) == (0.75, 1, 0.3333)
+    assert (first["sessions"], first["attendees"], first["hours"]) == (1, 1, 5.0)
+    assert body["events"][1]["no_show_rate"] is None
+    assert (body["totals"]["events"], body["totals"]["applications"], body["totals"]["pending"]) == (2, 5, 1)
+
+    ranged = client.get(f"/api/organization/{organization.id}/analytics?from=2025-01-01T00:00:00").get_json()
+    assert [event["event_id"] for event in ranged["events"]] == [future.id]
+
+
+def test_analytics_cached_until_the_organization_data_changes(client, login, make_user, make_organization,
+                                                             make_event, make_participation):
+    organization = make_organization()
+    event = make_event(organization, start_time=datetime.now() - timedelta(hours=1))
+    participation = make_participation(make_user(), event, status="approved")
+    login(organization.owner)
+    url = f"/api/organization/{organization.id}/analytics"
+
+    assert client.get(url).headers["X-Cache"] == "MISS"
+    assert client.get(url).headers["X-Cache"] == "HIT"
+
+    db.session.add(TimeLog(participation_id=participation.id, user_id=participation.user_id,
+                           event_id=event.id, check_in_time=datetime.now()))
+    db.session.commit()
+
+    response = client.get(url)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.get_json()["totals"]["no_shows"] == 0
+
+    login(make_organization().owner)
+    assert client.get(url).status_code == 403
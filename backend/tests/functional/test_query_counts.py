@@ -0,0 +1,78 @@
+"""
+The list endpoints must issue the same number of SQL statements whether they
+return one row or many (no per-row lazy loads).
+"""
+from datetime import datetime, timedelta
+from app.config.database import db
+from app.models.time_logs import TimeLog
+
+
+def _statements_for(client, count_queries, url):
+    db.session.expire_all()
+    with count_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+def test_volunteer_events_query_count_is_constant(client, login, count_queries, make_user,
+                                                  make_organization, make_event, make_participation):
+    volunteer = make_user()
+    org = make_organization()
+    login(volunteer)
+
+    first = make_participation(volunteer, make_event(org), status="approved")
+    db.session.add(TimeLog(
+        participation_id=first.id,
+        user_id=volunteer.id,
+        event_id=first.event_id,
+        check_in_time=datetime(2030, 1, 1, 9, 0)
+    ))
+    db.session.commit()
+    one, body = _statements_for(client, count_queries, "/api/volunteer/events")
+    assert body["events"][0]["is_checked_in"] is True
+
+    for i in range(5):
+        make_participation(volunteer, make_event(org, start_time=datetime(2030, 2, 1) + timedelta(days=i)))
+    many, body = _statements_for(client, count_queries, "/api/volunteer/events")
+
+    assert body["count"] == 6
+    assert sum(e["is_checked_in"] for e in body["events"]) == 1
+    assert many == one
+
+
+def test_event_applications_query_count_is_constant(client, login, count_queries, make_user,
+                                                    make_organization, make_event, make_participation):
+    owner = make_user(role="organization", is_org_onboarded=True)
+    event = make_event(make_organization(owner=owner))
+    login(owner)
+
+    make_participation(make_user(), event)
+    one, _ = _statements_for(client, count_queries, f"/api/event/{event.id}/applications")
+
+    for _ in range(5):
+        make_participation(make_user(), event)
+    many, body = _statements_for(client, count_queries, f"/api/event/{event.id}/applications")
+
+    assert body["count"] == 6
+    assert many == one
+
+
+def test_organization_events_query_count_is_constant(client, login, count_queries, make_user,
+                                                     make_organization, make_event, make_participation):
+    org = make_organization()
+    login(make_user())
+
+    event = make_event(org)
+    make_participation(make_user(), event)
+    one, _ = _statements_for(client, count_queries, f"/api/organization/{org.id}/events")
+
+    for i in range(5):
+        other = make_event(org, start_time=datetime(2030, 2, 1) + timedelta(days=i))
+        make_participation(make_user(), other)
+        make_participation(make_user(), other)
+    many, body = _statements_for(client, count_queries, f"/api/organization/{org.id}/events")
+
+    assert body["count"] == 6
+    assert sorted(e["participants_count"] for e in body["events"]) == [1, 2, 2, 2, 2, 2]
+    assert many == one
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.config.database import db
+from app.models.participations import Participation
+from app.utils.query_profiler import LazyLoadInLoop, fingerprint
+
+
+def test_fingerprint_groups_statements_by_shape():
+    a = fingerprint("SELECT * FROM users WHERE id = 'abc' AND age > 3")
+    b = fingerprint("SELECT *  FROM users\nWHERE id = 'xyz' AND age > 40")
+    assert a == b
+    assert fingerprint("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == "SELECT ? FROM t WHERE id IN (?)"
+
+
+def test_responses_report_query_count_and_db_time(client, make_organization, make_event):
+    make_event(make_organization())
+
+    response = client.get("/api/event")
+
+    assert int(response.headers["X-DB-Queries"]) >= 1
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_strict_mode_raises_on_lazy_load_in_loop(app, client, make_user, make_organization,
+                                                 make_event, make_participation):
+    event = make_event(make_organization())
+    for _ in range(3):
+        make_participation(make_user(), event)
+
+    def n_plus_one():
+        return {"names": [p.user.name for p in Participation.query.all()]}
+
+    app.add_url_rule("/test/n-plus-one", "n_plus_one", n_plus_one)
+    db.session.remove()
+
+    with pytest.raises(LazyLoadInLoop, match="Participation.user"):
+        client.get("/test/n-plus-one")
+
+
+def test_failed_statement_does_not_leak_its_start_time(app):
+    with db.engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        conn.execute(text("SELECT 1"))
+
+        assert conn.info["query_start_time"] == []
@@ -0,0 +1,49 @@
+import threading
+import time
+from sqlalchemy import event
+from app.config.database import db
+from app.utils.response_cache import response_cache
+from app.utils.single_flight import single_flight
+
+
+def test_concurrent_feed_polls_run_the_queries_once(app, make_organization, make_event, count_queries):
+    """
+    GIVEN several clients polling the feed at the same instant, without the response cache
+    WHEN their requests overlap
+    THEN the view's queries run once and every client receives the same page
+    """
+    make_event(make_organization())
+    response_cache.backend = None
+    followers = 3
+
+    def hold_leader(*_):
+        # Keep the first request's query in flight until the others queue behind it
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with single_flight._lock:
+                if sum(call.waiters for call in single_flight._calls.values()) >= followers:
+                    return
+            time.sleep(0.001)
+
+    responses = []
+
+    def poll():
+        responses.append(app.test_client().get("/api/event"))
+
+    event.listen(db.engine, "before_cursor_execute", hold_leader)
+    try:
+        with count_queries() as statements:
+            threads = [threading.Thread(target=poll) for _ in range(followers + 1)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", hold_leader)
+
+    assert sorted(r.headers["X-Single-Flight"] for r in responses) == ["coalesced"] * followers + ["leader"]
+    assert len({r.data for r in responses}) == 1
+    assert responses[0].get_json()[0]["count"] == 1
+    # Key query and page query of a single request
+    assert len(statements) == 2
+    assert single_flight.stats()["coalesced"] == followers
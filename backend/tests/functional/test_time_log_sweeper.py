@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.config.database import db
+from app.models.badges import Badge
+from app.models.participations import Participation
+from app.models.time_logs import TimeLog
+from app.models.user_badges import UserBadge
+from app.models.users import User
+from app.utils import time_log_sweeper
+from app.utils.time_log_sweeper import sweep_stale_time_logs
+
+NOW = datetime(2030, 1, 3, 12, 0)
+
+
+@pytest.fixture
+def open_session(make_user, make_organization, make_event, make_participation):
+    organization = make_organization()
+
+    def _open_session(hours_ago, event_hours=72, user=None, now=NOW):
+        check_in_time = now - timedelta(hours=hours_ago)
+        event = make_event(organization, start_time=check_in_time, end_time=check_in_time + timedelta(hours=event_hours))
+        participation = make_participation(user or make_user(), event, status="approved")
+        log = TimeLog(participation_id=participation.id, user_id=participation.user_id,
+                      event_id=event.id, check_in_time=check_in_time)
+        db.session.add(log)
+        db.session.commit()
+        return log
+
+    return _open_session
+
+
+def test_closes_stale_sessions_and_credits_capped_hours(app, make_user, open_session):
+    """
+    GIVEN one session open past the cap, one past its event's end and a fresh one
+    WHEN the sweeper runs
+    THEN the stale ones close at the cap or the event end and the totals include their hours
+    """
+    volunteer = make_user(total_volunteer_hours=5)
+    forgotten = open_session(hours_ago=20, user=volunteer)
+    event_over = open_session(hours_ago=6, event_hours=4, user=volunteer)
+    fresh = open_session(hours_ago=2)
+    ids = forgotten.id, event_over.id, fresh.id
+
+    assert sweep_stale_time_logs(now=NOW, max_open_hours=12) == (2, 16)
+    db.session.expire_all()
+
+    forgotten, event_over, fresh = (db.session.get(TimeLog, i) for i in ids)
+    assert forgotten.check_out_time == NOW - timedelta(hours=8)
+    assert float(forgotten.hours_worked) == 12
+    assert event_over.check_out_time == NOW - timedelta(hours=2)
+    assert float(event_over.participation.volunteer_hours) == 4
+    assert fresh.check_out_time is None
+    assert float(db.session.get(User, volunteer.id).total_volunteer_hours) == 21
+
+
+def test_sweeps_in_chunks_and_awards_badges(app, make_user, open_session):
+    db.session.add(Badge(name="Beginner", description="10 hours", criteria="10 hours",
+                         image_url="https://example.com/badge.png"))
+    db.session.commit()
+    volunteer = make_user()
+    for _ in range(5):
+        open_session(hours_ago=30, user=volunteer)
+    messages = []
+
+    closed, hours = sweep_stale_time_logs(now=NOW, chunk_size=2, log=messages.append)
+
+    assert (closed, hours) == (5, 60)
+    assert len(messages) == 3
+    assert TimeLog.query.filter(TimeLog.check_out_time.is_(None)).count() == 0
+    assert UserBadge.query.filter_by(user_id=volunteer.id).count() == 1
+    assert sweep_stale_time_logs(now=NOW) == (0, 0)
+
+
+def test_closes_one_by_one_where_executemany_rowcounts_are_unreliable(app, open_session, monkeypatch):
+    for _ in range(3):
+        open_session(hours_ago=30)
+    monkeypatch.setattr(db.engine.dialect, "supports_sane_multi_rowcount", False)
+
+    assert sweep_stale_time_logs(now=NOW) == (3, 36)
+    assert TimeLog.query.filter(TimeLog.check_out_time.is_(None)).count() == 0
+
+
+def test_gives_up_on_a_chunk_that_keeps_changing(app, open_session, monkeypatch):
+    """
+    GIVEN a stale session that every attempt finds closed concurrently
+    WHEN the sweeper runs
+    THEN it stops after max_retries attempts instead of spinning, crediting nothing
+    """
+    open_session(hours_ago=30)
+    attempts = []
+    monkeypatch.setattr(time_log_sweeper, "_close_logs", lambda closes: attempts.append(closes) or 0)
+
+    assert sweep_stale_time_logs(now=NOW, max_retries=2) == (0, 0)
+    assert len(attempts) == 3
+    assert float(Participation.query.one().volunteer_hours or 0) == 0
+
+
+def test_cli_dry_run_writes_nothing(app, open_session):
+    open_session(hours_ago=30, now=datetime.now(timezone.utc).replace(tzinfo=None))
+    runner = app.test_cli_runner()
+
+    output = runner.invoke(args=["timelogs", "sweep", "--dry-run"]).output
+
+    assert "Would close 1 sessions worth 12.00 hours." in output
+    assert TimeLog.query.filter(TimeLog.check_out_time.is_(None)).count() == 1
+    assert float(Participation.query.one().volunteer_hours or 0) == 0
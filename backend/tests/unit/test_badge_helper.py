@@ -0,0 +1,64 @@
+from app.config.database import db
+from app.models.badges import Badge
+from app.models.user_badges import UserBadge
+from app.utils.badge_helper import BADGE_THRESHOLDS, check_and_award_badges
+
+
+def _seed_badges():
+    for threshold in BADGE_THRESHOLDS:
+        db.session.add(Badge(
+            name=threshold["name"],
+            description=f"{threshold['hours']} hours",
+            criteria=f"{threshold['hours']} hours",
+            image_url="https://example.com/badge.png"
+        ))
+    db.session.commit()
+
+
+def test_awards_every_crossed_threshold_once(app, make_user):
+    _seed_badges()
+    user = make_user(total_volunteer_hours=80)
+
+    assert check_and_award_badges(user) == ["Beginner", "Novice", "Changemaker"]
+    db.session.commit()
+    assert check_and_award_badges(user) == []
+    assert UserBadge.query.filter_by(user_id=user.id).count() == 3
+
+
+def test_no_query_when_no_threshold_is_crossed(app, make_user, count_queries):
+    _seed_badges()
+    user = make_user(total_volunteer_hours=60)
+    check_and_award_badges(user, previous_hours=0)
+
+    with count_queries() as statements:
+        awarded = check_and_award_badges(user, previous_hours=55)
+
+    assert awarded == []
+    assert statements == []
+
+
+def test_catalog_reloads_when_badges_change(app, make_user):
+    user = make_user(total_volunteer_hours=20)
+    assert check_and_award_badges(user) == []
+
+    _seed_badges()
+    assert check_and_award_badges(user) == ["Beginner"]
+
+
+def test_backfill_awards_badges_seeded_after_the_hours(app, make_user):
+    """
+    GIVEN volunteers whose hours were credited before the badges existed
+    WHEN the backfill runs, twice
+    THEN each gets every badge their total qualifies for, once
+    """
+    veteran = make_user(total_volunteer_hours=80)
+    make_user(total_volunteer_hours=5)
+    check_and_award_badges(veteran, previous_hours=0)
+    _seed_badges()
+    db.session.add(UserBadge(user_id=veteran.id, badge_id=Badge.query.filter_by(name="Beginner").one().id))
+    db.session.commit()
+
+    output = app.test_cli_runner().invoke(args=["badges", "backfill"]).output
+    assert "Awarded 2 badges." in output
+    assert UserBadge.query.filter_by(user_id=veteran.id).count() == 3
+    assert "Awarded 0 badges." in app.test_cli_runner().invoke(args=["badges", "backfill"]).output
@@ -0,0 +1,27 @@
+import uuid
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.types import CompactUUID, uuid7
+
+
+def test_uuid7_is_monotonic_and_versioned():
+    keys = [uuid7() for _ in range(5000)]
+
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert all(key.version == 7 and key.variant == uuid.RFC_4122 for key in keys)
+
+
+def test_compact_uuid_round_trips_the_string_form():
+    column_type = CompactUUID()
+    key = str(uuid7())
+
+    stored = column_type.process_bind_param(key, sqlite.dialect())
+    assert stored == uuid.UUID(key).bytes
+    assert column_type.process_result_value(stored, sqlite.dialect()) == key
+
+    native = column_type.process_bind_param(key, postgresql.dialect())
+    assert column_type.process_result_value(native, postgresql.dialect()) == key
+
+
+def test_compact_uuid_binds_garbage_as_null():
+    assert CompactUUID().process_bind_param("not-a-uuid", sqlite.dialect()) is None
@@ -0,0 +1,45 @@
+from app.config.database import db
+from app.utils.identity_cache import IdentityCache, identity_cache
+
+
+def test_cached_lookup_skips_the_database(app, make_user, count_queries):
+    user_id = make_user().id
+    db.session.remove()
+
+    identity_cache.load_user(user_id)
+    db.session.remove()
+
+    with count_queries() as statements:
+        user = identity_cache.load_user(user_id)
+        assert user.role == "volunteer"
+
+    assert statements == []
+    assert identity_cache.stats()["hits"] == 1
+
+
+def test_user_flush_invalidates_entry(app, make_user):
+    user_id = make_user().id
+    db.session.remove()
+
+    user = identity_cache.load_user(user_id)
+    user.is_org_onboarded = True
+    db.session.commit()
+    db.session.remove()
+
+    assert identity_cache.stats()["size"] == 0
+    assert identity_cache.load_user(user_id).is_org_onboarded is True
+
+
+def test_lru_eviction_and_ttl(app, make_user):
+    cache = IdentityCache(max_size=2, ttl=60)
+    users = [make_user() for _ in range(3)]
+    for user in users:
+        cache._put(user)
+
+    assert cache._get(users[0].id) is None
+    assert cache._get(users[2].id) is not None
+    assert cache.stats()["evictions"] == 1
+
+    cache.ttl = -1
+    cache._put(users[1])
+    assert cache._get(users[1].id) is None
@@ -0,0 +1,44 @@
+import threading
+import pytest
+from app.utils.password_hasher import HasherBusy, PasswordHasher
+
+
+def test_hash_and_verify_in_the_pool():
+    hasher = PasswordHasher(rounds=4, workers=2)
+    hashed = hasher.hash("secret123")
+
+    assert hashed.startswith("$2b$04$")
+    assert hasher.verify("secret123", hashed)
+    assert not hasher.verify("wrong", hashed)
+    assert not hasher.verify("secret123", "not-a-hash")
+    hasher.shutdown()
+
+
+def test_needs_rehash_when_cost_changes():
+    hashed = PasswordHasher(rounds=4, workers=0).hash("secret123")
+
+    assert not PasswordHasher(rounds=4).needs_rehash(hashed)
+    assert PasswordHasher(rounds=5).needs_rehash(hashed)
+    assert PasswordHasher(rounds=4).needs_rehash("garbage")
+
+
+def test_rejects_work_beyond_the_queue_bound():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=0)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocked():
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=hasher._run, args=(blocked,))
+    worker.start()
+    started.wait(5)
+
+    with pytest.raises(HasherBusy):
+        hasher.hash("secret123")
+
+    release.set()
+    worker.join()
+    assert hasher.verify("secret123", hasher.hash("secret123"))
+    hasher.shutdown()
@@ -0,0 +1,75 @@
+import json
+import logging
+from app.config.database import db
+from app.utils.response_cache import LRUBackend, mark_dirty, response_cache
+from app.utils.stats_logger import stats_logger
+
+
+def test_lru_invalidates_by_tag_and_evicts_oldest():
+    backend = LRUBackend(max_entries=2)
+    generation = backend.generation()
+    backend.set("a", "A", {"org:1", "events:list"}, 60, generation)
+    backend.set("b", "B", {"org:2"}, 60, generation)
+
+    backend.invalidate({"org:1"})
+    assert backend.get("a") is None
+    assert backend.get("b") == "B"
+
+    generation = backend.generation()
+    backend.set("c", "C", {"org:3"}, 60, generation)
+    backend.set("d", "D", {"org:4"}, 60, generation)
+    assert backend.get("b") is None
+    assert backend.stats() == {"entries": 2, "tags": 2, "evictions": 1}
+
+
+def test_entry_computed_across_an_invalidation_is_not_stored():
+    backend = LRUBackend()
+    generation = backend.generation()
+    backend.invalidate({"events:list"})
+
+    assert backend.set("feed", "stale", {"events:list"}, 60, generation) is False
+    assert backend.get("feed") is None
+
+
+def test_core_writes_invalidate_on_commit_only(app):
+    backend = response_cache.backend
+    backend.set("page", "cached", {"event:1"}, 60, backend.generation())
+
+    mark_dirty("event:1")
+    db.session.rollback()
+    assert backend.get("page") == "cached"
+
+    mark_dirty("event:1")
+    db.session.commit()
+    assert backend.get("page") is None
+
+
+def test_cli_reports_stats_and_purges(app):
+    backend = response_cache.backend
+    backend.set("page", "cached", {"org:1"}, 60, backend.generation())
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["cache", "stats"])
+    stats = json.loads(result.stdout)
+    assert stats["backend"] == "lru"
+    assert stats["entries"] == 1
+    # lru counters live in the app processes; the CLI says so
+    assert stats["counters"] == "this process"
+    assert "STATS_LOG_INTERVAL" in result.stderr
+
+    assert "Purged all entries" in runner.invoke(args=["cache", "purge"]).output
+    assert backend.get("page") is None
+
+
+def test_counters_are_kept_by_the_backend_and_logged(client, caplog, make_organization, make_event):
+    make_event(make_organization())
+    client.get("/api/event")
+    client.get("/api/event")
+
+    counters = response_cache.backend.counters()
+    assert (counters["misses"], counters["stores"], counters["hits"]) == (1, 1, 1)
+    with caplog.at_level(logging.INFO, logger="app.stats"):
+        stats_logger.log()
+    logged = json.loads(caplog.records[-1].getMessage().split(" ", 1)[1])
+    assert logged["response_cache"]["hit_ratio"] == 0.5
+    assert logged["single_flight"]["leaders"] == 2
@@ -0,0 +1,41 @@
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import func, select
+from app.config.database import db
+from app.models.events import Event
+from app.models.participations import Participation
+from app.schema.event_schema import EVENT_COLUMNS, encode_event, events_schema
+from app.schema.row_encoder import row_encoder
+from app.utils.json_output import dumps
+
+
+def test_encoder_converts_by_column_type_and_is_shared_per_shape():
+    columns = (Participation.id, Participation.volunteer_hours, Participation.completed_at)
+    encode = row_encoder(*columns)
+
+    assert row_encoder(*columns) is encode
+    assert encode(("p1", Decimal("2.50"), None)) == {"id": "p1", "volunteer_hours": 2.5, "completed_at": None}
+    assert encode(("p1", None, datetime(2030, 1, 1, 9, 30))) == {
+        "id": "p1", "volunteer_hours": None, "completed_at": "2030-01-01T09:30:00"
+    }
+
+
+def test_labels_rename_keys(app):
+    encode = row_encoder(Event.id.label("event_id"), func.count(Participation.id).label("participants"))
+    assert encode(("e1", 3)) == {"event_id": "e1", "participants": 3}
+
+
+def test_event_rows_match_the_marshmallow_schema(make_organization, make_event):
+    org = make_organization()
+    events = [make_event(org, start_time=datetime(2030, 1, day, 9, 0, 0, 1234)) for day in (1, 2)]
+
+    rows = db.session.execute(select(*EVENT_COLUMNS).order_by(Event.start_time)).all()
+
+    assert [encode_event(row) for row in rows] == events_schema.dump(events)
+
+
+def test_dumps_handles_decimals_and_datetimes():
+    assert dumps({"hours": Decimal("1.5"), "at": datetime(2030, 1, 1)}) in (
+        b'{"hours":1.5,"at":"2030-01-01T00:00:00"}',
+        b'{"hours": 1.5, "at": "2030-01-01T00:00:00"}',
+    )
@@ -0,0 +1,78 @@
+import threading
+import time
+import pytest
+from app.utils.single_flight import SingleFlight
+
+
+def _wait_for_waiters(flight, key, count):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        with flight._lock:
+            call = flight._calls.get(key)
+            if call is not None and call.waiters >= count:
+                return
+        time.sleep(0.001)
+    raise AssertionError("waiters never arrived")
+
+
+def _run_together(flight, fn, callers):
+    results = []
+
+    def caller():
+        try:
+            results.append(flight.do("key", fn))
+        except Exception as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_callers_share_one_run():
+    flight = SingleFlight()
+    runs = []
+
+    def compute():
+        runs.append(1)
+        _wait_for_waiters(flight, "key", 3)
+        return {"events": []}
+
+    results = _run_together(flight, compute, 4)
+
+    assert len(runs) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(result is results[0][0] for result, _ in results)
+    assert flight.stats()["coalesced"] == 3
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_leader_error_is_shared_and_nothing_is_remembered():
+    flight = SingleFlight()
+
+    def fail():
+        _wait_for_waiters(flight, "key", 1)
+        raise ValueError("database went away")
+
+    results = _run_together(flight, fail, 2)
+    assert all(isinstance(result, ValueError) for result in results)
+
+    # The next call runs again
+    assert flight.do("key", lambda: 42) == (42, False)
+
+
+def test_waiter_runs_itself_after_the_timeout():
+    flight = SingleFlight(timeout=0.01)
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=("key", release.wait))
+    leader.start()
+    while not flight._calls:
+        time.sleep(0.001)
+
+    assert flight.do("key", lambda: "own") == ("own", False)
+    assert flight.stats()["timeouts"] == 1
+    release.set()
+    leader.join()
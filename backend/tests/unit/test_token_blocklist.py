@@ -0,0 +1,59 @@
+import time
+from datetime import datetime, timedelta, timezone
+from app.config.database import db
+from app.models.revoked_tokens import RevokedToken
+from app.utils.token_blocklist import BloomFilter, token_blocklist
+
+
+def _in(minutes):
+    return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=minutes)
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    added = [f"jti-{i}" for i in range(1000)]
+    for key in added:
+        bloom.add(key)
+
+    assert all(key in bloom for key in added)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_revocation_is_visible_after_commit_only(app):
+    token_blocklist.revoke("rolled-back", "access", _in(60))
+    db.session.rollback()
+    token_blocklist.revoke("committed", "access", _in(60))
+    assert not token_blocklist.is_revoked("committed")
+
+    db.session.commit()
+
+    assert token_blocklist.is_revoked("committed")
+    assert not token_blocklist.is_revoked("rolled-back")
+    assert not token_blocklist.is_revoked("never-revoked")
+
+
+def test_sync_picks_up_other_processes_and_rebuild_expires(app):
+    # Written by another process: not in this process's mirror yet
+    db.session.add(RevokedToken(jti="elsewhere", token_type="refresh", expires_at=_in(60)))
+    db.session.add(RevokedToken(jti="stale", token_type="access", expires_at=_in(-1)))
+    db.session.commit()
+    assert not token_blocklist.is_revoked("elsewhere")
+
+    token_blocklist.refresh()
+    assert token_blocklist.is_revoked("elsewhere")
+    assert not token_blocklist.is_revoked("stale")
+
+    token_blocklist._rebuilt_at = time.monotonic() - token_blocklist.rebuild_interval
+    token_blocklist.refresh()
+    assert token_blocklist.is_revoked("elsewhere")
+    assert RevokedToken.query.filter_by(jti="stale").count() == 0
+
+
+def test_checks_do_no_io_once_loaded(app, count_queries):
+    token_blocklist._synced_at = token_blocklist._rebuilt_at = 0  # long overdue
+
+    with count_queries() as statements:
+        assert not token_blocklist.is_revoked("anything")
+
+    assert statements == []
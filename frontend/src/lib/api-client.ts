@@ -1,8 +1,56 @@
-import axios from "axios";
+import axios, { AxiosError, type InternalAxiosRequestConfig } from "axios";
 
 const API = axios.create({
   baseURL: "/api",
   withCredentials: true, // for httpOnly cookies
 });
 
-export default API;
\ No newline at end of file
+type RetriableRequest = InternalAxiosRequestConfig & { _retried?: boolean };
+
+// Requests that must never trigger a token refresh themselves
+const NO_REFRESH = ["/auth/login", "/auth/refresh", "/auth/logout"];
+
+// One refresh at a time: concurrent 401s wait for the same call, so the
+// rotated refresh token is only ever presented once
+let refreshing: Promise<void> | null = null;
+
+function refreshSession(): Promise<void> {
+  if (!refreshing) {
+    refreshing = API.post("/auth/refresh")
+      .then(() => undefined)
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+}
+
+// When the 2-hour access token expires, swap the refresh cookie for a new
+// pair and replay the request instead of sending the user back to login
+API.interceptors.response.use(
+  (response) => response,
+  async (error: AxiosError) => {
+    const request = error.config as RetriableRequest | undefined;
+    const url = request?.url ?? "";
+
+    if (
+      error.response?.status !== 401 ||
+      !request ||
+      request._retried ||
+      NO_REFRESH.some((path) => url.endsWith(path))
+    ) {
+      return Promise.reject(error);
+    }
+
+    request._retried = true;
+    try {
+      await refreshSession();
+    } catch {
+      // Refresh token expired or revoked: a real login is needed
+      return Promise.reject(error);
+    }
+    return API(request);
+  }
+);
+
+export default API;
@@ -0,0 +1,44 @@
+import axios from "axios";
+import API from "./api-client";
+
+export interface ApiEvent {
+  id: string;
+  title: string;
+  description: string;
+  location: string;
+  start_time: string;
+  end_time: string;
+  max_participants: number;
+  created_at: string;
+  updated_at: string;
+}
+
+export interface EventPage {
+  message: string;
+  events: ApiEvent[];
+  count: number;
+  next: string | null;
+}
+
+// Default page size of GET /event (DEFAULT_PAGE_SIZE on the backend)
+const PAGE_SIZE = 20;
+
+// One page of upcoming events, soonest first; pass the previous page's
+// `next` cursor to get the following one
+export async function fetchUpcomingEvents(
+  next: string | null = null,
+  limit = PAGE_SIZE
+): Promise<EventPage> {
+  try {
+    const response = await API.get<EventPage[]>("/event", {
+      params: { upcoming: true, limit, ...(next ? { next } : {}) },
+    });
+    return response.data[0];
+  } catch (error) {
+    // The first page answers 404 when there is nothing to list
+    if (!next && axios.isAxiosError(error) && error.response?.status === 404) {
+      return { message: "No events found.", events: [], count: 0, next: null };
+    }
+    throw error;
+  }
+}
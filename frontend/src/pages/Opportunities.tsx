@@ -1,26 +1,9 @@
 import React, { useState } from "react";
-import { useQuery } from "@tanstack/react-query";
-import API from "../lib/api-client";
+import { useInfiniteQuery } from "@tanstack/react-query";
+import { fetchUpcomingEvents, type ApiEvent } from "../lib/events";
 import OpportunityCard from "../components/OpportunityCard";
 import EventDetailsModal from "../components/EventDetailsModal";
 
-interface ApiEvent {
-  id: string;
-  title: string;
-  description: string;
-  location: string;
-  start_time: string;
-  end_time: string;
-  max_participants: number;
-  created_at: string;
-  updated_at: string;
-}
-
-interface ApiResponse {
-  message: string;
-  events: ApiEvent[];
-}
-
 const formatDuration = (startTime: string, endTime: string): string => {
   try {
     const start = new Date(startTime);
@@ -58,27 +41,25 @@ const formatDuration = (startTime: string, endTime: string): string => {
   }
 };
 
-const fetchEvents = async (): Promise<ApiEvent[]> => {
-  const response = await API.get<ApiResponse[]>("/event");
-  // The API returns an array with one object containing events
-  if (Array.isArray(response.data) && response.data.length > 0) {
-    return response.data[0].events || [];
-  }
-  return [];
-};
-
 const Opportunities: React.FC = () => {
   const [selectedEvent, setSelectedEvent] = useState<ApiEvent | null>(null);
   const [isModalOpen, setIsModalOpen] = useState(false);
 
+  // Upcoming events a page at a time; "Load more" fetches the next one
   const {
-    data: events,
+    data,
     isLoading,
     error,
-  } = useQuery({
-    queryKey: ["events"],
-    queryFn: fetchEvents,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
+    queryKey: ["events", "upcoming"],
+    queryFn: ({ pageParam }) => fetchUpcomingEvents(pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next,
   });
+  const events = data?.pages.flatMap((page) => page.events);
 
   const handleViewDetails = (event: ApiEvent) => {
     setSelectedEvent(event);
@@ -148,6 +129,17 @@ const Opportunities: React.FC = () => {
             />
           ))}
         </div>
+        {hasNextPage && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+              className="bg-green-600 text-white py-2 px-6 rounded-xl hover:bg-green-700 disabled:opacity-50"
+            >
+              {isFetchingNextPage ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </section>
       {selectedEvent && (
         <EventDetailsModal
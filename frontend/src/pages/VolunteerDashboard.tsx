@@ -2,27 +2,11 @@ import React, { useState } from "react";
 import { Link } from "react-router-dom";
 import { useQuery } from "@tanstack/react-query";
 import API from "../lib/api-client";
+import { fetchUpcomingEvents, type ApiEvent } from "../lib/events";
 import useAuthStore from "../lib/auth-store";
 import VolunteerHoursLogging from "../components/VolunteerHoursLogging";
 import TimeClock from "../components/TimeClock";
 
-interface ApiEvent {
-  id: string;
-  title: string;
-  description: string;
-  location: string;
-  start_time: string;
-  end_time: string;
-  max_participants: number;
-  created_at: string;
-  updated_at: string;
-}
-
-interface ApiResponse {
-  message: string;
-  events: ApiEvent[];
-}
-
 interface VolunteerStats {
   total_hours: number;
   completed_activities: number;
@@ -89,14 +73,6 @@ const formatDuration = (startTime: string, endTime: string): string => {
   }
 };
 
-const fetchEvents = async (): Promise<ApiEvent[]> => {
-  const response = await API.get<ApiResponse[]>("/event");
-  if (Array.isArray(response.data) && response.data.length > 0) {
-    return response.data[0].events || [];
-  }
-  return [];
-};
-
 const fetchVolunteerEvents = async (): Promise<VolunteerEvent[]> => {
   try {
     const response = await API.get<VolunteerEventsResponse>(
@@ -139,8 +115,9 @@ const VolunteerDashboard: React.FC = () => {
   } | null>(null);
 
   const { data: events, isLoading: eventsLoading } = useQuery({
-    queryKey: ["events"],
-    queryFn: fetchEvents,
+    queryKey: ["events", "upcoming", 3],
+    queryFn: () => fetchUpcomingEvents(null, 3),
+    select: (page) => page.events,
   });
 
   const { data: volunteerEvents } = useQuery({